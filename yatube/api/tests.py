@@ -0,0 +1,139 @@
+from http import HTTPStatus
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class PostsApiTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='api_author')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='api-group',
+            description='Тестовое описание',
+        )
+        cls.num_of_test_posts = 15
+        for i in range(cls.num_of_test_posts):
+            Post.objects.create(author=cls.user, group=cls.group,
+                                text=f'Тестовый пост {i}')
+        cls.post = Post.objects.first()
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def get_json(self, url, **extra):
+        response = self.guest_client.get(url, **extra)
+        self.assertEqual(response.status_code, HTTPStatus.OK, url)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        return response.json()
+
+    def walk(self, url):
+        """Собирает id постов, переходя по ссылкам next."""
+        collected = []
+        while url:
+            data = self.get_json(url)
+            self.assertLessEqual(len(data['results']),
+                                 settings.NUM_OF_POSTS_ON_PAGE)
+            collected.extend(post['id'] for post in data['results'])
+            url = data['next']
+        return collected
+
+    def test_lists_walk_all_posts(self):
+        """Ленты API обходят все посты по порядку без повторов."""
+        expected = list(Post.objects.values_list('id', flat=True))
+        urls = (
+            reverse('api:post_list'),
+            reverse('api:group_posts', kwargs={'slug': 'api-group'}),
+            reverse('api:author_posts', kwargs={'username': 'api_author'}),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertEqual(self.walk(url), expected)
+
+    def test_post_detail(self):
+        """Публикация отдаётся с автором и группой по их ключам."""
+        post = PostsApiTests.post
+        data = self.get_json(
+            reverse('api:post_detail', kwargs={'post_id': post.pk}))
+        self.assertEqual(data['id'], post.pk)
+        self.assertEqual(data['text'], post.text)
+        self.assertEqual(data['author'], 'api_author')
+        self.assertEqual(data['group'], 'api-group')
+
+    def test_sparse_fields(self):
+        """Параметр fields ограничивает набор полей ответа."""
+        data = self.get_json(reverse('api:post_list') + '?fields=id,author')
+        self.assertEqual(set(data['results'][0]), {'id', 'author'})
+        self.assertIn('fields=id%2Cauthor', data['next'])
+        data = self.get_json(reverse('api:group_list') + '?fields=slug')
+        self.assertEqual(data['results'], [{'slug': 'api-group'}])
+
+    def test_unknown_field_is_bad_request(self):
+        """Неизвестное поле — ответ 400 с описанием ошибки."""
+        response = self.guest_client.get(
+            reverse('api:post_list') + '?fields=password')
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        self.assertIn('password', response.json()['detail'])
+
+    def test_missing_objects_are_not_found(self):
+        """Несуществующие группа, автор и пост — ответ 404."""
+        urls = (
+            reverse('api:group_posts', kwargs={'slug': 'no-group'}),
+            reverse('api:author_posts', kwargs={'username': 'nobody'}),
+            reverse('api:post_detail', kwargs={'post_id': 0}),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_conditional_get(self):
+        """Повторный запрос с ETag получает 304."""
+        urls = (
+            reverse('api:post_list'),
+            reverse('api:group_list'),
+            reverse('api:post_detail',
+                    kwargs={'post_id': PostsApiTests.post.pk}),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                etag = self.guest_client.get(url)['ETag']
+                response = self.guest_client.get(
+                    url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code,
+                                 HTTPStatus.NOT_MODIFIED)
+
+    def test_etag_follows_serialized_keys(self):
+        """Смена username автора или slug группы меняет ETag API."""
+        user, group = PostsApiTests.user, PostsApiTests.group
+        detail = reverse('api:post_detail',
+                         kwargs={'post_id': PostsApiTests.post.pk})
+        author_posts = reverse('api:author_posts',
+                               kwargs={'username': 'api_author'})
+        etag = self.guest_client.get(detail)['ETag']
+        user.username = 'api_writer'
+        user.save()
+        self.assertNotEqual(etag, self.guest_client.get(detail)['ETag'])
+        user.username = 'api_author'
+        user.save()
+        etags = [self.guest_client.get(url)['ETag']
+                 for url in (detail, author_posts)]
+        group.slug = 'api-group-renamed'
+        group.save()
+        for url, old in zip((detail, author_posts), etags):
+            with self.subTest(url=url):
+                self.assertNotEqual(old, self.guest_client.get(url)['ETag'])
+
+    def test_read_only(self):
+        """API не принимает запросы на запись."""
+        response = self.guest_client.post(reverse('api:post_list'))
+        self.assertEqual(response.status_code,
+                         HTTPStatus.METHOD_NOT_ALLOWED)
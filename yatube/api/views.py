@@ -0,0 +1,171 @@
+"""
+JSON API только для чтения: публикации, группы и авторы.
+
+Ответы собираются из строк .values() без создания экземпляров моделей;
+параметр ?fields=id,text ограничивает набор полей (и JOIN-ов).
+"""
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import Http404, JsonResponse
+from django.utils.cache import get_conditional_response
+from django.views.decorators.http import condition, require_safe
+
+from core.query_budget import query_budget
+from posts.conditional import (api_author_posts_etag, api_post_etag,
+                               group_etag, index_etag)
+from posts.models import Group, Post
+from posts.paginator import CursorPaginator
+
+User = get_user_model()
+
+# Имя поля в ответе → выражение для .values().
+POST_FIELDS = {
+    'id': 'id',
+    'text': 'text',
+    'pub_date': 'pub_date',
+    'updated': 'updated',
+    'author': 'author__username',
+    'group': 'group__slug',
+}
+GROUP_FIELDS = {
+    'slug': 'slug',
+    'title': 'title',
+    'description': 'description',
+    'posts_count': 'posts_count',
+}
+# Без них не построить курсор страницы.
+CURSOR_FIELDS = ('id', 'pub_date')
+
+
+class BadRequest(Exception):
+    pass
+
+
+def _json(data, status=200):
+    return JsonResponse(data, status=status, encoder=DjangoJSONEncoder,
+                        json_dumps_params={'ensure_ascii': False})
+
+
+def api_view(budget):
+    """Общая обвязка: только GET/HEAD, бюджет запросов, ошибки в JSON."""
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            try:
+                return view_func(request, *args, **kwargs)
+            except BadRequest as error:
+                return _json({'detail': str(error)}, status=400)
+            except Http404:
+                return _json({'detail': 'Не найдено.'}, status=404)
+        return query_budget(budget)(require_safe(wrapper))
+    return decorator
+
+
+def selected_fields(request, available, required=()):
+    """
+    Поля из ?fields=..., проверенные по списку доступных.
+
+    Возвращает (поля ответа, выражения для .values()).
+    """
+    raw = request.GET.get('fields')
+    if raw:
+        fields = [name.strip() for name in raw.split(',') if name.strip()]
+        unknown = sorted(set(fields) - set(available))
+        if unknown:
+            raise BadRequest(
+                'Неизвестные поля: {}. Доступны: {}.'.format(
+                    ', '.join(unknown), ', '.join(available)))
+    else:
+        fields = list(available)
+    lookups = [available[name] for name in fields]
+    lookups += [name for name in required if name not in lookups]
+    return fields, lookups
+
+
+def serialize(rows, fields, available):
+    return [{name: row[available[name]] for name in fields} for row in rows]
+
+
+def _page_url(request, **params):
+    query = request.GET.copy()
+    query.pop('after', None)
+    query.pop('before', None)
+    query.update(params)
+    return f'{request.path}?{query.urlencode()}'
+
+
+def post_page(request, queryset):
+    """Страница публикаций с курсорной пагинацией по (pub_date, id)."""
+    fields, lookups = selected_fields(request, POST_FIELDS, CURSOR_FIELDS)
+    paginator = CursorPaginator(queryset.values(*lookups),
+                                settings.NUM_OF_POSTS_ON_PAGE)
+    page = paginator.get_page(after=request.GET.get('after'),
+                              before=request.GET.get('before'))
+    return _json({
+        'results': serialize(page, fields, POST_FIELDS),
+        'next': (_page_url(request, after=page.next_cursor)
+                 if page.next_cursor else None),
+        'previous': (_page_url(request, before=page.previous_cursor)
+                     if page.previous_cursor else None),
+    })
+
+
+def _pk_or_404(queryset):
+    pk = queryset.values_list('pk', flat=True).first()
+    if pk is None:
+        raise Http404
+    return pk
+
+
+@api_view(budget=4)
+@condition(etag_func=index_etag)
+def post_list(request):
+    """Лента всех публикаций."""
+    return post_page(request, Post.objects.all())
+
+
+@api_view(budget=5)
+@condition(etag_func=group_etag)
+def group_posts(request, slug):
+    """Публикации группы."""
+    group_id = _pk_or_404(Group.objects.filter(slug=slug))
+    return post_page(request, Post.objects.filter(group_id=group_id))
+
+
+@api_view(budget=5)
+@condition(etag_func=api_author_posts_etag)
+def author_posts(request, username):
+    """Публикации автора."""
+    author_id = _pk_or_404(User.objects.filter(username=username))
+    return post_page(request, Post.objects.filter(author_id=author_id))
+
+
+@api_view(budget=4)
+@condition(etag_func=api_post_etag)
+def post_detail(request, post_id):
+    """Одна публикация."""
+    fields, lookups = selected_fields(request, POST_FIELDS)
+    row = Post.objects.filter(pk=post_id).values(*lookups).first()
+    if row is None:
+        raise Http404
+    return _json(serialize([row], fields, POST_FIELDS)[0])
+
+
+@api_view(budget=3)
+def group_list(request):
+    """
+    Все группы.
+
+    Дешёвого валидатора у списка групп нет, поэтому ETag считается по
+    телу ответа: 304 экономит трафик, но не запрос к базе.
+    """
+    fields, lookups = selected_fields(request, GROUP_FIELDS)
+    rows = Group.objects.order_by('title').values(*lookups)
+    response = _json({'results': serialize(rows, fields, GROUP_FIELDS)})
+    etag = 'W/"{}"'.format(hashlib.md5(response.content).hexdigest())
+    response['ETag'] = etag
+    return get_conditional_response(request, etag=etag, response=response)
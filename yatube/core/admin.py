@@ -0,0 +1,13 @@
+from django.contrib import admin
+
+from .models import OutgoingEmail
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'subject', 'to', 'created', 'attempts',
+                    'next_attempt_at', 'sent_at')
+    list_filter = ('sent_at',)
+    search_fields = ('subject', 'to')
+    readonly_fields = ('created', 'sent_at', 'last_error')
+    empty_value_display = '-пусто-'
@@ -0,0 +1,112 @@
+"""
+Загрузка пользователя запроса из кэша.
+
+Вместе с SESSION_ENGINE = cached_db запрос вошедшего пользователя
+обходится без чтения django_session и auth_user: в кэше лежат данные
+сессии и снимок нужных полей пользователя вместе с хэшем для проверки
+сессии, но без хэша пароля. Снимок сбрасывается при сохранении
+и удалении пользователя (в том числе при смене пароля) и при выходе.
+"""
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.auth.signals import user_logged_out
+from django.core.cache import cache
+from django.db import router
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import SimpleLazyObject
+
+from .query_budget import not_counted
+
+User = auth.get_user_model()
+
+
+def user_cache_key(user_id):
+    return f'auth_user:{user_id}'
+
+
+# Поля для шапки страниц и проверок доступа. Остальные (в том числе
+# хэш пароля) в кэш не попадают и при обращении загружаются из базы.
+SNAPSHOT_FIELDS = ('username', 'first_name', 'last_name', 'is_active',
+                   'is_staff', 'is_superuser')
+
+
+def make_snapshot(user, session_hash):
+    """Нужные поля пользователя и его хэш для проверки сессии."""
+    # from_db ждёт поля в порядке модели.
+    field_names = tuple(
+        field.attname for field in User._meta.concrete_fields
+        if field.primary_key or field.attname in SNAPSHOT_FIELDS)
+    return (field_names,
+            tuple(getattr(user, name) for name in field_names),
+            session_hash)
+
+
+def from_snapshot(snapshot):
+    """Пользователь с отложенными прочими полями и хэш его сессии."""
+    field_names, values, session_hash = snapshot
+    user = User.from_db(router.db_for_read(User), field_names, values)
+    return user, session_hash
+
+
+def get_user(request):
+    """
+    Пользователь сессии: из снимка в кэше или, при промахе, из базы.
+
+    Проверки те же, что в django.contrib.auth.get_user: бэкенд из
+    настроек и хэш сессии, который меняется при смене пароля.
+    """
+    try:
+        user_id = User._meta.pk.to_python(request.session[auth.SESSION_KEY])
+        backend_path = request.session[auth.BACKEND_SESSION_KEY]
+    except KeyError:
+        return AnonymousUser()
+    if backend_path not in settings.AUTHENTICATION_BACKENDS:
+        return AnonymousUser()
+    backend = auth.load_backend(backend_path)
+    snapshot = cache.get(user_cache_key(user_id))
+    if snapshot is None:
+        user = backend.get_user(user_id)
+        if user is None:
+            return AnonymousUser()
+        user_hash = user.get_session_auth_hash()
+    else:
+        user, user_hash = from_snapshot(snapshot)
+        can_authenticate = getattr(backend, 'user_can_authenticate', None)
+        if can_authenticate is not None and not can_authenticate(user):
+            return AnonymousUser()
+    user.backend = backend_path
+    session_hash = request.session.get(auth.HASH_SESSION_KEY)
+    if not (session_hash and constant_time_compare(
+            session_hash, user_hash)):
+        # Удаление сессии после смены пароля — разовая уборка, а не
+        # стоимость страницы: в её бюджет запросов оно не входит.
+        with not_counted():
+            request.session.flush()
+        return AnonymousUser()
+    if snapshot is None:
+        cache.set(user_cache_key(user_id), make_snapshot(user, user_hash),
+                  settings.AUTH_USER_CACHE_TIMEOUT)
+    return user
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """AuthenticationMiddleware с пользователем из кэша."""
+
+    def process_request(self, request):
+        request.user = SimpleLazyObject(lambda: get_user(request))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_user_on_change(sender, instance, **kwargs):
+    cache.delete(user_cache_key(instance.pk))
+
+
+@receiver(user_logged_out)
+def forget_user_on_logout(sender, user, **kwargs):
+    if user is not None:
+        cache.delete(user_cache_key(user.pk))
@@ -0,0 +1,162 @@
+"""Общие инструменты для нагрузочных замеров (management-команды bench_*)."""
+import json
+import math
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from io import BytesIO
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.crypto import get_random_string
+
+
+def percentile(samples, percent):
+    """Перцентиль по методу ближайшего ранга."""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = max(math.ceil(percent / 100 * len(ordered)) - 1, 0)
+    return ordered[rank]
+
+
+def summarize(samples):
+    """Сводка по задержкам в миллисекундах."""
+    return {
+        'count': len(samples),
+        'mean_ms': statistics.mean(samples) if samples else 0.0,
+        'p50_ms': percentile(samples, 50),
+        'p95_ms': percentile(samples, 95),
+        'p99_ms': percentile(samples, 99),
+    }
+
+
+@contextmanager
+def timer(samples):
+    """Добавляет в samples длительность блока в миллисекундах."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        samples.append((time.perf_counter() - start) * 1000)
+
+
+@contextmanager
+def benchmark_database(path=None, keepdb=False):
+    """
+    Отдельная база для замеров, чтобы не трогать рабочие данные.
+
+    База создаётся миграциями как тестовая, но в файле на диске: замеры
+    по базе в памяти не отражают стоимость ввода-вывода.
+    """
+    path = path or os.path.join(tempfile.gettempdir(),
+                                'yatube_benchmark.sqlite3')
+    settings.DATABASES['default'].setdefault('TEST', {})['NAME'] = path
+    old_name = connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, keepdb=keepdb)
+    try:
+        yield path
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0,
+                                            keepdb=keepdb)
+
+
+class WSGIDriver:
+    """Выполняет запросы через WSGIHandler в текущем процессе."""
+
+    def __init__(self):
+        self.handler = WSGIHandler()
+        self.csrf_token = get_random_string(32)
+
+    def environ(self, method, path, query=None, data=None, session=None):
+        body = urlencode(data or {}).encode()
+        cookies = {settings.CSRF_COOKIE_NAME: self.csrf_token}
+        if session:
+            cookies[settings.SESSION_COOKIE_NAME] = session
+        return {
+            'REQUEST_METHOD': method,
+            'PATH_INFO': path,
+            'QUERY_STRING': urlencode(query or {}),
+            'SERVER_NAME': 'testserver',
+            'SERVER_PORT': '80',
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'REMOTE_ADDR': '127.0.0.1',
+            'HTTP_COOKIE': '; '.join(f'{k}={v}' for k, v in cookies.items()),
+            'HTTP_X_CSRFTOKEN': self.csrf_token,
+            'CONTENT_TYPE': 'application/x-www-form-urlencoded',
+            'CONTENT_LENGTH': str(len(body)),
+            'wsgi.input': BytesIO(body),
+            'wsgi.errors': sys.stderr,
+            'wsgi.url_scheme': 'http',
+            'wsgi.version': (1, 0),
+            'wsgi.multithread': False,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+
+    def request(self, method, path, **kwargs):
+        """Возвращает (статус, размер тела ответа)."""
+        status = []
+
+        def start_response(response_status, headers, exc_info=None):
+            status.append(int(response_status.split()[0]))
+
+        result = self.handler(self.environ(method, path, **kwargs),
+                              start_response)
+        try:
+            size = sum(len(chunk) for chunk in result)
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+        return status[0], size
+
+    def profile(self, method, path, **kwargs):
+        """Один запрос с подсчётом SQL-запросов и пика выделенной памяти."""
+        with CaptureQueriesContext(connection) as captured:
+            tracemalloc.start()
+            try:
+                self.request(method, path, **kwargs)
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+        return len(captured.captured_queries), peak
+
+
+def find_regressions(results, baseline, threshold):
+    """
+    Сравнивает результаты с базовыми.
+
+    Регрессия — рост p95 больше чем в (1 + threshold) раз или рост
+    числа SQL-запросов на запрос.
+    """
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if current['p95_ms'] > base['p95_ms'] * (1 + threshold):
+            regressions.append(
+                f'{name}: p95 {base["p95_ms"]:.2f} → '
+                f'{current["p95_ms"]:.2f} мс')
+        if current.get('queries', 0) > base.get('queries', 0):
+            regressions.append(
+                f'{name}: запросов к БД {base["queries"]} → '
+                f'{current["queries"]}')
+    return regressions
+
+
+def load_json(path):
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def save_json(path, data):
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(data, file, ensure_ascii=False, indent=2, sort_keys=True)
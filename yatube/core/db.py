@@ -0,0 +1,35 @@
+import sqlite3
+
+from django.conf import settings
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """
+    Выставляет новому соединению SQLite PRAGMA из SQLITE_PRAGMAS.
+
+    Запросы идут мимо обёрток Django, чтобы не попадать в подсчёт
+    запросов (бюджеты, отладка) первого HTTP-запроса соединения.
+    """
+    if connection.vendor != 'sqlite' or not settings.SQLITE_PRAGMAS:
+        return
+    cursor = connection.connection.cursor()
+    try:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+    finally:
+        cursor.close()
+
+
+def copy_database(source, target_path):
+    """
+    Копирует базу соединения source в файл target_path.
+
+    Используется sqlite3 backup API: копия согласована, а читатели
+    файла-копии видят либо старое, либо новое состояние целиком.
+    """
+    source.ensure_connection()
+    target = sqlite3.connect(target_path)
+    try:
+        source.connection.backup(target)
+    finally:
+        target.close()
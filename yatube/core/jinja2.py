@@ -0,0 +1,32 @@
+"""Окружение Jinja2 для шаблонов из каталога jinja2/."""
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.template.defaultfilters import date
+from django.urls import reverse
+from jinja2 import Environment
+
+from posts.paginator import page_window
+from posts.templatetags.post_cards import render_cards
+
+
+def url(viewname, *args, **kwargs):
+    return reverse(viewname, args=args or None, kwargs=kwargs or None)
+
+
+def post_cards(page_obj, group_link_is_visible):
+    """Карточки постов из того же кэша фрагментов, что и у шаблонов Django."""
+    return render_cards(list(page_obj), group_link_is_visible,
+                        using='jinja2')
+
+
+def environment(**options):
+    env = Environment(**options)
+    env.globals.update({
+        'static': staticfiles_storage.url,
+        'url': url,
+        'post_cards': post_cards,
+        'page_window': page_window,
+    })
+    env.filters.update({
+        'date': date,
+    })
+    return env
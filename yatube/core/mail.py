@@ -0,0 +1,139 @@
+"""
+Очередь исходящих писем.
+
+С EMAIL_BACKEND = 'core.mail.QueuedEmailBackend' send_mail() и
+представления Django (сброс пароля и др.) только записывают письмо в
+таблицу OutgoingEmail — медленный почтовый сервер не задерживает ответ.
+Команда send_queued_mail отправляет письма порциями через настоящий
+бэкенд OUTBOX_EMAIL_BACKEND. Неудачная отправка повторяется с растущей
+паузой, не более OUTBOX_MAX_ATTEMPTS раз.
+"""
+import datetime
+import json
+import random
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """Бэкенд, ставящий письма в очередь вместо отправки."""
+
+    def send_messages(self, email_messages):
+        now = timezone.now()
+        rows = [to_row(message, now) for message in email_messages]
+        OutgoingEmail.objects.bulk_create(rows)
+        return len(rows)
+
+
+def to_row(message, now):
+    if message.attachments:
+        raise ValueError('Письма с вложениями в очередь не ставятся.')
+    html_bodies = [content for content, mimetype
+                   in getattr(message, 'alternatives', ())
+                   if mimetype == 'text/html']
+    return OutgoingEmail(
+        subject=message.subject,
+        body=message.body,
+        html_body=html_bodies[0] if html_bodies else '',
+        from_email=message.from_email,
+        to=json.dumps(message.to),
+        cc=json.dumps(message.cc),
+        bcc=json.dumps(message.bcc),
+        reply_to=json.dumps(message.reply_to),
+        headers=json.dumps(message.extra_headers),
+        next_attempt_at=now,
+    )
+
+
+def to_message(row, connection):
+    message = EmailMultiAlternatives(
+        subject=row.subject,
+        body=row.body,
+        from_email=row.from_email,
+        to=json.loads(row.to),
+        cc=json.loads(row.cc),
+        bcc=json.loads(row.bcc),
+        reply_to=json.loads(row.reply_to),
+        headers=json.loads(row.headers),
+        connection=connection,
+    )
+    if row.html_body:
+        message.attach_alternative(row.html_body, 'text/html')
+    return message
+
+
+def retry_delay(attempts):
+    """Пауза перед следующей попыткой: удваивается, со случайным сдвигом."""
+    delay = min(settings.OUTBOX_RETRY_DELAY * 2 ** (attempts - 1),
+                settings.OUTBOX_MAX_RETRY_DELAY)
+    return datetime.timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def claim_batch(batch_size):
+    """
+    Забирает письма, которым пора уйти.
+
+    Забранным письмам следующая попытка переносится на
+    OUTBOX_SEND_TIMEOUT: если отправитель упадёт, их заберёт другой.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        rows = list(
+            OutgoingEmail.objects
+            .select_for_update(skip_locked=True)
+            .filter(sent_at__isnull=True, next_attempt_at__lte=now,
+                    attempts__lt=settings.OUTBOX_MAX_ATTEMPTS)
+            .order_by('next_attempt_at')[:batch_size]
+        )
+        OutgoingEmail.objects.filter(pk__in=[row.pk for row in rows]).update(
+            next_attempt_at=now + datetime.timedelta(
+                seconds=settings.OUTBOX_SEND_TIMEOUT))
+    return rows
+
+
+def mark_failed(row, error):
+    row.attempts += 1
+    row.last_error = f'{type(error).__name__}: {error}'
+    row.next_attempt_at = timezone.now() + retry_delay(row.attempts)
+
+
+def send_batch(batch_size=100):
+    """
+    Отправляет порцию писем через одно соединение с сервером.
+
+    Возвращает (отправлено, с ошибкой).
+    """
+    rows = claim_batch(batch_size)
+    if not rows:
+        return 0, 0
+    sent, failed = [], []
+    connection = get_connection(settings.OUTBOX_EMAIL_BACKEND)
+    try:
+        connection.open()
+    except Exception as error:
+        for row in rows:
+            mark_failed(row, error)
+        failed = rows
+    else:
+        try:
+            for row in rows:
+                try:
+                    to_message(row, connection).send()
+                except Exception as error:
+                    mark_failed(row, error)
+                    failed.append(row)
+                else:
+                    row.sent_at = timezone.now()
+                    sent.append(row)
+        finally:
+            connection.close()
+    OutgoingEmail.objects.bulk_update(sent, ['sent_at'])
+    OutgoingEmail.objects.bulk_update(
+        failed, ['attempts', 'last_error', 'next_attempt_at'])
+    return len(sent), len(failed)
@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.mail import send_batch
+
+
+class Command(BaseCommand):
+    help = ('Отправляет письма из очереди OutgoingEmail порциями, '
+            'с повторами и растущей паузой после ошибок.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=100,
+            help='Сколько писем отправлять через одно соединение.')
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Не завершаться, а ждать новые письма.')
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help='Пауза между проверками очереди в режиме --loop, сек.')
+
+    def handle(self, *args, batch_size, loop, interval, **options):
+        total_sent = total_failed = 0
+        while True:
+            sent, failed = send_batch(batch_size)
+            total_sent += sent
+            total_failed += failed
+            if sent + failed < batch_size:
+                if not loop:
+                    break
+                time.sleep(interval)
+        self.stdout.write(self.style.SUCCESS(
+            f'Отправлено писем: {total_sent}, с ошибкой: {total_failed}.'))
@@ -0,0 +1,30 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from core.db import copy_database
+
+
+class Command(BaseCommand):
+    help = ('Копирует основную базу SQLite в файлы реплик '
+            'DATABASE_REPLICAS. Локальная замена репликации.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float, default=0,
+            help='Повторять копирование каждые N секунд (0 — один раз).')
+
+    def handle(self, *args, interval, **options):
+        if not settings.DATABASE_REPLICAS:
+            raise CommandError(
+                'Реплики не заданы: укажите пути в YATUBE_REPLICAS.')
+        while True:
+            for alias in settings.DATABASE_REPLICAS:
+                copy_database(connections['default'],
+                              connections[alias].settings_dict['NAME'])
+                self.stdout.write(f'{alias}: скопировано.')
+            if not interval:
+                return
+            time.sleep(interval)
@@ -0,0 +1,23 @@
+# Generated by Django 2.2.6 on 2026-10-18 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_outgoing_email'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outgoingemail',
+            name='headers',
+            field=models.TextField(default='{}', verbose_name='Заголовки'),
+        ),
+        migrations.AddField(
+            model_name='outgoingemail',
+            name='reply_to',
+            field=models.TextField(default='[]', verbose_name='Ответ на адреса'),
+        ),
+    ]
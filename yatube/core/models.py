@@ -0,0 +1,60 @@
+from django.db import models
+
+
+class OutgoingEmail(models.Model):
+    """Письмо в очереди на отправку (core.mail)."""
+    subject = models.CharField(
+        max_length=255,
+        verbose_name='Тема'
+    )
+    body = models.TextField(
+        verbose_name='Текст'
+    )
+    html_body = models.TextField(
+        blank=True,
+        verbose_name='HTML-версия'
+    )
+    from_email = models.CharField(
+        max_length=254,
+        verbose_name='Отправитель'
+    )
+    # Списки адресов в JSON.
+    to = models.TextField(verbose_name='Получатели')
+    cc = models.TextField(default='[]', verbose_name='Копия')
+    bcc = models.TextField(default='[]', verbose_name='Скрытая копия')
+    reply_to = models.TextField(default='[]', verbose_name='Ответ на адреса')
+    # Дополнительные заголовки письма: JSON-объект.
+    headers = models.TextField(default='{}', verbose_name='Заголовки')
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Поставлено в очередь'
+    )
+    next_attempt_at = models.DateTimeField(
+        verbose_name='Следующая попытка'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попыток'
+    )
+    last_error = models.TextField(
+        blank=True,
+        verbose_name='Последняя ошибка'
+    )
+    sent_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Отправлено'
+    )
+
+    def __str__(self):
+        return self.subject
+
+    class Meta:
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        ordering = ['next_attempt_at']
+        indexes = [
+            # Выборка писем, которым пора уйти
+            models.Index(fields=['sent_at', 'next_attempt_at'],
+                         name='outgoing_email_due_idx'),
+        ]
@@ -0,0 +1,99 @@
+"""
+Бюджеты SQL-запросов для представлений.
+
+Бюджет задаётся декоратором @query_budget(n) у представления или в
+настройке QUERY_BUDGETS по имени URL ('posts:index'). Middleware считает
+запросы через execute_wrapper, поэтому работает и без DEBUG=True.
+"""
+import logging
+import threading
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('yatube.query_budget')
+
+# Число превышений бюджета по имени представления в этом процессе.
+violations = Counter()
+
+_state = threading.local()
+
+
+class QueryBudgetExceeded(Exception):
+    """Представление выполнило больше запросов, чем ему положено."""
+
+
+def query_budget(max_queries):
+    """Задаёт представлению бюджет SQL-запросов на один запрос."""
+    def decorator(view_func):
+        view_func.query_budget = max_queries
+        return view_func
+    return decorator
+
+
+@contextmanager
+def not_counted():
+    """
+    Запросы блока не входят в бюджет текущего HTTP-запроса.
+
+    Для работы, которую поток делает за другие запросы, — например,
+    записи чужих публикаций при объединённой записи.
+    """
+    previous = getattr(_state, 'paused', False)
+    _state.paused = True
+    try:
+        yield
+    finally:
+        _state.paused = previous
+
+
+def get_budget(resolver_match):
+    """Бюджет представления: из настройки или из декоратора."""
+    if resolver_match is None:
+        return None
+    budget = settings.QUERY_BUDGETS.get(resolver_match.view_name)
+    if budget is None:
+        budget = getattr(resolver_match.func, 'query_budget', None)
+    return budget
+
+
+class QueryBudgetMiddleware:
+    """
+    Считает SQL-запросы каждого HTTP-запроса и сверяет их с бюджетом.
+
+    Превышение пишется в лог и в счётчик violations; при
+    QUERY_BUDGET_STRICT = True (режим тестов) — вызывает исключение.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        executed = []
+
+        def count_query(execute, sql, params, many, context):
+            if not getattr(_state, 'paused', False):
+                executed.append(sql)
+            return execute(sql, params, many, context)
+
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(count_query))
+            response = self.get_response(request)
+
+        match = getattr(request, 'resolver_match', None)
+        budget = get_budget(match)
+        if budget is not None and len(executed) > budget:
+            self.report(request, match.view_name, budget, executed)
+        return response
+
+    def report(self, request, view_name, budget, executed):
+        violations[view_name] += 1
+        message = (f'{view_name}: {len(executed)} SQL-запросов при бюджете '
+                   f'{budget} ({request.method} {request.path})')
+        logger.warning(message)
+        if settings.QUERY_BUDGET_STRICT:
+            raise QueryBudgetExceeded(
+                message + '\n' + '\n'.join(executed))
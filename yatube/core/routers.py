@@ -0,0 +1,102 @@
+"""
+Чтение с реплик базы данных.
+
+Запись всегда идёт в основную базу (default). Чтение уходит на одну из
+реплик DATABASE_REPLICAS только внутри представлений, помеченных
+@read_from_replica, и только для моделей из REPLICA_APP_LABELS: сессии
+читаются из основной базы, иначе только что вошедший пользователь
+разлогинивался бы до прихода реплики.
+
+Реплика отстаёт от основной базы не дольше DATABASE_REPLICA_LAG секунд.
+После запроса на запись ReplicaPinMiddleware ставит cookie на это время,
+и пока она жива, пользователь читает из основной базы и видит свою
+публикацию.
+"""
+import random
+import threading
+from contextlib import contextmanager
+from functools import wraps
+
+from django.conf import settings
+
+PIN_COOKIE_NAME = 'replica_pin'
+# Приложения, модели которых можно читать с реплики.
+REPLICA_APP_LABELS = ('auth', 'posts')
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+_state = threading.local()
+
+
+def replica_reads_active():
+    """Идёт ли чтение с реплики в текущем потоке."""
+    return bool(settings.DATABASE_REPLICAS) and getattr(
+        _state, 'active', False)
+
+
+@contextmanager
+def use_replica():
+    """Направляет чтение внутри блока на реплики."""
+    previous = getattr(_state, 'active', False)
+    _state.active = True
+    try:
+        yield
+    finally:
+        _state.active = previous
+
+
+def is_pinned(request):
+    """Пользователь недавно писал и должен читать из основной базы."""
+    return PIN_COOKIE_NAME in request.COOKIES
+
+
+def read_from_replica(view_func):
+    """Представление читает с реплики, если пользователь не закреплён."""
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if (not settings.DATABASE_REPLICAS
+                or request.method not in SAFE_METHODS
+                or is_pinned(request)):
+            return view_func(request, *args, **kwargs)
+        with use_replica():
+            return view_func(request, *args, **kwargs)
+    return wrapper
+
+
+class PrimaryReplicaRouter:
+    """Запись — в default, чтение в @read_from_replica — с реплики."""
+
+    def db_for_read(self, model, **hints):
+        if (replica_reads_active()
+                and model._meta.app_label in REPLICA_APP_LABELS):
+            return random.choice(settings.DATABASE_REPLICAS)
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики — копии default: объекты из них можно связывать.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Схема приходит на реплики вместе с данными.
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+
+class ReplicaPinMiddleware:
+    """После записи закрепляет пользователя за основной базой."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if settings.DATABASE_REPLICAS and request.method not in SAFE_METHODS:
+            response.set_cookie(
+                PIN_COOKIE_NAME, '1',
+                max_age=settings.DATABASE_REPLICA_LAG,
+                httponly=True, samesite='Lax',
+            )
+        return response
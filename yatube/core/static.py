@@ -0,0 +1,149 @@
+"""
+Статика в профиле production.
+
+CompressedManifestStaticFilesStorage при collectstatic даёт файлам
+имена с хэшем содержимого (как ManifestStaticFilesStorage) и кладёт
+рядом сжатые копии .gz и, если установлен пакет brotli, .br.
+
+PrecompressedStaticMiddleware отдаёт файлы из STATIC_ROOT до остальных
+middleware: выбирает готовую сжатую копию по Accept-Encoding, файлам
+с хэшем в имени ставит Cache-Control immutable на год и отвечает
+FileResponse — WSGI-сервер передаёт его через wsgi.file_wrapper
+(sendfile) без копирования в Python.
+"""
+import gzip
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import (ManifestStaticFilesStorage,
+                                                staticfiles_storage)
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Файлы, которые имеет смысл сжимать: изображения PNG/JPEG уже сжаты.
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.svg', '.ico', '.json', '.map',
+                           '.txt', '.xml', '.html')
+# Сжатые копии в порядке предпочтения: расширение и Content-Encoding.
+ENCODINGS = (('.br', 'br'), ('.gz', 'gzip'))
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'public, max-age=0, must-revalidate'
+
+
+def compress_gzip(content):
+    # mtime=0 — одинаковый результат при повторном collectstatic.
+    return gzip.compress(content, compresslevel=9, mtime=0)
+
+
+def compress_brotli(content):
+    return brotli.compress(content, quality=11)
+
+
+def compressors():
+    yield '.gz', compress_gzip
+    if brotli is not None:
+        yield '.br', compress_brotli
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Хэшированные имена и сжатые копии .gz/.br рядом с файлами."""
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in self.compressible(paths):
+            for hashed_name in (name, self.stored_name(name)):
+                self.write_compressed(hashed_name)
+
+    @staticmethod
+    def compressible(paths):
+        return [name for name in paths
+                if name.lower().endswith(COMPRESSIBLE_EXTENSIONS)]
+
+    def write_compressed(self, name):
+        path = self.path(name)
+        with open(path, 'rb') as source:
+            content = source.read()
+        for extension, compress in compressors():
+            compressed = compress(content)
+            # Копия, которая не меньше оригинала, не нужна.
+            if len(compressed) >= len(content):
+                continue
+            with open(path + extension, 'wb') as target:
+                target.write(compressed)
+
+
+def accepted_encodings(request):
+    """Кодировки из Accept-Encoding, кроме запрещённых через q=0."""
+    accepted = set()
+    for part in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        coding, _, params = part.strip().partition(';')
+        if re.match(r'\s*q\s*=\s*0(\.0*)?\s*$', params):
+            continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+class PrecompressedStaticMiddleware:
+    """Отдаёт STATIC_ROOT с готовым сжатием и долгим кэшированием."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.prefix = settings.STATIC_URL
+        self.root = settings.STATIC_ROOT
+        # Манифест меняется только при collectstatic, то есть при
+        # выкладке: имена с хэшем читаются один раз за процесс.
+        self.hashed_names = frozenset(
+            getattr(staticfiles_storage, 'hashed_files', {}).values())
+
+    def __call__(self, request):
+        if (request.method in ('GET', 'HEAD')
+                and request.path_info.startswith(self.prefix)):
+            response = self.serve(request,
+                                  request.path_info[len(self.prefix):])
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    def serve(self, request, name):
+        try:
+            path = safe_join(self.root, name)
+        except ValueError:
+            return None
+        if not os.path.isfile(path):
+            return None
+        stat = os.stat(path)
+        immutable = name in self.hashed_names
+        if not immutable and not was_modified_since(
+                request.META.get('HTTP_IF_MODIFIED_SINCE'),
+                stat.st_mtime, stat.st_size):
+            return HttpResponseNotModified()
+        content_type, _ = mimetypes.guess_type(path)
+        served, encoding = path, None
+        accepted = accepted_encodings(request)
+        for extension, coding in ENCODINGS:
+            if coding in accepted and os.path.isfile(path + extension):
+                served, encoding = path + extension, coding
+                break
+        response = FileResponse(
+            open(served, 'rb'),
+            content_type=content_type or 'application/octet-stream')
+        if encoding:
+            response['Content-Encoding'] = encoding
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if immutable:
+            response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+        else:
+            response['Cache-Control'] = REVALIDATE_CACHE_CONTROL
+            response['Last-Modified'] = http_date(stat.st_mtime)
+        return response
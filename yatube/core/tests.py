@@ -0,0 +1,390 @@
+import gzip
+import json
+import os
+import smtplib
+import sqlite3
+import tempfile
+from http import HTTPStatus
+from io import StringIO
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.contrib.sessions.models import Session
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail import EmailMessage, send_mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.db import connection, router
+from django.test import (Client, RequestFactory, SimpleTestCase, TestCase,
+                         TransactionTestCase, override_settings)
+from django.urls import reverse
+from django.utils import timezone
+
+from posts.models import Post
+
+from . import benchmark
+from .auth import user_cache_key
+from .db import apply_sqlite_pragmas, copy_database
+from .mail import send_batch
+from .models import OutgoingEmail
+from .routers import PIN_COOKIE_NAME, read_from_replica, use_replica
+from .static import brotli
+
+User = get_user_model()
+
+
+class BenchmarkHelpersTests(SimpleTestCase):
+    def test_percentiles(self):
+        """Перцентили считаются по ближайшему рангу."""
+        samples = list(range(1, 101))
+        summary = benchmark.summarize(samples)
+        self.assertEqual(
+            (summary['p50_ms'], summary['p95_ms'], summary['p99_ms']),
+            (50, 95, 99)
+        )
+        self.assertEqual(benchmark.percentile([], 95), 0.0)
+
+    def test_regressions(self):
+        """Регрессией считается рост p95 сверх порога или числа запросов."""
+        baseline = {
+            'index': {'p95_ms': 10.0, 'queries': 2},
+            'profile': {'p95_ms': 10.0, 'queries': 2},
+        }
+        results = {
+            'index': {'p95_ms': 11.0, 'queries': 2},
+            'profile': {'p95_ms': 13.0, 'queries': 3},
+            'search': {'p95_ms': 100.0, 'queries': 9},
+        }
+        regressions = benchmark.find_regressions(results, baseline, 0.2)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(all(line.startswith('profile')
+                            for line in regressions))
+
+
+class CachedAuthenticationTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.url = reverse('about:author')
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='cached_user',
+                                             password='pass')
+        self.client = Client()
+        self.client.force_login(self.user)
+        self.client.get(CachedAuthenticationTests.url)
+
+    def current_user(self):
+        return self.client.get(CachedAuthenticationTests.url).context['user']
+
+    def test_warm_request_has_no_auth_queries(self):
+        """Повторный запрос вошедшего пользователя идёт без запросов к БД."""
+        with self.assertNumQueries(0):
+            user = self.current_user()
+        self.assertEqual(user, self.user)
+        self.assertTrue(user.is_authenticated)
+
+    def test_user_edit_refreshes_snapshot(self):
+        """Изменение пользователя сбрасывает снимок."""
+        self.user.first_name = 'Новое имя'
+        self.user.save()
+        self.assertIsNone(cache.get(user_cache_key(self.user.pk)))
+        self.assertEqual(self.current_user().first_name, 'Новое имя')
+
+    def test_password_change_ends_other_sessions(self):
+        """После смены пароля старая сессия больше не действует."""
+        self.user.set_password('new-pass')
+        self.user.save()
+        self.assertFalse(self.current_user().is_authenticated)
+
+    def test_session_flush_fits_page_budgets(self):
+        """Сброс старой сессии укладывается в бюджеты страниц."""
+        post = Post.objects.create(author=self.user, text='Тестовый пост')
+        for url in (reverse('posts:index'),
+                    reverse('posts:profile',
+                            kwargs={'username': 'cached_user'}),
+                    reverse('posts:post_detail',
+                            kwargs={'post_id': post.pk}),
+                    CachedAuthenticationTests.url,
+                    reverse('about:tech')):
+            with self.subTest(url=url):
+                client = Client()
+                client.force_login(self.user)
+                client.get(url)
+                self.user.set_password(f'pass-{url}')
+                self.user.save()
+                response = client.get(url)
+                self.assertFalse(response.wsgi_request.user.is_authenticated)
+
+    def test_deactivated_user_is_anonymous(self):
+        """Снимок из кэша не пускает неактивного пользователя."""
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        cached = cache.get(user_cache_key(self.user.pk))
+        field_names, values, session_hash = cached
+        values = tuple(False if name == 'is_active' else value
+                       for name, value in zip(field_names, values))
+        cache.set(user_cache_key(self.user.pk),
+                  (field_names, values, session_hash))
+        self.assertFalse(self.current_user().is_authenticated)
+
+    def test_snapshot_has_no_password_hash(self):
+        """В кэш не попадает хэш пароля, только хэш для сессии."""
+        field_names, values, session_hash = cache.get(
+            user_cache_key(self.user.pk))
+        self.assertNotIn('password', field_names)
+        self.assertNotIn(self.user.password, values)
+        self.assertEqual(session_hash, self.user.get_session_auth_hash())
+        with self.assertNumQueries(0):
+            user = self.current_user()
+            self.assertEqual(
+                (user.username, user.is_active, user.is_staff),
+                ('cached_user', True, False))
+
+    def test_logout_forgets_user(self):
+        """Выход удаляет снимок пользователя и сессию."""
+        self.client.get(reverse('users:logout'))
+        self.assertIsNone(cache.get(user_cache_key(self.user.pk)))
+        self.assertFalse(self.current_user().is_authenticated)
+
+
+class SqlitePragmasTests(TestCase):
+    def test_new_connection_gets_pragmas(self):
+        """Соединению выставляются PRAGMA из SQLITE_PRAGMAS."""
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA cache_size')
+            old_value = cursor.fetchone()[0]
+        try:
+            with override_settings(SQLITE_PRAGMAS={'cache_size': -2000}):
+                apply_sqlite_pragmas(sender=None, connection=connection)
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA cache_size')
+                self.assertEqual(cursor.fetchone()[0], -2000)
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute(f'PRAGMA cache_size = {old_value}')
+
+    def test_no_pragmas_by_default(self):
+        """Без SQLITE_PRAGMAS соединение не трогается."""
+        with override_settings(SQLITE_PRAGMAS={}):
+            with self.assertNumQueries(0):
+                apply_sqlite_pragmas(sender=None, connection=connection)
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class PrimaryReplicaRouterTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.factory = RequestFactory()
+
+    @staticmethod
+    @read_from_replica
+    def read_alias(request):
+        return router.db_for_read(Post)
+
+    def test_reads_outside_views_use_primary(self):
+        self.assertEqual(router.db_for_read(Post), 'default')
+        self.assertEqual(router.db_for_write(Post), 'default')
+
+    def test_view_reads_use_replica(self):
+        """Чтение публикаций в помеченном представлении идёт с реплики."""
+        request = self.factory.get('/')
+        self.assertEqual(self.read_alias(request), 'replica')
+        with use_replica():
+            self.assertEqual(router.db_for_write(Post), 'default')
+            self.assertEqual(router.db_for_read(Session), 'default')
+
+    def test_pinned_user_reads_primary(self):
+        """После записи пользователь читает из основной базы."""
+        request = self.factory.get('/')
+        request.COOKIES[PIN_COOKIE_NAME] = '1'
+        self.assertEqual(self.read_alias(request), 'default')
+
+    def test_write_pins_user(self):
+        user = User.objects.create_user(username='replica_writer')
+        client = Client()
+        client.force_login(user)
+        # Реплика теста — та же база, что и основная.
+        with self.settings(DATABASE_REPLICAS=['default']):
+            response = client.get(reverse('posts:index'))
+            self.assertNotIn(PIN_COOKIE_NAME, response.cookies)
+            response = client.post(reverse('posts:post_create'),
+                                   {'text': 'Новая публикация'})
+        self.assertEqual(response.cookies[PIN_COOKIE_NAME]['max-age'],
+                         settings.DATABASE_REPLICA_LAG)
+
+
+class CopyDatabaseTests(TransactionTestCase):
+    def test_copy_has_primary_rows(self):
+        User.objects.create_user(username='replicated')
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'replica.sqlite3')
+            copy_database(connection, path)
+            replica = sqlite3.connect(path)
+            try:
+                rows = replica.execute(
+                    'SELECT username FROM auth_user').fetchall()
+            finally:
+                replica.close()
+        self.assertEqual(rows, [('replicated',)])
+
+
+class FailingEmailBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise smtplib.SMTPServerDisconnected('нет соединения')
+
+
+@override_settings(
+    EMAIL_BACKEND='core.mail.QueuedEmailBackend',
+    OUTBOX_EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+)
+class OutboxTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        User.objects.create_user(username='forgetful',
+                                 email='forgetful@example.com',
+                                 password='old-password')
+
+    def send_queued(self):
+        call_command('send_queued_mail', stdout=StringIO())
+
+    def test_password_reset_is_queued(self):
+        """Сброс пароля ставит письмо в очередь, отправляет его команда."""
+        response = self.client.post(reverse('users:password_reset_form'),
+                                    {'email': 'forgetful@example.com'})
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
+        self.assertEqual(mail.outbox, [])
+        email = OutgoingEmail.objects.get()
+        self.assertEqual(json.loads(email.to), ['forgetful@example.com'])
+        self.send_queued()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['forgetful@example.com'])
+        self.assertIn('/reset/', mail.outbox[0].body)
+        email.refresh_from_db()
+        self.assertIsNotNone(email.sent_at)
+        self.send_queued()
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_batches_share_connection(self):
+        send_mail('Тема', 'Текст', None, ['a@example.com'])
+        send_mail('Тема', 'Текст', None, ['b@example.com'])
+        with mock.patch('core.mail.get_connection',
+                        wraps=mail.get_connection) as get_connection:
+            self.assertEqual(send_batch(), (2, 0))
+        get_connection.assert_called_once()
+
+    def test_reply_to_and_headers_are_kept(self):
+        """Reply-To и дополнительные заголовки доходят до отправки."""
+        EmailMessage('Тема', 'Текст', None, ['a@example.com'],
+                     reply_to=['support@example.com'],
+                     headers={'X-Yatube': 'welcome'}).send()
+        self.assertEqual(send_batch(), (1, 0))
+        message = mail.outbox[0].message()
+        self.assertEqual(message['Reply-To'], 'support@example.com')
+        self.assertEqual(message['X-Yatube'], 'welcome')
+
+    @override_settings(OUTBOX_EMAIL_BACKEND='core.tests.FailingEmailBackend',
+                       OUTBOX_MAX_ATTEMPTS=2)
+    def test_failed_email_is_retried_later(self):
+        """После ошибки письмо ждёт паузу, после всех попыток — остаётся."""
+        send_mail('Тема', 'Текст', None, ['a@example.com'])
+        self.assertEqual(send_batch(), (0, 1))
+        email = OutgoingEmail.objects.get()
+        self.assertEqual(email.attempts, 1)
+        self.assertIn('SMTPServerDisconnected', email.last_error)
+        self.assertGreater(email.next_attempt_at, timezone.now())
+        self.assertEqual(send_batch(), (0, 0))
+        OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+        self.assertEqual(send_batch(), (0, 1))
+        OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+        self.assertEqual(send_batch(), (0, 0))
+        self.assertIsNone(OutgoingEmail.objects.get().sent_at)
+
+    def test_file_backend(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with self.settings(
+                OUTBOX_EMAIL_BACKEND=(
+                    'django.core.mail.backends.filebased.EmailBackend'),
+                EMAIL_FILE_PATH=directory,
+            ):
+                send_mail('Тема', 'Текст письма', None, ['a@example.com'])
+                self.send_queued()
+            files = os.listdir(directory)
+            self.assertEqual(len(files), 1)
+            with open(os.path.join(directory, files[0])) as sent:
+                self.assertIn('a@example.com', sent.read())
+
+
+class PrecompressedStaticTests(SimpleTestCase):
+    CSS = 'css/user_defined.css'
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.static_root = tempfile.TemporaryDirectory()
+        cls.static_settings = override_settings(
+            STATIC_ROOT=cls.static_root.name,
+            STATICFILES_STORAGE=(
+                'core.static.CompressedManifestStaticFilesStorage'),
+        )
+        cls.static_settings.enable()
+        call_command('collectstatic', interactive=False, verbosity=0)
+        cls.hashed = staticfiles_storage.stored_name(cls.CSS)
+        with open(os.path.join(settings.BASE_DIR, 'static', cls.CSS),
+                  'rb') as source:
+            cls.content = source.read()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.static_settings.disable()
+        cls.static_root.cleanup()
+        super().tearDownClass()
+
+    def path(self, name):
+        return os.path.join(self.static_root.name, name)
+
+    def test_hashed_copies_are_compressed(self):
+        """collectstatic кладёт рядом с файлом с хэшем его копию .gz."""
+        self.assertNotEqual(self.hashed, self.CSS)
+        with open(self.path(self.hashed + '.gz'), 'rb') as compressed:
+            self.assertEqual(gzip.decompress(compressed.read()),
+                             self.content)
+        self.assertFalse(os.path.exists(self.path('img/logo.png.gz')))
+
+    @skipUnless(brotli, 'пакет brotli не установлен')
+    def test_brotli_copies(self):
+        with open(self.path(self.hashed + '.br'), 'rb') as compressed:
+            self.assertEqual(brotli.decompress(compressed.read()),
+                             self.content)
+
+    def get(self, name, **extra):
+        with self.modify_settings(MIDDLEWARE={
+                'prepend': 'core.static.PrecompressedStaticMiddleware'}):
+            return Client().get(settings.STATIC_URL + name, **extra)
+
+    def test_serves_precompressed_file(self):
+        """Сжатая копия по Accept-Encoding, кэш на год для имени с хэшем."""
+        response = self.get(self.hashed, HTTP_ACCEPT_ENCODING='gzip, br;q=0')
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(
+            gzip.decompress(b''.join(response.streaming_content)),
+            self.content)
+
+    def test_serves_plain_file(self):
+        """Без Accept-Encoding — исходный файл; имя без хэша проверяется."""
+        response = self.get(self.CSS)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(b''.join(response.streaming_content), self.content)
+        self.assertNotIn('immutable', response['Cache-Control'])
+        response = self.get(
+            self.CSS, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
@@ -1,18 +1,124 @@
+import datetime
+
+from django.conf import settings
 from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.db.models.expressions import RawSQL
+from django.http import HttpResponseBadRequest, StreamingHttpResponse
+from django.urls import path
+from django.utils import timezone
+from django.utils.dateformat import format as format_date
+
+from . import export, search
+from .models import Group, Post, PostDailyStats
+from .paginator import LargeTablePaginator
+
 
-from .models import Group, Post
+class PubDateRollupFilter(admin.SimpleListFilter):
+    """Фильтр по месяцам, построенный по сводке PostDailyStats."""
+    title = 'Дата публикации'
+    parameter_name = 'pub_month'
+
+    def lookups(self, request, model_admin):
+        months = {}
+        days = PostDailyStats.objects.filter(posts_count__gt=0)
+        for day, count in days.values_list('day', 'posts_count'):
+            month = day.replace(day=1)
+            months[month] = months.get(month, 0) + count
+        return [
+            (month.strftime('%Y-%m'),
+             f'{format_date(month, "F Y")} ({count})')
+            for month, count in sorted(months.items(), reverse=True)
+        ]
+
+    def queryset(self, request, queryset):
+        if not self.value():
+            return queryset
+        try:
+            start = datetime.datetime.strptime(self.value(), '%Y-%m')
+        except ValueError:
+            return queryset.none()
+        end = (start + datetime.timedelta(days=32)).replace(day=1)
+        return queryset.filter(
+            pub_date__gte=timezone.make_aware(start),
+            pub_date__lt=timezone.make_aware(end),
+        )
 
 
 @admin.register(Post)
 class PostAdmin(admin.ModelAdmin):
     list_display = ('pk', 'text', 'pub_date', 'author', 'group')
+    list_select_related = ('author', 'group')
     search_fields = ('text',)
     list_filter = ('pub_date',)
     list_editable = ('group',)
     empty_value_display = '-пусто-'
 
+    @property
+    def show_full_result_count(self):
+        # В режиме большой таблицы не считаем все строки без фильтров.
+        return not settings.POSTS_ADMIN_LARGE_TABLE
+
+    def get_list_filter(self, request):
+        if settings.POSTS_ADMIN_LARGE_TABLE:
+            return (PubDateRollupFilter,)
+        return super().get_list_filter(request)
+
+    def get_paginator(self, request, queryset, per_page, orphans=0,
+                      allow_empty_first_page=True):
+        if settings.POSTS_ADMIN_LARGE_TABLE:
+            return LargeTablePaginator(queryset, per_page, orphans=orphans,
+                                       allow_empty_first_page=(
+                                           allow_empty_first_page))
+        return super().get_paginator(request, queryset, per_page, orphans,
+                                     allow_empty_first_page)
+
+    def get_search_results(self, request, queryset, search_term):
+        """Поиск по FTS5-индексу вместо LIKE '%term%' по всей таблице."""
+        match = search.build_match_query(search_term)
+        if not match or not search.is_available():
+            return super().get_search_results(request, queryset, search_term)
+        queryset = queryset.filter(
+            pk__in=RawSQL(search.match_ids_sql(), [match]))
+        return queryset, False
+
+    def get_urls(self):
+        return [
+            path('export/', self.admin_site.admin_view(self.export_view),
+                 name='posts_post_export'),
+        ] + super().get_urls()
+
+    def export_view(self, request):
+        """
+        Потоковая выгрузка публикаций для сотрудников.
+
+        Параметры: format (ndjson, csv), gzip, since, until, group, author.
+        """
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        fmt = request.GET.get('format', 'ndjson')
+        compress = bool(request.GET.get('gzip'))
+        try:
+            queryset = export.export_queryset(
+                since=request.GET.get('since'),
+                until=request.GET.get('until'),
+                group=request.GET.get('group'),
+                author=request.GET.get('author'),
+            )
+            chunks = export.export_stream(queryset, fmt, compress)
+        except export.ExportError as error:
+            return HttpResponseBadRequest(str(error))
+        response = StreamingHttpResponse(
+            chunks,
+            content_type=('application/gzip' if compress
+                          else export.CONTENT_TYPES[fmt]),
+        )
+        response['Content-Disposition'] = 'attachment; filename="{}"'.format(
+            export.export_filename(fmt, compress))
+        return response
+
 
 @admin.register(Group)
 class GroupAdmin(admin.ModelAdmin):
-    list_display = ('pk', 'slug', 'title')
+    list_display = ('pk', 'slug', 'title', 'posts_count')
     empty_value_display = '-пусто-'
@@ -0,0 +1,160 @@
+import math
+import random
+import time
+from collections import Counter
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.translation import get_language
+
+from core.routers import replica_reads_active
+
+PAGE_CACHE_HEADER = 'X-Page-Cache'
+# Заголовки ответа, которые сохраняются в кэше вместе со страницей.
+CACHED_HEADERS = ('Last-Modified',)
+# Сколько секунд пересчёт может держать блокировку single-flight.
+RECOMPUTE_LOCK_TIMEOUT = 10
+RECOMPUTE_WAIT_STEP = 0.05
+
+# Исходы get_or_recompute в этом процессе: hits, stale, recomputations.
+single_flight_stats = Counter()
+
+
+def _generation_key(scope):
+    return f'page_gen:{scope}'
+
+
+def get_generations(scopes):
+    """
+    Текущие поколения областей кэша одним multi-get.
+
+    Отсутствующее поколение заводится со значением от текущего времени,
+    чтобы после вытеснения из кэша не совпасть со старым номером.
+    """
+    keys = [_generation_key(scope) for scope in scopes]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, int(time.time() * 1000), None)
+            found[key] = cache.get(key)
+    return [found[key] for key in keys]
+
+
+def bump_generations(*scopes):
+    """Сбрасывает страницы областей: O(1) на область, без обхода ключей."""
+    for scope in set(scopes):
+        key = _generation_key(scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, int(time.time() * 1000), None)
+
+
+def cache_anonymous_page(*scopes):
+    """
+    Кэширует страницу для анонимных GET-запросов.
+
+    Области — строки, в которые подставляются аргументы представления,
+    например 'group:{slug}'. Ключ страницы включает поколения всех
+    областей, поэтому смена поколения сразу делает её устаревшей.
+    В заголовке X-Page-Cache отдаётся HIT или MISS.
+
+    Страница, прочитанная с реплики, может не содержать последних
+    записей, поэтому хранится не дольше допустимого отставания реплики.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            timeout = settings.POSTS_PAGE_CACHE_TIMEOUT
+            if (not timeout
+                    or request.method not in ('GET', 'HEAD')
+                    or request.user.is_authenticated):
+                return view_func(request, *args, **kwargs)
+            generations = get_generations(
+                [scope.format(**kwargs) for scope in scopes])
+            key = 'page:{}:{}:{}'.format(
+                get_language(), request.get_full_path(),
+                '.'.join(map(str, generations)))
+            cached = cache.get(key)
+            if cached is not None:
+                content, content_type, headers = cached
+                response = HttpResponse(content, content_type=content_type)
+                for header, value in headers.items():
+                    response[header] = value
+                response[PAGE_CACHE_HEADER] = 'HIT'
+            else:
+                response = view_func(request, *args, **kwargs)
+                if (response.status_code == 200
+                        and not response.streaming
+                        and not response.cookies):
+                    headers = {header: response[header]
+                               for header in CACHED_HEADERS
+                               if response.has_header(header)}
+                    if replica_reads_active():
+                        timeout = min(timeout,
+                                      settings.DATABASE_REPLICA_LAG)
+                    cache.set(key, (response.content,
+                                    response['Content-Type'], headers),
+                              timeout)
+                response[PAGE_CACHE_HEADER] = 'MISS'
+            patch_vary_headers(response, ('Cookie',))
+            return response
+        return wrapper
+    return decorator
+
+
+def post_detail_cache_key(post_id):
+    return f'post_detail:{post_id}'
+
+
+def get_or_recompute(key, compute, timeout, stale_timeout, beta=1.0):
+    """
+    Значение из кэша с защитой от одновременного пересчёта.
+
+    Значение хранится вместе со сроком свежести и временем своего
+    вычисления и лежит в кэше ещё stale_timeout секунд после срока.
+    Пересчитывает его один процесс — тот, кто взял блокировку
+    cache.add(); остальные тем временем отдают устаревшую копию.
+    Незадолго до срока пересчёт запускается заранее с вероятностью,
+    растущей к сроку и ко времени вычисления (XFetch, beta — её
+    множитель), поэтому популярный ключ обновляется до истечения.
+    """
+    entry = cache.get(key)
+    if entry is not None:
+        value, expires, delta = entry
+        # log(1 - random()) <= 0: чем дольше считается значение, тем
+        # раньше может начаться его пересчёт.
+        early = -delta * beta * math.log(1 - random.random())
+        if time.time() + early < expires:
+            single_flight_stats['hits'] += 1
+            return value
+    lock_key = f'{key}:lock'
+    locked = cache.add(lock_key, 1, RECOMPUTE_LOCK_TIMEOUT)
+    if not locked:
+        if entry is not None:
+            single_flight_stats['stale'] += 1
+            return entry[0]
+        # Холодный ключ: ждём результат того, кто уже считает. Если он
+        # упал и снял блокировку, её берёт один из ждущих и считает сам.
+        deadline = time.monotonic() + RECOMPUTE_LOCK_TIMEOUT
+        while not locked and time.monotonic() < deadline:
+            time.sleep(RECOMPUTE_WAIT_STEP)
+            entry = cache.get(key)
+            if entry is not None:
+                single_flight_stats['hits'] += 1
+                return entry[0]
+            locked = cache.add(lock_key, 1, RECOMPUTE_LOCK_TIMEOUT)
+    try:
+        started = time.perf_counter()
+        value = compute()
+        delta = time.perf_counter() - started
+        cache.set(key, (value, time.time() + timeout, delta),
+                  timeout + stale_timeout)
+        single_flight_stats['recomputations'] += 1
+    finally:
+        if locked:
+            cache.delete(lock_key)
+    return value
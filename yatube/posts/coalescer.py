@@ -0,0 +1,129 @@
+"""
+Объединённая запись новых публикаций (group commit).
+
+В SQLite каждая транзакция — это блокировка базы и fsync. Когда много
+пользователей публикуют одновременно, запросы выстраиваются в очередь
+на блокировку. С POSTS_COALESCE_WRITES = True публикации из
+параллельных запросов сохраняются одной транзакцией: первый поток
+становится ведущим, недолго ждёт соседей (если они были в прошлой
+порции), записывает всю порцию и передаёт ведущую роль следующему
+ждущему. Каждый запрос получает свой id уже после фиксации транзакции.
+"""
+import threading
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import transaction
+
+from core.query_budget import not_counted
+
+
+class PendingWrite:
+    """Публикация, ждущая записи, и результат записи."""
+    __slots__ = ('post', 'error', 'promoted', 'ready')
+
+    def __init__(self, post):
+        self.post = post
+        self.error = None
+        self.promoted = False
+        self.ready = threading.Event()
+
+
+class WriteCoalescer:
+    """Очередь публикаций, которые ведущий поток пишет порциями."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queue = []
+        self._leading = False
+        # Размер последней порции: одиночному писателю незачем ждать.
+        self._last_batch_size = 0
+
+    def save(self, post):
+        """Сохраняет публикацию в общей транзакции и возвращает её."""
+        item = PendingWrite(post)
+        with self._lock:
+            self._queue.append(item)
+            leader = not self._leading
+            self._leading = True
+        if leader:
+            if self._last_batch_size > 1:
+                # Соседи успевают встать в очередь за время окна.
+                time.sleep(settings.POSTS_COALESCE_WINDOW)
+            self._lead()
+        else:
+            item.ready.wait()
+            if item.promoted:
+                self._lead()
+        if item.error is not None:
+            raise item.error
+        return post
+
+    def _lead(self):
+        """Записывает порцию из начала очереди и передаёт роль дальше."""
+        with self._lock:
+            batch = self._queue[:settings.POSTS_COALESCE_MAX_BATCH]
+            del self._queue[:len(batch)]
+        self._last_batch_size = len(batch)
+        self._flush(batch)
+        with self._lock:
+            if self._queue:
+                successor = self._queue[0]
+                successor.promoted = True
+                successor.ready.set()
+            else:
+                self._leading = False
+
+    def _flush(self, batch):
+        """
+        Одна транзакция на порцию, точка сохранения на публикацию.
+
+        Ошибка одной публикации не мешает остальным. Если не удалась
+        фиксация всей порции (например, отложенная проверка внешнего
+        ключа), публикации записываются по одной.
+        """
+        try:
+            try:
+                with transaction.atomic():
+                    self._save_all(batch)
+            except Exception:
+                for item in batch:
+                    item.error = None
+                    item.post.pk = None
+                for item in batch:
+                    self._save_all([item], own=item is batch[0])
+        finally:
+            for item in batch:
+                item.ready.set()
+
+    @staticmethod
+    def _save_all(batch, own=True):
+        for number, item in enumerate(batch):
+            # Запросы за другие HTTP-запросы не входят в бюджет ведущего.
+            with ExitStack() as stack:
+                if number or not own:
+                    stack.enter_context(not_counted())
+                try:
+                    with transaction.atomic():
+                        item.post.save()
+                except Exception as error:
+                    item.error = error
+                    item.post.pk = None
+
+
+coalescer = WriteCoalescer()
+
+
+def save_post(post):
+    """
+    Сохраняет новую публикацию: через общую очередь, если она включена.
+
+    Внутри уже открытой транзакции (ATOMIC_REQUESTS, тесты) запись идёт
+    напрямую: чужой поток не может писать в неё.
+    """
+    if (not settings.POSTS_COALESCE_WRITES
+            or transaction.get_connection().in_atomic_block):
+        post.save()
+        return post
+    return coalescer.save(post)
@@ -0,0 +1,122 @@
+"""
+Валидаторы для условных GET-запросов (If-None-Match → 304).
+
+Каждый валидатор — один небольшой запрос по индексам: время последнего
+изменения публикаций выборки и их число из счётчиков. Число нужно,
+потому что удаление публикации не сдвигает максимум `updated`; по той
+же причине отдаётся только ETag, без Last-Modified.
+
+Имена авторов и названия групп на карточках лент не сдвигают `updated`
+публикаций; их изменения учитываются через поколения кэша страниц
+(posts.cache), которые сигналы сдвигают при сохранении авторов и групп.
+"""
+import hashlib
+
+from django.contrib.auth import get_user_model
+from django.db.models import OuterRef, Subquery
+from django.db.models.expressions import RawSQL
+
+from .cache import get_generations
+from .models import Group, Post, PostDailyStats
+
+User = get_user_model()
+
+
+def make_etag(request, *parts):
+    """
+    Слабый ETag из состояния данных, пользователя и GET-параметров.
+
+    Шапка страницы зависит от пользователя, а страница списка — от
+    параметров пагинации, поэтому они входят в ETag.
+    """
+    raw = '|'.join(str(part) for part in (
+        request.user.pk, request.GET.urlencode(), *parts))
+    return 'W/"{}"'.format(hashlib.md5(raw.encode()).hexdigest())
+
+
+def _last_updated(**filters):
+    return Subquery(
+        Post.objects.filter(**filters)
+        .order_by('-updated')
+        .values('updated')[:1]
+    )
+
+
+def index_etag(request):
+    total = RawSQL(
+        f'SELECT SUM(posts_count) FROM {PostDailyStats._meta.db_table}', ())
+    row = (
+        Post.objects
+        .order_by('-updated')
+        .annotate(total=total)
+        .values_list('updated', 'total')
+        .first()
+    )
+    return make_etag(request, row, *get_generations(('posts', 'authors')))
+
+
+def group_etag(request, slug):
+    row = (
+        Group.objects
+        .filter(slug=slug)
+        .annotate(last_updated=_last_updated(group=OuterRef('pk')))
+        .values_list('title', 'description', 'posts_count', 'last_updated')
+        .first()
+    )
+    if row is None:
+        return None
+    return make_etag(request, row, *get_generations(('authors',)))
+
+
+def profile_etag(request, username):
+    row = (
+        User.objects
+        .filter(username=username)
+        .annotate(last_updated=_last_updated(author=OuterRef('pk')))
+        .values_list('first_name', 'last_name', 'post_stats__posts_count',
+                     'last_updated')
+        .first()
+    )
+    if row is None:
+        return None
+    # На карточках профиля есть названия и ссылки групп; их правка
+    # сдвигает поколение 'posts'.
+    return make_etag(request, row, *get_generations(('posts',)))
+
+
+def api_post_etag(request, post_id):
+    """
+    ETag публикации в API: по тем полям, что отдаёт сериализатор.
+
+    Текст и даты сдвигают `updated`, автор и группа отдаются по
+    username и slug, поэтому они входят в ETag сами.
+    """
+    row = (
+        Post.objects
+        .filter(pk=post_id)
+        .values_list('updated', 'author__username', 'group__slug')
+        .first()
+    )
+    if row is None:
+        return None
+    return make_etag(request, row)
+
+
+def api_author_posts_etag(request, username):
+    """
+    ETag ленты автора в API.
+
+    slug групп в публикациях учитываются через поколение 'posts',
+    переименования пользователей — через 'authors'.
+    """
+    row = (
+        User.objects
+        .filter(username=username)
+        .annotate(last_updated=_last_updated(author=OuterRef('pk')))
+        .values_list('post_stats__posts_count', 'last_updated')
+        .first()
+    )
+    if row is None:
+        return None
+    return make_etag(request, row,
+                     *get_generations(('posts', 'authors')))
@@ -0,0 +1,55 @@
+import datetime
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import AuthorStats, Group, PostDailyStats
+
+
+def _shift(queryset, delta):
+    """Атомарно сдвигает posts_count; счётчик не уходит ниже нуля."""
+    if delta < 0:
+        queryset = queryset.filter(posts_count__gte=-delta)
+    return queryset.update(posts_count=F('posts_count') + delta)
+
+
+def _shift_or_create(model, lookup, delta):
+    """Сдвигает счётчик строки model, создавая её при первом росте."""
+    if not delta:
+        return
+    if _shift(model.objects.filter(**lookup), delta) or delta < 0:
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(posts_count=delta, **lookup)
+    except IntegrityError:
+        # Строку успел создать параллельный запрос.
+        _shift(model.objects.filter(**lookup), delta)
+
+
+def change_author_count(author_id, delta):
+    """Изменяет счётчик публикаций автора на delta."""
+    _shift_or_create(AuthorStats, {'author_id': author_id}, delta)
+
+
+def change_day_count(pub_date, delta):
+    """Изменяет число публикаций за день pub_date (момент или дата)."""
+    if isinstance(pub_date, datetime.datetime):
+        pub_date = timezone.localdate(pub_date)
+    _shift_or_create(PostDailyStats, {'day': pub_date}, delta)
+
+
+def change_group_count(group_id, delta):
+    """Изменяет счётчик публикаций группы на delta."""
+    if group_id is None or not delta:
+        return
+    _shift(Group.objects.filter(pk=group_id), delta)
+
+
+def get_author_count(author):
+    """Число публикаций автора из счётчика (с запасным COUNT)."""
+    try:
+        return author.post_stats.posts_count
+    except AuthorStats.DoesNotExist:
+        return author.posts.count()
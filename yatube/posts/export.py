@@ -0,0 +1,156 @@
+"""
+Потоковая выгрузка публикаций в NDJSON или CSV.
+
+Строки читаются порциями по ключу (pub_date, id): каждая порция —
+отдельный короткий запрос по индексу, без OFFSET и без транзакции на
+всё время выгрузки. Память не зависит от размера таблицы.
+"""
+import csv
+import datetime
+import zlib
+
+from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import Group, Post
+from .paginator import newer_than
+
+User = get_user_model()
+
+# Имя колонки → выражение для .values().
+FIELDS = {
+    'id': 'id',
+    'pub_date': 'pub_date',
+    'updated': 'updated',
+    'author': 'author__username',
+    'group': 'group__slug',
+    'text': 'text',
+}
+FORMATS = ('ndjson', 'csv')
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+class ExportError(ValueError):
+    pass
+
+
+def parse_moment(value, end_of_day=False):
+    """Момент из ISO-даты или даты-времени; дата — начало (конец) дня."""
+    try:
+        moment = parse_datetime(value)
+        day = parse_date(value) if moment is None else None
+        if day is not None and end_of_day:
+            day += datetime.timedelta(days=1)
+    except (ValueError, OverflowError):
+        # Верный формат, но несуществующая дата, например 2024-02-30.
+        moment = day = None
+    if moment is None:
+        if day is None:
+            raise ExportError(f'Некорректная дата: {value!r}.')
+        moment = datetime.datetime.combine(day, datetime.time())
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def export_queryset(since=None, until=None, group=None, author=None):
+    """
+    Публикации для выгрузки.
+
+    Группа и автор заменяются на id заранее, чтобы фильтр шёл по
+    составным индексам (group, pub_date) и (author, pub_date) без JOIN.
+    Дата-время until не включается, а дата без времени включает этот
+    день целиком (граница — начало следующего дня).
+    """
+    queryset = Post.objects.all()
+    if since:
+        queryset = queryset.filter(pub_date__gte=parse_moment(since))
+    if until:
+        queryset = queryset.filter(
+            pub_date__lt=parse_moment(until, end_of_day=True))
+    if group:
+        group_id = Group.objects.filter(slug=group).values_list(
+            'pk', flat=True).first()
+        if group_id is None:
+            raise ExportError(f'Группа {group!r} не найдена.')
+        queryset = queryset.filter(group_id=group_id)
+    if author:
+        author_id = User.objects.filter(username=author).values_list(
+            'pk', flat=True).first()
+        if author_id is None:
+            raise ExportError(f'Автор {author!r} не найден.')
+        queryset = queryset.filter(author_id=author_id)
+    return queryset
+
+
+def iter_batches(queryset, batch_size=2000):
+    """Порции строк .values() от старых публикаций к новым."""
+    rows = queryset.values(*FIELDS.values())
+    batch = list(rows.order_by('pub_date', 'id')[:batch_size])
+    while batch:
+        yield batch
+        if len(batch) < batch_size:
+            return
+        last = batch[-1]
+        batch = list(newer_than(rows, (last['pub_date'], last['id']))
+                     [:batch_size])
+
+
+class _Echo:
+    """Файлоподобный объект для csv.writer: возвращает записанное."""
+
+    def write(self, value):
+        return value
+
+
+def ndjson_chunks(batches):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for batch in batches:
+        yield ''.join(
+            encoder.encode({name: row[lookup]
+                            for name, lookup in FIELDS.items()}) + '\n'
+            for row in batch
+        )
+
+
+def csv_chunks(batches):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(FIELDS)
+    for batch in batches:
+        yield ''.join(
+            writer.writerow(
+                [row[lookup].isoformat()
+                 if isinstance(row[lookup], datetime.datetime)
+                 else row[lookup]
+                 for lookup in FIELDS.values()])
+            for row in batch
+        )
+
+
+def gzip_chunks(chunks):
+    """Сжимает поток на лету в формат gzip."""
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_stream(queryset, fmt='ndjson', compress=False, batch_size=2000):
+    """Байтовые куски выгрузки в формате fmt, при compress — в gzip."""
+    if fmt not in FORMATS:
+        raise ExportError(f'Неизвестный формат: {fmt!r}.')
+    writer = ndjson_chunks if fmt == 'ndjson' else csv_chunks
+    chunks = (chunk.encode()
+              for chunk in writer(iter_batches(queryset, batch_size)))
+    return gzip_chunks(chunks) if compress else chunks
+
+
+def export_filename(fmt, compress=False):
+    return f'posts.{fmt}' + ('.gz' if compress else '')
@@ -0,0 +1,118 @@
+"""
+RSS- и Atom-ленты публикаций: общая, группы и автора.
+
+Ленты кэшируются по поколениям тех же областей, что и страницы, и
+перестраиваются только после изменения публикаций в своей области.
+Опрос без новых записей — чтение из кэша и ответ 304 без запросов к БД.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.syndication.views import Feed
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.text import Truncator
+from django.views.decorators.http import conditional_page
+
+from .cache import cache_anonymous_page
+from .models import Group, Post
+
+User = get_user_model()
+
+
+def feed_view(feed, *scopes):
+    """Лента с кэшем по поколениям областей и ответами 304."""
+    return conditional_page(cache_anonymous_page(*scopes)(feed))
+
+
+class PostsFeed(Feed):
+    """Общая часть лент: последние публикации выборки."""
+
+    def get_queryset(self, obj):
+        """Все публикации или публикации объекта ленты (группы, автора)."""
+        if obj is None:
+            return Post.objects.all()
+        return obj.posts.all()
+
+    def items(self, obj):
+        return (
+            self.get_queryset(obj)
+            .select_related('author', 'group')
+            [:settings.POSTS_FEED_SIZE]
+        )
+
+    def item_title(self, item):
+        return Truncator(item.text).words(8)
+
+    def item_description(self, item):
+        return item.text_html
+
+    def item_link(self, item):
+        return reverse('posts:post_detail', kwargs={'post_id': item.pk})
+
+    def item_author_name(self, item):
+        return item.author.get_full_name() or item.author.username
+
+    def item_author_link(self, item):
+        return reverse('posts:profile',
+                       kwargs={'username': item.author.username})
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+    def item_updateddate(self, item):
+        return item.updated
+
+    def item_categories(self, item):
+        return [item.group.title] if item.group else []
+
+
+class LatestPostsFeed(PostsFeed):
+    title = 'yaTube: последние публикации'
+    description = 'Новые публикации всех авторов.'
+
+    def link(self):
+        return reverse('posts:index')
+
+
+class GroupPostsFeed(PostsFeed):
+    def get_object(self, request, slug):
+        return get_object_or_404(Group, slug=slug)
+
+    def title(self, obj):
+        return f'yaTube: {obj.title}'
+
+    def description(self, obj):
+        return f'Новые публикации сообщества «{obj.title}».'
+
+    def link(self, obj):
+        return reverse('posts:group_list', kwargs={'slug': obj.slug})
+
+
+class AuthorPostsFeed(PostsFeed):
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def title(self, obj):
+        return f'yaTube: {obj.get_full_name() or obj.username}'
+
+    def description(self, obj):
+        return f'Новые публикации пользователя {obj.username}.'
+
+    def link(self, obj):
+        return reverse('posts:profile', kwargs={'username': obj.username})
+
+
+class LatestPostsAtomFeed(LatestPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = LatestPostsFeed.description
+
+
+class GroupPostsAtomFeed(GroupPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = GroupPostsFeed.description
+
+
+class AuthorPostsAtomFeed(AuthorPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = AuthorPostsFeed.description
@@ -0,0 +1,169 @@
+import logging
+import random
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from django.db.models import Count
+from django.test import Client
+from django.urls import reverse
+
+from core import benchmark
+from posts.models import Group, Post
+from posts.seeding import seed_dataset
+
+User = get_user_model()
+
+# Профили базы: PRAGMA соединения и время жизни соединения.
+PROFILES = {
+    'default': {
+        'pragmas': {'journal_mode': 'DELETE'},
+        'conn_max_age': 0,
+    },
+    'production': {
+        'pragmas': settings.SQLITE_PRODUCTION_PRAGMAS,
+        'conn_max_age': 600,
+    },
+}
+
+
+class Command(BaseCommand):
+    help = ('Замеряет пропускную способность и задержки параллельных '
+            'читателей (ленты и страницы постов) и писателей (post_create) '
+            'для профилей SQLite по умолчанию и production.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=5000)
+        parser.add_argument('--readers', type=int, default=8,
+                            help='Потоков, читающих страницы.')
+        parser.add_argument('--writers', type=int, default=2,
+                            help='Потоков, создающих посты.')
+        parser.add_argument('--duration', type=float, default=10,
+                            help='Длительность замера профиля, сек.')
+        parser.add_argument('--profiles', default='default,production')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--database', default=None,
+                            help='Файл базы для замеров.')
+        parser.add_argument('--keepdb', action='store_true')
+
+    def handle(self, *args, **options):
+        settings.DEBUG = False
+        # Замеряется база, а не кэш страниц.
+        settings.POSTS_PAGE_CACHE_TIMEOUT = 0
+        # Ошибки 500 от «database is locked» считаются, а не печатаются.
+        logging.getLogger('django.request').setLevel(logging.CRITICAL)
+        old_pragmas = settings.SQLITE_PRAGMAS
+        old_conn_max_age = settings.DATABASES['default'].get(
+            'CONN_MAX_AGE', 0)
+        results = {}
+        try:
+            with benchmark.benchmark_database(options['database'],
+                                              options['keepdb']):
+                if not Post.objects.exists():
+                    seed_dataset(options['posts'], authors=50, groups=10,
+                                 seed=options['seed'])
+                self.prepare()
+                for profile in options['profiles'].split(','):
+                    self.apply_profile(PROFILES[profile])
+                    results[profile] = self.run(options)
+                self.apply_profile(PROFILES['default'])
+        finally:
+            settings.SQLITE_PRAGMAS = old_pragmas
+            settings.DATABASES['default']['CONN_MAX_AGE'] = old_conn_max_age
+        self.report(results)
+
+    def prepare(self):
+        """Адреса для читателей и сессия автора для писателей."""
+        author = (
+            User.objects.annotate(n=Count('posts')).order_by('-n').first())
+        client = Client()
+        client.force_login(author)
+        self.session = client.cookies[settings.SESSION_COOKIE_NAME].value
+        self.group_ids = list(Group.objects.values_list('pk', flat=True))
+        slugs = Group.objects.values_list('slug', flat=True)[:5]
+        usernames = User.objects.values_list('username', flat=True)[:5]
+        post_ids = Post.objects.values_list('pk', flat=True)[:50]
+        self.read_paths = (
+            [reverse('posts:index')]
+            + [reverse('posts:group_list', kwargs={'slug': slug})
+               for slug in slugs]
+            + [reverse('posts:profile', kwargs={'username': username})
+               for username in usernames]
+            + [reverse('posts:post_detail', kwargs={'post_id': pk})
+               for pk in post_ids]
+        )
+
+    def apply_profile(self, profile):
+        """Переключает профиль: новые соединения получат его настройки."""
+        connections.close_all()
+        settings.SQLITE_PRAGMAS = profile['pragmas']
+        settings.DATABASES['default']['CONN_MAX_AGE'] = (
+            profile['conn_max_age'])
+        # journal_mode хранится в файле базы: выставляем его сразу.
+        connection.ensure_connection()
+        connections.close_all()
+
+    def run(self, options):
+        deadline = time.monotonic() + options['duration']
+        samples = {'read': [], 'write': []}
+        errors = Counter()
+        lock = threading.Lock()
+
+        def worker(role, seed):
+            rng = random.Random(seed)
+            driver = benchmark.WSGIDriver()
+            own, failed = [], 0
+            try:
+                while time.monotonic() < deadline:
+                    with benchmark.timer(own):
+                        if role == 'read':
+                            status, _ = driver.request(
+                                'GET', rng.choice(self.read_paths))
+                        else:
+                            status, _ = driver.request(
+                                'POST', reverse('posts:post_create'),
+                                data={'text': f'Замер {rng.random()}',
+                                      'group': rng.choice(self.group_ids)},
+                                session=self.session)
+                    if status not in (200, 302):
+                        failed += 1
+            finally:
+                connections.close_all()
+            with lock:
+                samples[role].extend(own)
+                errors[role] += failed
+
+        threads = [
+            threading.Thread(target=worker, args=('read', i))
+            for i in range(options['readers'])
+        ] + [
+            threading.Thread(target=worker, args=('write', -i - 1))
+            for i in range(options['writers'])
+        ]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+        result = {}
+        for role, role_samples in samples.items():
+            result[role] = benchmark.summarize(role_samples)
+            result[role]['per_second'] = len(role_samples) / elapsed
+            result[role]['errors'] = errors[role]
+        return result
+
+    def report(self, results):
+        self.stdout.write(
+            f'{"Профиль":<12}{"роль":<7}{"запр/с":>9}{"p50":>9}{"p95":>9}'
+            f'{"p99":>9}{"ошибок":>8}')
+        for profile, result in results.items():
+            for role, stats in result.items():
+                self.stdout.write(
+                    f'{profile:<12}{role:<7}{stats["per_second"]:>9.1f}'
+                    f'{stats["p50_ms"]:>9.2f}{stats["p95_ms"]:>9.2f}'
+                    f'{stats["p99_ms"]:>9.2f}{stats["errors"]:>8}')
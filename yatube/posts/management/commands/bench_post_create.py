@@ -0,0 +1,132 @@
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from django.test import Client
+from django.urls import reverse
+
+from core import benchmark
+from posts.models import Group
+
+from .bench_concurrency import PROFILES
+
+User = get_user_model()
+
+MODES = {'direct': False, 'coalesced': True}
+
+
+class Command(BaseCommand):
+    help = ('Замеряет число публикаций в секунду через post_create при '
+            '1, 8 и 64 параллельных писателях: с отдельной транзакцией на '
+            'публикацию и с объединённой записью (POSTS_COALESCE_WRITES).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', default='1,8,64',
+                            help='Числа параллельных писателей.')
+        parser.add_argument('--duration', type=float, default=5,
+                            help='Длительность одного замера, сек.')
+        parser.add_argument('--modes', default='direct,coalesced')
+        parser.add_argument('--profile', default='default',
+                            choices=sorted(PROFILES))
+        parser.add_argument('--database', default=None,
+                            help='Файл базы для замеров.')
+
+    def handle(self, *args, **options):
+        settings.DEBUG = False
+        logging.getLogger('django.request').setLevel(logging.CRITICAL)
+        counts = [int(count) for count in options['writers'].split(',')]
+        old_coalesce = settings.POSTS_COALESCE_WRITES
+        old_pragmas = settings.SQLITE_PRAGMAS
+        old_conn_max_age = settings.DATABASES['default'].get(
+            'CONN_MAX_AGE', 0)
+        results = []
+        try:
+            with benchmark.benchmark_database(options['database']):
+                self.prepare(max(counts))
+                self.apply_profile(PROFILES[options['profile']])
+                for mode in options['modes'].split(','):
+                    settings.POSTS_COALESCE_WRITES = MODES[mode]
+                    for count in counts:
+                        results.append(
+                            (mode, count, self.run(count, options)))
+                connections.close_all()
+        finally:
+            settings.POSTS_COALESCE_WRITES = old_coalesce
+            settings.SQLITE_PRAGMAS = old_pragmas
+            settings.DATABASES['default']['CONN_MAX_AGE'] = old_conn_max_age
+        self.report(results)
+
+    def prepare(self, writers):
+        """Сессии авторов: у каждого писателя своя."""
+        self.group_id = Group.objects.create(
+            title='Замер', slug='bench-post-create',
+            description='Группа для замера записи').pk
+        self.sessions = []
+        for number in range(writers):
+            client = Client()
+            client.force_login(
+                User.objects.create(username=f'bench_writer_{number}'))
+            self.sessions.append(
+                client.cookies[settings.SESSION_COOKIE_NAME].value)
+
+    def apply_profile(self, profile):
+        connections.close_all()
+        settings.SQLITE_PRAGMAS = profile['pragmas']
+        settings.DATABASES['default']['CONN_MAX_AGE'] = (
+            profile['conn_max_age'])
+        connection.ensure_connection()
+        connections.close_all()
+
+    def run(self, writers, options):
+        deadline = time.monotonic() + options['duration']
+        samples, created, errors = [], [0], [0]
+        lock = threading.Lock()
+        path = reverse('posts:post_create')
+
+        def writer(session):
+            driver = benchmark.WSGIDriver()
+            own, ok, failed = [], 0, 0
+            try:
+                while time.monotonic() < deadline:
+                    with benchmark.timer(own):
+                        status, _ = driver.request(
+                            'POST', path, session=session,
+                            data={'text': 'Замер записи',
+                                  'group': self.group_id})
+                    if status == 302:
+                        ok += 1
+                    else:
+                        failed += 1
+            finally:
+                connections.close_all()
+            with lock:
+                samples.extend(own)
+                created[0] += ok
+                errors[0] += failed
+
+        threads = [threading.Thread(target=writer, args=(session,))
+                   for session in self.sessions[:writers]]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+        result = benchmark.summarize(samples)
+        result['per_second'] = created[0] / elapsed
+        result['errors'] = errors[0]
+        return result
+
+    def report(self, results):
+        self.stdout.write(
+            f'{"Режим":<11}{"писателей":>10}{"публ/с":>9}{"p50":>9}'
+            f'{"p95":>9}{"ошибок":>8}')
+        for mode, writers, stats in results:
+            self.stdout.write(
+                f'{mode:<11}{writers:>10}{stats["per_second"]:>9.1f}'
+                f'{stats["p50_ms"]:>9.2f}{stats["p95_ms"]:>9.2f}'
+                f'{stats["errors"]:>8}')
@@ -0,0 +1,98 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from django.template import engines
+from django.test import RequestFactory, override_settings
+from django.urls import resolve
+from django.utils import timezone
+
+from core import benchmark
+from posts.models import Group, Post
+
+User = get_user_model()
+
+ENGINES = ('django', 'jinja2')
+DUMMY_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+}
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает время рендеринга ленты публикаций шаблонами '
+            'Django и Jinja2 на страницах разного размера.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='10,100',
+                            help='Число постов на странице через запятую.')
+        parser.add_argument('--requests', type=int, default=300,
+                            help='Рендерингов с замером времени.')
+        parser.add_argument('--warmup', type=int, default=30)
+        parser.add_argument('--template', default='posts/index.html')
+        parser.add_argument(
+            '--card-cache', action='store_true',
+            help='Брать карточки из кэша (по умолчанию кэш выключен и '
+                 'замеряется рендеринг карточек).')
+
+    def handle(self, *args, **options):
+        settings.DEBUG = False
+        sizes = [int(size) for size in options['sizes'].split(',')]
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        request.resolver_match = resolve('/')
+        caches = {} if options['card_cache'] else {'CACHES': DUMMY_CACHES}
+        results = {}
+        with override_settings(**caches):
+            for size in sizes:
+                context = {
+                    'title': 'Добро пожаловать в yaTube',
+                    'page_obj': Paginator(self.make_posts(size),
+                                          size).page(1),
+                    'group_link_is_visible': True,
+                }
+                for engine in ENGINES:
+                    template = engines[engine].get_template(
+                        options['template'])
+                    results[(engine, size)] = self.measure(
+                        template, context, request, options)
+        self.report(results, sizes)
+
+    def make_posts(self, size):
+        """Посты в памяти: замеряется только рендеринг, без БД."""
+        now = timezone.now()
+        groups = [Group(pk=i, title=f'Группа {i}', slug=f'group-{i}')
+                  for i in range(1, 6)]
+        posts = []
+        for i in range(1, size + 1):
+            author = User(pk=i, username=f'author_{i}', first_name='Имя',
+                          last_name=f'Автор{i}')
+            posts.append(Post(
+                pk=i, author=author, group=groups[i % len(groups)],
+                text=f'Текст публикации номер {i}.\nВторая строка. ' * 5,
+                pub_date=now, updated=now,
+            ))
+        return posts
+
+    def measure(self, template, context, request, options):
+        for _ in range(options['warmup']):
+            template.render(context, request)
+        samples = []
+        for _ in range(options['requests']):
+            with benchmark.timer(samples):
+                template.render(context, request)
+        return benchmark.summarize(samples)
+
+    def report(self, results, sizes):
+        self.stdout.write(f'{"Движок":<10}{"постов":>8}{"p50":>9}{"p95":>9}'
+                          f'{"p99":>9}')
+        for (engine, size), result in results.items():
+            self.stdout.write(
+                f'{engine:<10}{size:>8}{result["p50_ms"]:>9.2f}'
+                f'{result["p95_ms"]:>9.2f}{result["p99_ms"]:>9.2f}')
+        for size in sizes:
+            django = results[('django', size)]['p50_ms']
+            jinja = results[('jinja2', size)]['p50_ms']
+            self.stdout.write(
+                f'{size} постов: p50 Django / p50 Jinja2 = '
+                f'{django / max(jinja, 1e-9):.1f}')
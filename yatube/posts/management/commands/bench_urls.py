@@ -0,0 +1,177 @@
+import random
+import statistics
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+from django.test import Client
+from django.urls import reverse
+
+from core import benchmark
+from posts import urls as posts_urls
+from posts.models import Group, Post
+from posts.seeding import seed_dataset
+
+User = get_user_model()
+
+# Дополнительные GET-параметры для представлений, которым они нужны.
+QUERY_PARAMS = {
+    'search': {'q': 'котики погода'},
+}
+# Представления с формой, для которых замеряется и отправка (POST).
+FORM_DATA = {
+    'post_create': lambda rng, group_id: {
+        'text': f'Замер {rng.random()}', 'group': group_id},
+    'post_edit': lambda rng, group_id: {
+        'text': f'Правка {rng.random()}', 'group': group_id},
+}
+
+
+class Command(BaseCommand):
+    help = ('Замеряет задержку, число SQL-запросов и выделение памяти '
+            'для каждого URL из posts.urls на синтетических данных.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=20000)
+        parser.add_argument('--authors', type=int, default=200)
+        parser.add_argument('--groups', type=int, default=50)
+        parser.add_argument('--skew', type=float, default=1.1,
+                            help='Параметр распределения Ципфа.')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--requests', type=int, default=200,
+                            help='Запросов с замером времени на URL.')
+        parser.add_argument('--warmup', type=int, default=20)
+        parser.add_argument('--profile-requests', type=int, default=10,
+                            help='Запросов с подсчётом SQL и памяти на URL.')
+        parser.add_argument('--database', default=None,
+                            help='Файл базы для замеров.')
+        parser.add_argument('--keepdb', action='store_true',
+                            help='Не удалять базу и данные между запусками.')
+        parser.add_argument('--save-baseline', metavar='PATH')
+        parser.add_argument('--compare', metavar='PATH',
+                            help='Сравнить с сохранённым JSON-результатом.')
+        parser.add_argument('--threshold', type=float, default=0.2,
+                            help='Допустимый рост p95 (0.2 — на 20%%).')
+
+    def handle(self, *args, **options):
+        settings.DEBUG = False
+        # Замеряется база, а не кэш страниц: иначе после прогрева
+        # повторные запросы к тем же URL были бы попаданиями в кэш.
+        settings.POSTS_PAGE_CACHE_TIMEOUT = 0
+        settings.POST_DETAIL_CACHE_TIMEOUT = 0
+        self.rng = random.Random(options['seed'])
+        with benchmark.benchmark_database(options['database'],
+                                          options['keepdb']):
+            if not Post.objects.exists():
+                self.seed(options)
+            self.prepare_samples()
+            results = self.run(options)
+        self.report(results)
+        dataset = {key: options[key]
+                   for key in ('posts', 'authors', 'groups', 'skew', 'seed')}
+        if options['save_baseline']:
+            benchmark.save_json(options['save_baseline'],
+                                {'dataset': dataset, 'results': results})
+            self.stdout.write(f'Результаты сохранены: '
+                              f'{options["save_baseline"]}')
+        if options['compare']:
+            baseline = benchmark.load_json(options['compare'])
+            regressions = benchmark.find_regressions(
+                results, baseline['results'], options['threshold'])
+            if regressions:
+                raise CommandError('Регрессии:\n' + '\n'.join(regressions))
+            self.stdout.write(self.style.SUCCESS('Регрессий нет.'))
+
+    def seed(self, options):
+        def progress(created):
+            self.stderr.write(f'\rПостов создано: {created}', ending='')
+
+        seed_dataset(options['posts'], options['authors'], options['groups'],
+                     skew=options['skew'], seed=options['seed'],
+                     progress=progress)
+        self.stderr.write('')
+
+    def prepare_samples(self):
+        """Значения аргументов URL и сессия самого активного автора."""
+        author = (
+            User.objects.annotate(n=Count('posts')).order_by('-n').first())
+        author.is_staff = author.is_superuser = True
+        author.save(update_fields=['is_staff', 'is_superuser'])
+        client = Client()
+        client.force_login(author)
+        self.session = client.cookies[settings.SESSION_COOKIE_NAME].value
+        self.samples = {
+            'slug': list(Group.objects.values_list('slug', flat=True)[:500]),
+            'username': list(
+                User.objects.values_list('username', flat=True)[:500]),
+            'post_id': list(Post.objects.values_list('pk', flat=True)[:5000]),
+        }
+        self.own_post_ids = list(
+            author.posts.values_list('pk', flat=True)[:500])
+        self.group_ids = list(Group.objects.values_list('pk', flat=True))
+
+    def url_for(self, name, converters, own=False):
+        kwargs = {}
+        for param in converters:
+            values = self.samples[param]
+            if param == 'post_id' and own:
+                values = self.own_post_ids
+            kwargs[param] = self.rng.choice(values)
+        return reverse(f'posts:{name}', kwargs=kwargs)
+
+    def run(self, options):
+        driver = benchmark.WSGIDriver()
+        results = {}
+        for pattern in posts_urls.urlpatterns:
+            name = pattern.name
+            converters = list(pattern.pattern.converters)
+            query = QUERY_PARAMS.get(name)
+            status, _ = driver.request('GET', self.url_for(name, converters),
+                                       query=query)
+            # Страницы, требующие входа, замеряем от имени автора.
+            session = self.session if status == 302 else None
+            plans = [('GET', name, None)]
+            if name in FORM_DATA:
+                plans.append(('POST', f'{name} [POST]', FORM_DATA[name]))
+            for method, label, form in plans:
+                def call(profile=False):
+                    data = None
+                    if form:
+                        data = form(self.rng, self.rng.choice(self.group_ids))
+                    path = self.url_for(name, converters, own=bool(session))
+                    do = driver.profile if profile else driver.request
+                    return do(method, path, query=query, data=data,
+                              session=session)
+
+                results[label] = self.measure(call, options)
+        return results
+
+    def measure(self, call, options):
+        for _ in range(options['warmup']):
+            call()
+        samples, sizes = [], []
+        for _ in range(options['requests']):
+            with benchmark.timer(samples):
+                _, size = call()
+            sizes.append(size)
+        profiles = [call(profile=True)
+                    for _ in range(options['profile_requests'])]
+        result = benchmark.summarize(samples)
+        result['queries'] = max(queries for queries, _ in profiles)
+        result['alloc_bytes'] = int(
+            statistics.median(peak for _, peak in profiles))
+        result['response_bytes'] = int(statistics.median(sizes))
+        return result
+
+    def report(self, results):
+        header = (f'{"URL":<22}{"p50":>9}{"p95":>9}{"p99":>9}'
+                  f'{"SQL":>6}{"alloc KiB":>11}{"body KiB":>10}')
+        self.stdout.write(header)
+        for name, result in results.items():
+            self.stdout.write(
+                f'{name:<22}{result["p50_ms"]:>9.2f}{result["p95_ms"]:>9.2f}'
+                f'{result["p99_ms"]:>9.2f}{result["queries"]:>6}'
+                f'{result["alloc_bytes"] / 1024:>11.1f}'
+                f'{result["response_bytes"] / 1024:>10.1f}'
+            )
@@ -0,0 +1,44 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from posts import export
+
+
+class Command(BaseCommand):
+    help = ('Потоково выгружает публикации с username автора и slug '
+            'группы в NDJSON или CSV, по желанию сжимая в gzip.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=export.FORMATS,
+                            default='ndjson')
+        parser.add_argument('--gzip', action='store_true',
+                            help='Сжимать выгрузку на лету.')
+        parser.add_argument('--output', metavar='PATH',
+                            help='Файл выгрузки; по умолчанию — stdout.')
+        parser.add_argument('--since', help='Начиная с даты (ISO 8601).')
+        parser.add_argument(
+            '--until',
+            help='По дату включительно; дата-время — до него, не включая.')
+        parser.add_argument('--group', help='Slug группы.')
+        parser.add_argument('--author', help='Username автора.')
+        parser.add_argument('--batch-size', type=int, default=2000,
+                            help='Строк в одном запросе к базе.')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size должен быть положительным.')
+        try:
+            queryset = export.export_queryset(
+                since=options['since'], until=options['until'],
+                group=options['group'], author=options['author'])
+        except export.ExportError as error:
+            raise CommandError(error)
+        chunks = export.export_stream(queryset, options['format'],
+                                      options['gzip'], options['batch_size'])
+        if options['output']:
+            with open(options['output'], 'wb') as output:
+                output.writelines(chunks)
+        else:
+            sys.stdout.buffer.writelines(chunks)
+            sys.stdout.buffer.flush()
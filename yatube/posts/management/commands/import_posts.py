@@ -0,0 +1,238 @@
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from posts.bulk import insert_posts
+from posts.cache import bump_generations
+from posts.counters import (change_author_count, change_day_count,
+                            change_group_count)
+from posts.models import Group, ImportProgress, Post
+from posts.rendering import render_html
+
+User = get_user_model()
+
+# Сколько имён авторов и слагов групп держать в памяти между порциями.
+LOOKUP_CACHE_SIZE = 100000
+
+
+class RowError(ValueError):
+    pass
+
+
+def read_jsonl(stream):
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as error:
+            yield RowError(f'некорректный JSON: {error}')
+
+
+def read_csv(stream):
+    yield from csv.DictReader(stream)
+
+
+def parse_pub_date(value):
+    """Дата из ISO 8601; без неё — текущий момент."""
+    if not value:
+        return timezone.now()
+    try:
+        pub_date = parse_datetime(str(value))
+    except ValueError:
+        pub_date = None
+    if pub_date is None:
+        raise RowError(f'некорректная дата {value!r}')
+    if timezone.is_naive(pub_date):
+        pub_date = timezone.make_aware(pub_date)
+    return pub_date
+
+
+READERS = {
+    'jsonl': read_jsonl,
+    'csv': read_csv,
+}
+
+
+class LookupCache:
+    """Ключ → id с догрузкой недостающих ключей одним запросом."""
+
+    def __init__(self, queryset, field):
+        self.queryset = queryset
+        self.field = field
+        self.ids = {}
+
+    def load(self, keys):
+        keys = {key for key in keys if isinstance(key, str)}
+        missing = keys - self.ids.keys()
+        if not missing:
+            return
+        if len(self.ids) + len(missing) > LOOKUP_CACHE_SIZE:
+            self.ids.clear()
+            missing = keys
+        found = dict(
+            self.queryset
+            .filter(**{f'{self.field}__in': missing})
+            .values_list(self.field, 'pk')
+        )
+        for key in missing:
+            self.ids[key] = found.get(key)
+
+    def get(self, key):
+        if not isinstance(key, str):
+            return None
+        return self.ids.get(key)
+
+
+class Command(BaseCommand):
+    help = ('Потоково импортирует публикации из JSONL или CSV (файл или '
+            'stdin). Поля строки: author (username), group (slug, можно '
+            'пусто), text, pub_date (ISO 8601, можно пусто).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Файл для импорта или '-' (stdin).")
+        parser.add_argument('--format', choices=sorted(READERS),
+                            help='Формат; по умолчанию — по расширению.')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Строк в одной транзакции.')
+        parser.add_argument(
+            '--state', metavar='NAME',
+            help='Имя импорта: его прогресс хранится в базе, и после '
+                 'сбоя импорт продолжится с первой незафиксированной '
+                 'порции.')
+
+    def handle(self, *args, path, batch_size, state, **options):
+        if batch_size < 1:
+            raise CommandError('--batch-size должен быть положительным.')
+        fmt = options['format'] or self.guess_format(path)
+        self.authors = LookupCache(User.objects.all(), 'username')
+        self.groups = LookupCache(Group.objects.all(), 'slug')
+        self.imported = self.skipped = 0
+        done = self.load_state(state)
+        if done:
+            self.stderr.write(f'Продолжение импорта после строки {done}.')
+
+        stream = sys.stdin if path == '-' else open(
+            path, encoding='utf-8', newline='')
+        started = time.monotonic()
+        try:
+            rows = enumerate(READERS[fmt](stream), start=1)
+            rows = itertools.islice(rows, done, None)
+            while True:
+                chunk = list(itertools.islice(rows, batch_size))
+                if not chunk:
+                    break
+                done = chunk[-1][0]
+                self.import_chunk(chunk, state, done)
+                # Скорость — по строкам, вставленным в этом запуске.
+                rate = self.imported / max(time.monotonic() - started, 1e-6)
+                self.stderr.write(
+                    f'\rОбработано строк: {done} ({rate:.0f} строк/с)',
+                    ending='')
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        self.stderr.write('')
+        if state:
+            ImportProgress.objects.filter(name=state).delete()
+        elapsed = max(time.monotonic() - started, 1e-6)
+        self.stdout.write(self.style.SUCCESS(
+            f'Импортировано публикаций: {self.imported}, '
+            f'пропущено строк: {self.skipped}, '
+            f'{self.imported / elapsed:.0f} строк/с.'
+        ))
+
+    def guess_format(self, path):
+        extension = os.path.splitext(path)[1].lstrip('.').lower()
+        if extension in ('json', 'ndjson'):
+            extension = 'jsonl'
+        if extension not in READERS:
+            raise CommandError(
+                'Не удалось определить формат, укажите --format.')
+        return extension
+
+    def load_state(self, state):
+        if not state:
+            return 0
+        return (
+            ImportProgress.objects
+            .filter(name=state)
+            .values_list('rows', flat=True)
+            .first()
+        ) or 0
+
+    def save_state(self, state, rows):
+        """Запоминает число обработанных строк — внутри транзакции порции."""
+        if state:
+            ImportProgress.objects.update_or_create(
+                name=state, defaults={'rows': rows})
+
+    def build_post(self, row):
+        if isinstance(row, RowError):
+            raise row
+        if not isinstance(row, dict):
+            raise RowError('строка должна быть объектом')
+        text = row.get('text')
+        if not isinstance(text, str) or not text.strip():
+            raise RowError('пустой текст')
+        author_id = self.authors.get(row.get('author'))
+        if author_id is None:
+            raise RowError(f'нет автора {row.get("author")!r}')
+        group_id = None
+        if row.get('group'):
+            group_id = self.groups.get(row['group'])
+            if group_id is None:
+                raise RowError(f'нет группы {row["group"]!r}')
+        post = Post(author_id=author_id, group_id=group_id,
+                    text=text.strip(),
+                    pub_date=parse_pub_date(row.get('pub_date')))
+        # insert_posts не вызывает save(), HTML заполняется здесь.
+        render_html(post)
+        return post
+
+    def import_chunk(self, chunk, state=None, done=None):
+        """
+        Одна порция — одна транзакция вместе со счётчиками и прогрессом.
+
+        Прогресс фиксируется вместе с публикациями, поэтому после сбоя
+        порция не импортируется повторно.
+        """
+        rows = [row for _, row in chunk if isinstance(row, dict)]
+        self.authors.load(row.get('author') for row in rows)
+        self.groups.load(row.get('group') for row in rows)
+        posts, slugs, usernames = [], set(), set()
+        for number, row in chunk:
+            try:
+                posts.append(self.build_post(row))
+                usernames.add(row['author'])
+                if posts[-1].group_id:
+                    slugs.add(row['group'])
+            except RowError as error:
+                self.skipped += 1
+                self.stderr.write(f'\rСтрока {number} пропущена: {error}')
+        authors = Counter(post.author_id for post in posts)
+        groups = Counter(post.group_id for post in posts)
+        days = Counter(timezone.localdate(post.pub_date) for post in posts)
+        with transaction.atomic():
+            insert_posts(posts)
+            for author_id, delta in authors.items():
+                change_author_count(author_id, delta)
+            for group_id, delta in groups.items():
+                change_group_count(group_id, delta)
+            for day, delta in days.items():
+                change_day_count(day, delta)
+            self.save_state(state, done)
+        self.imported += len(posts)
+        bump_generations('posts', *(f'group:{slug}' for slug in slugs),
+                         *(f'author:{username}' for username in usernames))
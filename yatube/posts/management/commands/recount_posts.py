@@ -0,0 +1,121 @@
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from posts.models import AuthorStats, Group, Post, PostDailyStats
+
+User = get_user_model()
+
+
+def _batches(queryset, batch_size):
+    """Порциями отдаёт id из queryset в порядке возрастания."""
+    last_id = 0
+    while True:
+        ids = list(
+            queryset.filter(pk__gt=last_id)
+            .order_by('pk')
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        if not ids:
+            return
+        yield ids
+        last_id = ids[-1]
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает число публикаций авторов, групп и дней '
+            'и исправляет разошедшиеся счётчики.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Сколько авторов или групп проверять за одну транзакцию.'
+        )
+
+    def handle(self, *args, batch_size, **options):
+        fixed_authors = sum(
+            self.repair_authors(ids)
+            for ids in _batches(User.objects.all(), batch_size)
+        )
+        fixed_groups = sum(
+            self.repair_groups(ids)
+            for ids in _batches(Group.objects.all(), batch_size)
+        )
+        fixed_days = self.repair_days(batch_size)
+        self.stdout.write(self.style.SUCCESS(
+            f'Исправлено счётчиков: авторов — {fixed_authors}, '
+            f'групп — {fixed_groups}, дней — {fixed_days}.'
+        ))
+
+    @transaction.atomic
+    def repair_authors(self, author_ids):
+        actual = dict(
+            Post.objects
+            .filter(author_id__in=author_ids)
+            .values_list('author_id')
+            .annotate(Count('id'))
+            .order_by()
+        )
+        stored = AuthorStats.objects.select_for_update().in_bulk(author_ids)
+        to_create, to_update = [], []
+        for author_id in author_ids:
+            count = actual.get(author_id, 0)
+            stats = stored.get(author_id)
+            if stats is None:
+                if count:
+                    to_create.append(
+                        AuthorStats(author_id=author_id, posts_count=count))
+            elif stats.posts_count != count:
+                stats.posts_count = count
+                to_update.append(stats)
+        AuthorStats.objects.bulk_create(to_create)
+        AuthorStats.objects.bulk_update(to_update, ['posts_count'])
+        return len(to_create) + len(to_update)
+
+    @transaction.atomic
+    def repair_groups(self, group_ids):
+        actual = dict(
+            Post.objects
+            .filter(group_id__in=group_ids)
+            .values_list('group_id')
+            .annotate(Count('id'))
+            .order_by()
+        )
+        to_update = []
+        for group in Group.objects.select_for_update().filter(
+                pk__in=group_ids):
+            count = actual.get(group.pk, 0)
+            if group.posts_count != count:
+                group.posts_count = count
+                to_update.append(group)
+        Group.objects.bulk_update(to_update, ['posts_count'])
+        return len(to_update)
+
+    def repair_days(self, batch_size):
+        actual = Counter()
+        for ids in _batches(Post.objects.all(), batch_size):
+            dates = Post.objects.filter(pk__in=ids).values_list(
+                'pub_date', flat=True)
+            actual.update(timezone.localdate(date) for date in dates)
+        with transaction.atomic():
+            stored = {
+                stats.day: stats
+                for stats in PostDailyStats.objects.select_for_update()
+            }
+            to_create, to_update = [], []
+            for day in set(actual) | set(stored):
+                count = actual.get(day, 0)
+                stats = stored.get(day)
+                if stats is None:
+                    to_create.append(
+                        PostDailyStats(day=day, posts_count=count))
+                elif stats.posts_count != count:
+                    stats.posts_count = count
+                    to_update.append(stats)
+            PostDailyStats.objects.bulk_create(to_create)
+            PostDailyStats.objects.bulk_update(to_update, ['posts_count'])
+        return len(to_create) + len(to_update)
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from posts.cache import bump_generations
+from posts.models import Post
+from posts.rendering import backfill_html
+
+
+class Command(BaseCommand):
+    help = ('Заполняет text_html и preview_html публикаций. По умолчанию '
+            'только пустые; с --all пересчитывает все, например после '
+            'изменения POSTS_PREVIEW_LENGTH.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Сколько публикаций обновлять за одну транзакцию.'
+        )
+        parser.add_argument(
+            '--all', action='store_true', dest='everything',
+            help='Пересчитать HTML всех публикаций.'
+        )
+
+    def handle(self, *args, batch_size, everything, **options):
+        done = backfill_html(Post, batch_size, only_missing=not everything)
+        if done:
+            # Область 'authors' входит во все кэшируемые страницы и ленты.
+            bump_generations('authors')
+        self.stdout.write(self.style.SUCCESS(
+            f'Обновлён HTML публикаций: {done}.'))
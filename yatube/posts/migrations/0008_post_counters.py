@@ -0,0 +1,59 @@
+# Generated by Django 2.2.6 on 2026-10-18 17:46
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_counters(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    Group = apps.get_model('posts', 'Group')
+    AuthorStats = apps.get_model('posts', 'AuthorStats')
+    db = schema_editor.connection.alias
+    author_counts = (
+        Post.objects.using(db)
+        .values_list('author_id')
+        .annotate(models.Count('id'))
+        .order_by()
+    )
+    AuthorStats.objects.using(db).bulk_create(
+        AuthorStats(author_id=author_id, posts_count=count)
+        for author_id, count in author_counts
+    )
+    group_counts = (
+        Post.objects.using(db)
+        .filter(group__isnull=False)
+        .values_list('group_id')
+        .annotate(models.Count('id'))
+        .order_by()
+    )
+    for group_id, count in group_counts:
+        Group.objects.using(db).filter(pk=group_id).update(posts_count=count)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0007_post_list_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthorStats',
+            fields=[
+                ('author', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='post_stats', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='Автор')),
+                ('posts_count', models.PositiveIntegerField(default=0, verbose_name='Число публикаций')),
+            ],
+            options={
+                'verbose_name': 'Статистика автора',
+                'verbose_name_plural': 'Статистика авторов',
+            },
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='posts_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Число публикаций'),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 2.2.6 on 2026-10-18 17:51
+
+from django.db import migrations, models
+from django.db.models.functions import TruncDate
+
+
+def fill_daily_stats(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    PostDailyStats = apps.get_model('posts', 'PostDailyStats')
+    db = schema_editor.connection.alias
+    per_day = (
+        Post.objects.using(db)
+        .annotate(day=TruncDate('pub_date'))
+        .values_list('day')
+        .annotate(models.Count('id'))
+        .order_by()
+    )
+    PostDailyStats.objects.using(db).bulk_create(
+        PostDailyStats(day=day, posts_count=count) for day, count in per_day
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0010_post_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostDailyStats',
+            fields=[
+                ('day', models.DateField(primary_key=True, serialize=False, verbose_name='День')),
+                ('posts_count', models.PositiveIntegerField(default=0, verbose_name='Число публикаций')),
+            ],
+            options={
+                'verbose_name': 'Публикации за день',
+                'verbose_name_plural': 'Публикации по дням',
+                'ordering': ['-day'],
+            },
+        ),
+        migrations.RunPython(fill_daily_stats, migrations.RunPython.noop),
+    ]
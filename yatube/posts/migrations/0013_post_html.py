@@ -0,0 +1,30 @@
+# Generated by Django 2.2.6 on 2026-10-18 18:16
+
+from django.db import migrations, models
+
+
+def fill_html(apps, schema_editor):
+    from posts.rendering import backfill_html
+    backfill_html(apps.get_model('posts', 'Post'),
+                  using=schema_editor.connection.alias)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0012_post_updated_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='preview_html',
+            field=models.TextField(blank=True, editable=False, verbose_name='Начало текста в HTML'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='text_html',
+            field=models.TextField(blank=True, editable=False, verbose_name='Текст в HTML'),
+        ),
+        migrations.RunPython(fill_html, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 2.2.6 on 2026-10-18 18:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0013_post_html'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='group',
+            name='description',
+            field=models.TextField(help_text='Введите описание группы.', verbose_name='Описание'),
+        ),
+        migrations.AlterField(
+            model_name='group',
+            name='slug',
+            field=models.SlugField(help_text='Короткий тэг для группы', unique=True, verbose_name='Семантический URL'),
+        ),
+        migrations.AlterField(
+            model_name='group',
+            name='title',
+            field=models.CharField(help_text='Введите название группы', max_length=200, verbose_name='Название'),
+        ),
+        migrations.AlterField(
+            model_name='post',
+            name='text',
+            field=models.TextField(help_text='Введите текст поста', verbose_name='Текст публикации'),
+        ),
+    ]
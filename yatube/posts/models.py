@@ -1,5 +1,7 @@
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, transaction
+
+from .rendering import HTML_FIELDS, render_html
 
 User = get_user_model()
 
@@ -20,6 +22,11 @@ class Group(models.Model):
         verbose_name='Описание',
         help_text='Введите описание группы.'
     )
+    posts_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Число публикаций'
+    )
 
     def __str__(self):
         return self.title
@@ -39,15 +46,32 @@ class Post(models.Model):
         auto_now_add=True,
         verbose_name='Дата публикации'
     )
+    updated = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата изменения'
+    )
+    # Вычисляются из text при сохранении (posts.rendering).
+    text_html = models.TextField(
+        blank=True,
+        editable=False,
+        verbose_name='Текст в HTML'
+    )
+    preview_html = models.TextField(
+        blank=True,
+        editable=False,
+        verbose_name='Начало текста в HTML'
+    )
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
+        db_index=False,  # покрыт составным индексом post_author_pub_date_idx
         related_name='posts',
         verbose_name='Автор'
     )
     group = models.ForeignKey(
         Group,
         on_delete=models.SET_NULL,
+        db_index=False,  # покрыт составным индексом post_group_pub_date_idx
         blank=True,
         null=True,
         related_name='posts',
@@ -58,7 +82,114 @@ class Post(models.Model):
     def __str__(self):
         return self.text[:18]
 
+    # Те же имена, что у posts.rows.PostRow: шаблоны карточек работают
+    # и с публикацией, и со строкой ленты.
+    @property
+    def author_username(self):
+        return self.author.username
+
+    @property
+    def author_full_name(self):
+        return self.author.get_full_name()
+
+    @property
+    def group_slug(self):
+        return self.group.slug if self.group_id else None
+
+    @property
+    def group_title(self):
+        return self.group.title if self.group_id else None
+
+    def save(self, *args, **kwargs):
+        # HTML пересчитывается при любом сохранении текста: из формы,
+        # админки или кода.
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'text' in update_fields:
+            render_html(self)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, *HTML_FIELDS}
+        # Счётчики обновляются в сигналах — в той же транзакции, что и пост.
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = 'Публикация'
         verbose_name_plural = 'Публикации'
-        ordering = ['-pub_date']
+        # id — разрешает равенство pub_date, порядок детерминирован
+        ordering = ['-pub_date', '-id']
+        indexes = [
+            models.Index(fields=['-pub_date', '-id'],
+                         name='post_pub_date_id_idx'),
+            models.Index(fields=['author', '-pub_date', '-id'],
+                         name='post_author_pub_date_idx'),
+            models.Index(fields=['group', '-pub_date', '-id'],
+                         name='post_group_pub_date_idx'),
+            # Последнее изменение в выборке для ETag списков
+            models.Index(fields=['-updated'], name='post_updated_idx'),
+            models.Index(fields=['author', '-updated'],
+                         name='post_author_updated_idx'),
+            models.Index(fields=['group', '-updated'],
+                         name='post_group_updated_idx'),
+        ]
+
+
+class AuthorStats(models.Model):
+    """Денормализованная статистика автора."""
+    author = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='post_stats',
+        verbose_name='Автор'
+    )
+    posts_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Число публикаций'
+    )
+
+    def __str__(self):
+        return f'{self.author}: {self.posts_count}'
+
+    class Meta:
+        verbose_name = 'Статистика автора'
+        verbose_name_plural = 'Статистика авторов'
+
+
+class PostDailyStats(models.Model):
+    """Число публикаций за день — сводка для фильтров админки."""
+    day = models.DateField(
+        primary_key=True,
+        verbose_name='День'
+    )
+    posts_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Число публикаций'
+    )
+
+    def __str__(self):
+        return f'{self.day}: {self.posts_count}'
+
+    class Meta:
+        verbose_name = 'Публикации за день'
+        verbose_name_plural = 'Публикации по дням'
+        ordering = ['-day']
+
+
+class ImportProgress(models.Model):
+    """Число обработанных строк импорта, фиксируется вместе с порцией."""
+    name = models.CharField(
+        max_length=255,
+        primary_key=True,
+        verbose_name='Импорт'
+    )
+    rows = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Обработано строк'
+    )
+
+    def __str__(self):
+        return f'{self.name}: {self.rows}'
+
+    class Meta:
+        verbose_name = 'Прогресс импорта'
+        verbose_name_plural = 'Прогресс импорта'
@@ -0,0 +1,273 @@
+import base64
+import binascii
+import hashlib
+from collections.abc import Sequence
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+
+def encode_cursor(pub_date, pk):
+    """Упаковывает ключ (pub_date, id) в строку для URL."""
+    raw = f'{pub_date.isoformat()}|{pk}'.encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Распаковывает курсор; для битого курсора возвращает None."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        pub_date, pk = raw.decode().split('|')
+        pub_date = parse_datetime(pub_date)
+        pk = int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+    if pub_date is None:
+        return None
+    return pub_date, pk
+
+
+def _row_key(row):
+    if isinstance(row, dict):
+        return row['pub_date'], row['id']
+    return row.pub_date, row.id
+
+
+def older_than(queryset, key):
+    """Объекты старше ключа (pub_date, id), от новых к старым."""
+    pub_date, pk = key
+    return (
+        queryset
+        .filter(pub_date__lte=pub_date)
+        .exclude(pub_date=pub_date, id__gte=pk)
+        .order_by('-pub_date', '-id')
+    )
+
+
+def newer_than(queryset, key):
+    """Объекты новее ключа (pub_date, id), от старых к новым."""
+    pub_date, pk = key
+    return (
+        queryset
+        .filter(pub_date__gte=pub_date)
+        .exclude(pub_date=pub_date, id__lte=pk)
+        .order_by('pub_date', 'id')
+    )
+
+
+class CursorPage(Sequence):
+    """Страница курсорной пагинации: ссылки «новее» и «старше»."""
+    is_cursor = True
+
+    def __init__(self, object_list, paginator, has_newer, has_older):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_newer = has_newer
+        self._has_older = has_older
+
+    def __repr__(self):
+        return f'<CursorPage of {len(self)} items>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_older
+
+    def has_previous(self):
+        return self._has_newer
+
+    def has_other_pages(self):
+        return self.has_previous() or self.has_next()
+
+    @property
+    def next_cursor(self):
+        """Курсор для перехода к более старым публикациям."""
+        if not self.has_next() or not self.object_list:
+            return None
+        return encode_cursor(*_row_key(self.object_list[-1]))
+
+    @property
+    def previous_cursor(self):
+        """Курсор для перехода к более новым публикациям."""
+        if not self.has_previous() or not self.object_list:
+            return None
+        return encode_cursor(*_row_key(self.object_list[0]))
+
+
+class CursorPaginator:
+    """
+    Пагинация по ключу (pub_date, id) без COUNT и OFFSET.
+
+    Стоимость выборки любой страницы одинакова: запрос идёт по индексу
+    от позиции курсора, а не отбрасывает все предыдущие строки.
+    """
+
+    def __init__(self, object_list, per_page):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+
+    @cached_property
+    def count(self):
+        """Общее число объектов; считается только по требованию."""
+        return self.object_list.count()
+
+    def get_page(self, after=None, before=None):
+        """
+        Возвращает страницу старше курсора `after` или новее `before`.
+
+        Без курсоров (или с битым курсором) — первую страницу.
+        """
+        after, before = decode_cursor(after), decode_cursor(before)
+        if before is not None:
+            queryset = newer_than(self.object_list, before)
+            rows = list(queryset[:self.per_page + 1])
+            if len(rows) <= self.per_page:
+                # Дошли до начала ленты — отдаём полную первую страницу.
+                return self.get_page()
+            rows = rows[:self.per_page][::-1]
+            return CursorPage(rows, self, True, True)
+        if after is not None:
+            queryset = older_than(self.object_list, after)
+        else:
+            queryset = self.object_list.order_by('-pub_date', '-id')
+        rows = list(queryset[:self.per_page + 1])
+        has_older = len(rows) > self.per_page
+        return CursorPage(rows[:self.per_page], self, after is not None,
+                          has_older)
+
+
+class LargeTablePaginator(Paginator):
+    """
+    Пагинатор для больших таблиц (список публикаций в админке).
+
+    * число объектов — оценка из sqlite_stat1 для нефильтрованной
+      выборки или точный COUNT, закэшированный на короткое время;
+    * следующая страница при последовательном листании выбирается по
+      ключу (pub_date, id) последней строки предыдущей страницы;
+    * при переходе сразу на далёкую страницу смещение отсчитывается
+      только по индексу (выбираются id), а строки читаются по id.
+    """
+    keyset_ordering = ('-pub_date', '-id')
+    deep_page_offset = 1000
+
+    def __init__(self, object_list, per_page, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        query = str(object_list.query).encode()
+        self._cache_prefix = 'large_table:{}'.format(
+            hashlib.md5(query).hexdigest())
+
+    @cached_property
+    def count(self):
+        estimate = self._estimated_count()
+        if estimate is not None:
+            return estimate
+        return cache.get_or_set(
+            f'{self._cache_prefix}:count', self.object_list.count,
+            settings.POSTS_ADMIN_COUNT_CACHE_TIMEOUT)
+
+    def _estimated_count(self):
+        """Оценка числа строк без фильтров по статистике ANALYZE."""
+        query = self.object_list.query
+        connection = connections[self.object_list.db]
+        if query.where or connection.vendor != 'sqlite':
+            return None
+        with connection.cursor() as cursor:
+            # Таблица sqlite_stat1 появляется после первого ANALYZE.
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")
+            if cursor.fetchone() is None:
+                return None
+            cursor.execute(
+                'SELECT stat FROM sqlite_stat1 WHERE tbl = %s',
+                [query.model._meta.db_table])
+            row = cursor.fetchone()
+        return int(row[0].split()[0]) if row else None
+
+    def _boundary_key(self, number):
+        return f'{self._cache_prefix}:boundary:{number}'
+
+    def _uses_keyset(self):
+        return tuple(self.object_list.query.order_by) == self.keyset_ordering
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        boundary = None
+        if bottom and self._uses_keyset():
+            boundary = cache.get(self._boundary_key(number - 1))
+        if boundary is not None:
+            object_list = older_than(self.object_list, boundary)
+            object_list = object_list[:self.per_page]
+        elif bottom >= self.deep_page_offset:
+            ids = list(
+                self.object_list
+                .values_list('pk', flat=True)[bottom:bottom + self.per_page]
+            )
+            object_list = self.object_list.filter(pk__in=ids)
+        else:
+            object_list = self.object_list[bottom:bottom + self.per_page]
+        rows = list(object_list)
+        if rows and self._uses_keyset():
+            cache.set(self._boundary_key(number), _row_key(rows[-1]),
+                      settings.POSTS_ADMIN_COUNT_CACHE_TIMEOUT)
+        return self._get_page(object_list, number, self)
+
+
+def get_page(request, object_list, view_name, count=None):
+    """
+    Страница публикаций для списка.
+
+    Если представление указано в POSTS_CURSOR_PAGINATION_VIEWS,
+    используется курсорная пагинация; старые ссылки вида `?page=N`
+    при этом продолжают обслуживаться обычным Paginator.
+    Известное заранее число объектов `count` избавляет от COUNT(*).
+    """
+    per_page = settings.NUM_OF_POSTS_ON_PAGE
+    cursor_mode = view_name in settings.POSTS_CURSOR_PAGINATION_VIEWS
+    if cursor_mode and 'page' not in request.GET:
+        paginator = CursorPaginator(object_list, per_page)
+    else:
+        paginator = Paginator(object_list, per_page)
+    if count is not None:
+        paginator.count = count
+    if isinstance(paginator, CursorPaginator):
+        return paginator.get_page(
+            after=request.GET.get('after'),
+            before=request.GET.get('before'),
+        )
+    return paginator.get_page(request.GET.get('page'))
+
+
+def page_window(page_obj, around=None):
+    """
+    Номера страниц для ссылок пагинатора: первая, последняя и `around`
+    страниц по обе стороны от текущей. Пропуски обозначаются None.
+
+    Ссылок не больше 2 * around + 5 при любом числе страниц.
+    """
+    if around is None:
+        around = settings.POSTS_PAGINATOR_WINDOW
+    last = page_obj.paginator.num_pages
+    start = max(page_obj.number - around, 1)
+    end = min(page_obj.number + around, last)
+    # Пропуск в одну страницу заменяется самой страницей.
+    if start <= 3:
+        start = 1
+    if end >= last - 2:
+        end = last
+    numbers = list(range(start, end + 1))
+    if start > 1:
+        numbers[:0] = [1, None]
+    if end < last:
+        numbers += [None, last]
+    return numbers
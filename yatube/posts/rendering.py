@@ -0,0 +1,70 @@
+"""
+HTML текста публикации, вычисляемый при сохранении.
+
+Ленты и страница поста показывают готовые text_html и preview_html,
+а не прогоняют полный text через linebreaksbr на каждом показе.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.template.defaultfilters import linebreaksbr
+from django.utils import timezone
+from django.utils.text import Truncator
+
+from .cache import post_detail_cache_key
+
+HTML_FIELDS = ('text_html', 'preview_html')
+
+
+def render_text_html(text):
+    """Полный текст с экранированием и переносами строк."""
+    return linebreaksbr(text)
+
+
+def render_preview_html(text):
+    """Начало текста для карточки в ленте."""
+    return linebreaksbr(Truncator(text).chars(settings.POSTS_PREVIEW_LENGTH))
+
+
+def render_html(post):
+    """Заполняет HTML-поля публикации по её тексту."""
+    post.text_html = render_text_html(post.text)
+    post.preview_html = render_preview_html(post.text)
+
+
+def backfill_html(model, batch_size=1000, only_missing=True,
+                  using='default'):
+    """
+    Заполняет HTML-поля порциями по возрастанию id.
+
+    model — модель Post или её историческая версия из миграции.
+    Публикациям, у которых HTML изменился, сдвигается `updated`: от него
+    зависят ключи кэша карточек и ETag страниц. Их данные страницы
+    публикации удаляются из кэша.
+    Возвращает число обновлённых публикаций.
+    """
+    manager = model._default_manager.db_manager(using)
+    queryset = manager.only('id', 'text', *HTML_FIELDS)
+    if only_missing:
+        queryset = queryset.filter(text_html='')
+    done, last_id = 0, 0
+    while True:
+        posts = list(
+            queryset.filter(pk__gt=last_id).order_by('pk')[:batch_size])
+        if not posts:
+            return done
+        last_id = posts[-1].pk
+        changed = []
+        for post in posts:
+            old = [getattr(post, field) for field in HTML_FIELDS]
+            render_html(post)
+            if [getattr(post, field) for field in HTML_FIELDS] != old:
+                changed.append(post)
+        now = timezone.now()
+        for post in changed:
+            post.updated = now
+        with transaction.atomic(using=using):
+            manager.bulk_update(changed, (*HTML_FIELDS, 'updated'))
+        cache.delete_many([post_detail_cache_key(post.pk)
+                           for post in changed])
+        done += len(changed)
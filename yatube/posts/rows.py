@@ -0,0 +1,66 @@
+"""
+Лёгкие строки публикаций для лент.
+
+Карточке поста нужны несколько столбцов, а не целые объекты Post, User
+и Group с хэшем пароля, last_login и прочими полями. Полный text тоже
+не читается: карточка показывает готовый preview_html. post_rows()
+выбирает только эти столбцы через values_list и отдаёт каждую строку
+как PostRow со __slots__. Имена атрибутов совпадают со свойствами Post,
+поэтому шаблоны карточек работают и с теми, и с другими.
+"""
+from django.db.models.query import BaseIterable
+
+# Поля строки и столбцы, из которых они выбираются.
+ROW_LOOKUPS = (
+    'id', 'preview_html', 'pub_date', 'updated', 'author__username',
+    'author__first_name', 'author__last_name', 'group__slug', 'group__title',
+)
+
+
+class PostRow:
+    """Публикация в ленте: только то, что показывает карточка."""
+    __slots__ = ('id', 'preview_html', 'pub_date', 'updated',
+                 'author_username', 'author_full_name', 'group_slug',
+                 'group_title')
+
+    def __init__(self, id, preview_html, pub_date, updated, author_username,
+                 author_first_name, author_last_name, group_slug,
+                 group_title):
+        self.id = id
+        self.preview_html = preview_html
+        self.pub_date = pub_date
+        self.updated = updated
+        self.author_username = author_username
+        # Как User.get_full_name().
+        self.author_full_name = (
+            f'{author_first_name} {author_last_name}'.strip())
+        self.group_slug = group_slug
+        self.group_title = group_title
+
+    def __repr__(self):
+        return f'<PostRow: {self.id}>'
+
+    @property
+    def pk(self):
+        return self.id
+
+
+class PostRowIterable(BaseIterable):
+    """Выбирает только столбцы ROW_LOOKUPS и отдаёт их как PostRow."""
+
+    def __iter__(self):
+        for values in self.queryset.values_list(*ROW_LOOKUPS):
+            yield PostRow(*values)
+
+
+def post_rows(queryset):
+    """
+    Выборка публикаций, отдающая PostRow вместо экземпляров Post.
+
+    Столбцы подменяются только при чтении строк, поэтому COUNT и
+    фильтры по-прежнему работают с одной таблицей публикаций, а
+    выборку можно сортировать и нарезать на страницы.
+    """
+    queryset = queryset.all()
+    queryset._iterable_class = PostRowIterable
+    return queryset
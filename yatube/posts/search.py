@@ -0,0 +1,173 @@
+import base64
+import binascii
+import re
+
+from django.db import connection
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .models import Post
+
+FTS_TABLE = 'posts_post_fts'
+SNIPPET_START, SNIPPET_END = '\x02', '\x03'
+SNIPPET_TOKENS = 16
+
+CREATE_TABLE_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "text, content='posts_post', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')"
+)
+# Триггеры пропадают, когда SQLite пересоздаёт таблицу в миграциях,
+# поэтому ensure_search_index() вызывается и после каждого migrate.
+TRIGGERS_SQL = (
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai "
+    f"AFTER INSERT ON posts_post BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.id, new.text); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad "
+    f"AFTER DELETE ON posts_post BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text) "
+    f"VALUES ('delete', old.id, old.text); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au "
+    f"AFTER UPDATE OF text ON posts_post BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text) "
+    f"VALUES ('delete', old.id, old.text); "
+    f"INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.id, new.text); END",
+)
+
+
+def is_available(using=connection):
+    """Полнотекстовый индекс есть только в SQLite."""
+    return using.vendor == 'sqlite'
+
+
+def ensure_search_index(using=connection):
+    """Создаёт FTS5-таблицу и триггеры синхронизации, если их нет."""
+    if (not is_available(using)
+            or 'posts_post' not in using.introspection.table_names()):
+        return
+    with using.cursor() as cursor:
+        cursor.execute(CREATE_TABLE_SQL)
+        for sql in TRIGGERS_SQL:
+            cursor.execute(sql)
+
+
+def rebuild_search_index(using=connection):
+    """Перестраивает индекс по текущему содержимому posts_post."""
+    ensure_search_index(using)
+    with using.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+
+
+def build_match_query(query):
+    """
+    Переводит пользовательский запрос в безопасное выражение MATCH.
+
+    Каждое слово берётся в кавычки (без операторов FTS5), последнее
+    ищется по префиксу. Пустой запрос даёт пустую строку.
+    """
+    words = re.findall(r'\w+', query)
+    if not words:
+        return ''
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def match_ids_sql():
+    """Подзапрос id постов, подходящих под MATCH %s."""
+    return f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s'
+
+
+def encode_cursor(rank, pk):
+    raw = f'{rank!r}|{pk}'.encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        rank, pk = raw.decode().split('|')
+        return float(rank), int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+
+def _highlight(snippet):
+    return mark_safe(
+        escape(snippet)
+        .replace(SNIPPET_START, '<mark>')
+        .replace(SNIPPET_END, '</mark>')
+    )
+
+
+class SearchResult:
+    """Найденный пост с подсвеченным фрагментом текста."""
+
+    def __init__(self, post, rank, snippet):
+        self.post = post
+        self.rank = rank
+        self.snippet = snippet
+
+
+class SearchPage:
+    """Страница результатов с курсором на следующую порцию."""
+
+    def __init__(self, results, next_cursor):
+        self.results = results
+        self.next_cursor = next_cursor
+
+    def __iter__(self):
+        return iter(self.results)
+
+    def __len__(self):
+        return len(self.results)
+
+
+def search_posts(query, per_page, after=None):
+    """
+    Ищет посты по тексту, упорядочивая по bm25.
+
+    Пагинация по ключу (rank, id): следующая страница продолжает выдачу
+    с позиции курсора `after`.
+    """
+    match = build_match_query(query)
+    if not match or not is_available():
+        return SearchPage([], None)
+    params = [SNIPPET_START, SNIPPET_END, SNIPPET_TOKENS, match]
+    keyset = ''
+    after = decode_cursor(after)
+    if after is not None:
+        keyset = 'WHERE rank > %s OR (rank = %s AND id > %s)'
+        params += [after[0], after[0], after[1]]
+    params.append(per_page + 1)
+    sql = (
+        'SELECT id, rank, snip FROM ('
+        f'SELECT rowid AS id, bm25({FTS_TABLE}) AS rank, '
+        f"snippet({FTS_TABLE}, 0, %s, %s, '…', %s) AS snip "
+        f'FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s'
+        f') {keyset} ORDER BY rank, id LIMIT %s'
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    posts = (
+        Post.objects
+        .select_related('author', 'group')
+        .in_bulk([row[0] for row in rows])
+    )
+    results = [
+        SearchResult(posts[pk], rank, _highlight(snippet))
+        for pk, rank, snippet in rows if pk in posts
+    ]
+    next_cursor = None
+    if has_more:
+        last_id, last_rank, _ = rows[-1]
+        next_cursor = encode_cursor(last_rank, last_id)
+    return SearchPage(results, next_cursor)
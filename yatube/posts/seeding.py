@@ -0,0 +1,101 @@
+"""Генерация синтетических данных для нагрузочных замеров."""
+import datetime
+import itertools
+import random
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
+
+from .bulk import insert_posts
+from .models import Group, Post
+from .rendering import render_html
+
+User = get_user_model()
+
+WORDS = (
+    'пост котики новости погода город дорога книга музыка фильм '
+    'лето зима утро вечер работа отдых друг семья спорт python django'
+).split()
+
+
+def zipf_weights(size, skew):
+    """Накопленные веса распределения Ципфа: немногие берут почти всё."""
+    weights = (1 / (rank + 1) ** skew for rank in range(size))
+    return list(itertools.accumulate(weights))
+
+
+def _text(rng):
+    return ' '.join(rng.choices(WORDS, k=rng.randint(5, 80))).capitalize()
+
+
+@transaction.atomic
+def _create_users(count, rng):
+    users = [
+        User(username=f'bench_author_{i}',
+             first_name=rng.choice(('Иван', 'Мария', 'Пётр', 'Анна')),
+             last_name=f'Автор{i}',
+             password='!')
+        for i in range(count)
+    ]
+    User.objects.bulk_create(users, batch_size=1000)
+    return list(User.objects.filter(username__startswith='bench_author_')
+                .order_by('pk').values_list('pk', flat=True))
+
+
+@transaction.atomic
+def _create_groups(count):
+    Group.objects.bulk_create(
+        (Group(title=f'Группа {i}', slug=f'bench-group-{i}',
+               description=f'Описание группы {i}')
+         for i in range(count)),
+        batch_size=1000,
+    )
+    return list(Group.objects.filter(slug__startswith='bench-group-')
+                .order_by('pk').values_list('pk', flat=True))
+
+
+def seed_dataset(posts, authors, groups, skew=1.1, days=365 * 3,
+                 batch_size=5000, seed=0, progress=None):
+    """
+    Заполняет базу авторами, группами и постами.
+
+    Авторы и группы постов выбираются по распределению Ципфа с
+    параметром skew, треть постов — без группы. Даты распределены
+    по последним `days` дням. Счётчики пересчитываются в конце,
+    поисковый индекс заполняют триггеры.
+    """
+    rng = random.Random(seed)
+    author_ids = _create_users(authors, rng)
+    group_ids = _create_groups(groups)
+    author_weights = zipf_weights(len(author_ids), skew)
+    group_weights = zipf_weights(len(group_ids), skew)
+    now = timezone.now()
+    span = datetime.timedelta(days=days).total_seconds()
+    created = 0
+    while created < posts:
+        size = min(batch_size, posts - created)
+        batch_authors = rng.choices(author_ids, cum_weights=author_weights,
+                                    k=size)
+        batch_groups = rng.choices(group_ids, cum_weights=group_weights,
+                                   k=size)
+        batch = []
+        for author_id, group_id in zip(batch_authors, batch_groups):
+            pub_date = now - datetime.timedelta(
+                seconds=rng.random() * span)
+            post = Post(
+                author_id=author_id,
+                group_id=group_id if rng.random() > 1 / 3 else None,
+                text=_text(rng),
+                pub_date=pub_date,
+            )
+            render_html(post)
+            batch.append(post)
+        with transaction.atomic():
+            insert_posts(batch)
+        created += size
+        if progress:
+            progress(created)
+    call_command('recount_posts', stdout=StringIO())
@@ -0,0 +1,123 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .cache import bump_generations, post_detail_cache_key
+from .counters import (change_author_count, change_day_count,
+                       change_group_count)
+from .models import Group, Post
+
+User = get_user_model()
+
+
+def _group_scopes(*group_ids):
+    """Области кэша страниц групп по их id."""
+    slugs = (
+        Group.objects
+        .filter(pk__in=[pk for pk in group_ids if pk is not None])
+        .values_list('slug', flat=True)
+    )
+    return [f'group:{slug}' for slug in slugs]
+
+
+def _author_scope(post):
+    """Область кэша лент автора поста."""
+    if Post.author.is_cached(post):
+        username = post.author.username
+    else:
+        username = (
+            User.objects
+            .filter(pk=post.author_id)
+            .values_list('username', flat=True)
+            .first()
+        )
+    return [f'author:{username}'] if username else []
+
+
+@receiver(pre_save, sender=Post)
+def remember_old_group(sender, instance, **kwargs):
+    """Запоминает группу поста до редактирования."""
+    if instance._state.adding or instance.pk is None:
+        instance._old_group_id = None
+        return
+    instance._old_group_id = (
+        Post.objects
+        .filter(pk=instance.pk)
+        .values_list('group_id', flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=Post)
+def update_counts_on_save(sender, instance, created, **kwargs):
+    """Обновляет счётчики при создании поста и смене его группы."""
+    if created:
+        change_author_count(instance.author_id, 1)
+        change_group_count(instance.group_id, 1)
+        change_day_count(instance.pub_date, 1)
+        return
+    old_group_id = getattr(instance, '_old_group_id', None)
+    if old_group_id != instance.group_id:
+        change_group_count(old_group_id, -1)
+        change_group_count(instance.group_id, 1)
+
+
+@receiver(post_delete, sender=Post)
+def update_counts_on_delete(sender, instance, **kwargs):
+    """Уменьшает счётчики при удалении поста."""
+    change_author_count(instance.author_id, -1)
+    change_group_count(instance.group_id, -1)
+    change_day_count(instance.pub_date, -1)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def expire_pages_on_post_change(sender, instance, **kwargs):
+    """Сбрасывает кэш главной, затронутых групп и лент автора."""
+    bump_generations(
+        'posts',
+        *_group_scopes(instance.group_id,
+                       getattr(instance, '_old_group_id', None)),
+        *_author_scope(instance),
+    )
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def expire_post_detail(sender, instance, **kwargs):
+    """Сбрасывает кэш страницы публикации."""
+    cache.delete(post_detail_cache_key(instance.pk))
+
+
+@receiver(pre_save, sender=Group)
+def remember_old_slug(sender, instance, **kwargs):
+    """Запоминает slug группы до редактирования."""
+    instance._old_slug = None
+    if not instance._state.adding and instance.pk is not None:
+        instance._old_slug = (
+            Group.objects
+            .filter(pk=instance.pk)
+            .values_list('slug', flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def expire_pages_on_group_change(sender, instance, **kwargs):
+    """Сбрасывает кэш страницы группы и главной (там названия групп)."""
+    scopes = ['posts', f'group:{instance.slug}']
+    old_slug = getattr(instance, '_old_slug', None)
+    if old_slug:
+        scopes.append(f'group:{old_slug}')
+    bump_generations(*scopes)
+
+
+@receiver(post_save, sender=User)
+def expire_pages_on_author_change(sender, instance, update_fields=None,
+                                  **kwargs):
+    """Сбрасывает страницы при изменении данных пользователя."""
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    bump_generations('authors')
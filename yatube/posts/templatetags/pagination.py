@@ -0,0 +1,15 @@
+from django import template
+
+from ..paginator import page_window as get_page_window
+
+register = template.Library()
+
+
+@register.simple_tag
+def page_window(page_obj, around=None):
+    """
+    Номера страниц вокруг текущей, None — пропуск.
+
+    Использование: {% page_window page_obj as pages %}
+    """
+    return get_page_window(page_obj, around)
@@ -0,0 +1,64 @@
+import hashlib
+
+from django import template
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+from django.utils.translation import get_language
+
+register = template.Library()
+
+
+def card_cache_key(post, group_link_is_visible, using=None):
+    """
+    Ключ кэша карточки поста (Post или posts.rows.PostRow).
+
+    Штамп `updated` меняется при редактировании поста, а хэш отображаемых
+    полей автора и группы — при их переименовании, поэтому устаревшая
+    карточка просто перестаёт запрашиваться. Карточки разных движков
+    шаблонов (using) хранятся отдельно.
+    """
+    shown = '\x1f'.join((
+        post.author_username, post.author_full_name,
+        post.group_slug or '', post.group_title or '',
+    ))
+    digest = hashlib.md5(shown.encode()).hexdigest()
+    return (f'post_card:{post.pk}:{post.updated.timestamp()}:'
+            f'{int(bool(group_link_is_visible))}:{get_language()}:{digest}'
+            + (f':{using}' if using else ''))
+
+
+def render_cards(posts, group_link_is_visible, using=None):
+    """
+    Карточки постов: один multi-get, рендер только промахов.
+
+    Возвращает список готовых HTML-фрагментов в порядке постов.
+    """
+    keys = [card_cache_key(post, group_link_is_visible, using)
+            for post in posts]
+    cached = cache.get_many(keys)
+    missed = {}
+    cards = []
+    for key, post in zip(keys, posts):
+        card = cached.get(key)
+        if card is None:
+            card = render_to_string('posts/post_card.html', {
+                'post': post,
+                'group_link_is_visible': group_link_is_visible,
+            }, using=using)
+            missed[key] = card
+        cards.append(mark_safe(card))
+    if missed:
+        cache.set_many(missed, settings.POST_CARD_CACHE_TIMEOUT)
+    return cards
+
+
+@register.simple_tag
+def post_cards(page_obj, group_link_is_visible):
+    """
+    Карточки постов страницы из кэша фрагментов.
+
+    Использование: {% post_cards page_obj group_link_is_visible as cards %}
+    """
+    return render_cards(list(page_obj), group_link_is_visible)
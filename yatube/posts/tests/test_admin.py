@@ -0,0 +1,101 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from ..admin import PostAdmin
+from ..models import Group, Post, PostDailyStats
+from ..paginator import LargeTablePaginator
+
+User = get_user_model()
+
+
+@mock.patch.object(PostAdmin, 'list_per_page', 10)
+class PostAdminLargeTableTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_superuser(
+            username='admin', email='admin@yatube.ru', password='pass')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='admin-group',
+            description='Тестовое описание',
+        )
+        cls.num_of_test_posts = 35
+        for i in range(cls.num_of_test_posts):
+            Post.objects.create(author=cls.user, group=cls.group,
+                                text=f'Тестовый пост {i}')
+        cls.expected_ids = list(
+            Post.objects.order_by('-pub_date', '-id')
+            .values_list('id', flat=True)
+        )
+        cls.url = reverse('admin:posts_post_changelist')
+
+    def setUp(self):
+        cache.clear()
+        self.admin_client = Client()
+        self.admin_client.force_login(PostAdminLargeTableTests.user)
+
+    def get_changelist(self, **params):
+        return self.admin_client.get(
+            PostAdminLargeTableTests.url, params).context['cl']
+
+    def page_ids(self, cl):
+        return [post.id for post in cl.result_list]
+
+    def test_no_unfiltered_count_and_related_prefetch(self):
+        """Нет COUNT без фильтров, автор и группа берутся одним JOIN."""
+        with CaptureQueriesContext(connection) as captured:
+            cl = self.get_changelist()
+        self.assertIsInstance(cl.paginator, LargeTablePaginator)
+        self.assertIsNone(cl.full_result_count)
+        user_lookups = [
+            query['sql'] for query in captured.captured_queries
+            if 'FROM "auth_user" WHERE "auth_user"."id" =' in query['sql']
+        ]
+        # Единственный запрос пользователя — request.user из сессии.
+        self.assertEqual(len(user_lookups), 1)
+        self.assertEqual(self.page_ids(cl),
+                         PostAdminLargeTableTests.expected_ids[:10])
+
+    def test_sequential_pages_use_keyset(self):
+        """Следующая страница выбирается от последней строки предыдущей."""
+        expected = PostAdminLargeTableTests.expected_ids
+        self.get_changelist()
+        with CaptureQueriesContext(connection) as captured:
+            cl = self.get_changelist(p=1)
+        self.assertEqual(self.page_ids(cl), expected[10:20])
+        self.assertFalse([
+            query['sql'] for query in captured.captured_queries
+            if 'OFFSET' in query['sql']
+        ])
+
+    def test_deep_page_reads_ids_first(self):
+        """Далёкая страница: смещение только по id, строки — по id."""
+        expected = PostAdminLargeTableTests.expected_ids
+        with mock.patch.object(LargeTablePaginator, 'deep_page_offset', 20):
+            cl = self.get_changelist(p=3)
+        self.assertEqual(self.page_ids(cl), expected[30:])
+
+    def test_month_filter_from_rollup(self):
+        """Фильтр по месяцам строится по сводке публикаций по дням."""
+        month = timezone.localdate().strftime('%Y-%m')
+        self.assertEqual(
+            sum(PostDailyStats.objects.values_list('posts_count', flat=True)),
+            PostAdminLargeTableTests.num_of_test_posts
+        )
+        response = self.admin_client.get(PostAdminLargeTableTests.url)
+        self.assertIn(f'pub_month={month}', response.content.decode())
+        self.assertIn(f'({PostAdminLargeTableTests.num_of_test_posts})',
+                      response.content.decode())
+        cl = self.get_changelist(pub_month=month)
+        self.assertEqual(cl.result_count,
+                         PostAdminLargeTableTests.num_of_test_posts)
+        cl = self.get_changelist(pub_month='2000-01')
+        self.assertEqual(cl.result_count, 0)
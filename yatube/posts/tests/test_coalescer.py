@@ -0,0 +1,95 @@
+import threading
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from ..coalescer import PendingWrite, WriteCoalescer, save_post
+from ..models import Post
+
+User = get_user_model()
+
+
+@override_settings(POSTS_COALESCE_WINDOW=0.01, POSTS_COALESCE_MAX_BATCH=64)
+class WriteCoalescerTests(SimpleTestCase):
+    def setUp(self):
+        self.coalescer = WriteCoalescer()
+        self.batches = []
+
+    def fake_flush(self, batch):
+        self.batches.append(len(batch))
+        time.sleep(0.01)
+        for item in batch:
+            if item.post.fail:
+                item.error = ValueError(item.post.number)
+            else:
+                item.post.pk = item.post.number
+            item.ready.set()
+
+    def run_writers(self, posts):
+        results = {}
+
+        def write(post):
+            try:
+                results[post.number] = self.coalescer.save(post).pk
+            except ValueError as error:
+                results[post.number] = error
+
+        threads = [threading.Thread(target=write, args=(post,))
+                   for post in posts]
+        with mock.patch.object(self.coalescer, '_flush', self.fake_flush):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        return results
+
+    def test_concurrent_writes_are_batched(self):
+        """Параллельные записи идут порциями, каждая получает свой id."""
+        posts = [SimpleNamespace(number=number, fail=False, pk=None)
+                 for number in range(32)]
+        results = self.run_writers(posts)
+        self.assertEqual(results, {number: number for number in range(32)})
+        self.assertEqual(sum(self.batches), 32)
+        self.assertLess(len(self.batches), 32)
+
+    def test_error_reaches_own_request(self):
+        posts = [SimpleNamespace(number=number, fail=number == 3, pk=None)
+                 for number in range(8)]
+        results = self.run_writers(posts)
+        self.assertIsInstance(results.pop(3), ValueError)
+        self.assertEqual(results, {number: number
+                                   for number in range(8) if number != 3})
+
+
+class WriteCoalescerFlushTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='coalesced_author')
+
+    def test_flush_saves_batch(self):
+        """Порция пишется целиком, ошибка одной публикации изолирована."""
+        user = WriteCoalescerFlushTests.user
+        batch = [PendingWrite(Post(author=user, text=f'Пост {number}'))
+                 for number in range(3)]
+        broken = PendingWrite(Post(author=user, text=None))
+        batch.insert(1, broken)
+        WriteCoalescer()._flush(batch)
+        self.assertIsNotNone(broken.error)
+        self.assertIsNone(broken.post.pk)
+        saved = [item.post.pk for item in batch if item is not broken]
+        self.assertTrue(all(saved))
+        self.assertEqual(Post.objects.filter(pk__in=saved).count(), 3)
+        self.assertEqual(user.post_stats.posts_count, 3)
+        self.assertTrue(all(item.ready.is_set() for item in batch))
+
+    @override_settings(POSTS_COALESCE_WRITES=True)
+    def test_open_transaction_saves_directly(self):
+        post = Post(author=WriteCoalescerFlushTests.user, text='Напрямую')
+        with mock.patch('posts.coalescer.coalescer') as coalescer:
+            save_post(post)
+        coalescer.save.assert_not_called()
+        self.assertIsNotNone(post.pk)
@@ -0,0 +1,105 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Group, Post
+
+User = get_user_model()
+
+
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='etag_author')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='etag-group',
+            description='Тестовое описание',
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.post = Post.objects.create(author=ConditionalGetTests.user,
+                                        group=ConditionalGetTests.group,
+                                        text='Тестовый пост')
+        self.urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': 'etag-group'}),
+            reverse('posts:profile', kwargs={'username': 'etag_author'}),
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk}),
+        )
+
+    def get_etags(self, urls=None):
+        return [self.guest_client.get(url)['ETag']
+                for url in urls or self.urls]
+
+    def test_matching_etag_gives_304_in_one_query(self):
+        """
+        Совпавший ETag — 304 за один запрос и без рендеринга.
+
+        ETag страницы поста считается по данным из её кэша, без запросов.
+        """
+        queries = (1, 1, 1, 0)
+        for url, etag, count in zip(self.urls, self.get_etags(), queries):
+            with self.subTest(url=url):
+                with self.assertNumQueries(count):
+                    response = self.guest_client.get(
+                        url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.content, b'')
+
+    def test_edit_changes_etags(self):
+        """Правка публикации меняет ETag всех страниц с ней."""
+        etags = self.get_etags()
+        self.post.text = 'Исправленный пост'
+        self.post.save()
+        for url, old, new in zip(self.urls, etags, self.get_etags()):
+            with self.subTest(url=url):
+                self.assertNotEqual(old, new)
+
+    def test_delete_changes_list_etags(self):
+        """Удаление публикации меняет ETag списков."""
+        Post.objects.create(author=ConditionalGetTests.user,
+                            group=ConditionalGetTests.group,
+                            text='Старый пост')
+        lists = self.urls[:3]
+        etags = self.get_etags(lists)
+        self.post.delete()
+        for url, old, new in zip(lists, etags, self.get_etags(lists)):
+            with self.subTest(url=url):
+                self.assertNotEqual(old, new)
+
+    def test_rename_changes_list_etags(self):
+        """Переименование автора или группы меняет ETag лент с карточками."""
+        index, group_list = self.urls[:2]
+        etags = self.get_etags((index, group_list))
+        ConditionalGetTests.user.first_name = 'Лев'
+        ConditionalGetTests.user.save()
+        new_etags = self.get_etags((index, group_list))
+        for url, old, new in zip((index, group_list), etags, new_etags):
+            with self.subTest(url=url):
+                self.assertNotEqual(old, new)
+        ConditionalGetTests.group.title = 'Новое название'
+        ConditionalGetTests.group.save()
+        self.assertNotEqual(new_etags[0], self.get_etags((index,))[0])
+
+    def test_group_rename_changes_profile_etag(self):
+        """Переименование группы меняет ETag профиля с её постами."""
+        profile = self.urls[2]
+        (etag,) = self.get_etags((profile,))
+        ConditionalGetTests.group.title = 'Новое название'
+        ConditionalGetTests.group.save()
+        self.assertNotEqual(etag, self.get_etags((profile,))[0])
+
+    def test_etag_depends_on_user_and_page(self):
+        """ETag различается для пользователей и номеров страниц."""
+        url = reverse('posts:index')
+        author_client = Client()
+        author_client.force_login(ConditionalGetTests.user)
+        etag = self.guest_client.get(url)['ETag']
+        self.assertNotEqual(etag, author_client.get(url)['ETag'])
+        self.assertNotEqual(
+            etag, self.guest_client.get(url + '?page=2')['ETag'])
@@ -0,0 +1,82 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import AuthorStats, Group, Post
+
+User = get_user_model()
+
+
+class PostCountersTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='counter_author')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='counter-group',
+            description='Тестовое описание',
+        )
+        cls.other_group = Group.objects.create(
+            title='Другая группа',
+            slug='other-group',
+            description='Тестовое описание',
+        )
+
+    def assert_counts(self, author_count, group_count, other_group_count):
+        self.assertEqual(
+            AuthorStats.objects.get(author=PostCountersTests.user).posts_count,
+            author_count)
+        for group, expected in ((PostCountersTests.group, group_count),
+                                (PostCountersTests.other_group,
+                                 other_group_count)):
+            group.refresh_from_db()
+            with self.subTest(group=group.slug):
+                self.assertEqual(group.posts_count, expected)
+
+    def test_counts_follow_create_edit_delete(self):
+        """Счётчики меняются при создании, смене группы и удалении."""
+        post = Post.objects.create(author=PostCountersTests.user,
+                                   group=PostCountersTests.group,
+                                   text='Тестовый пост')
+        Post.objects.create(author=PostCountersTests.user, text='Без группы')
+        self.assert_counts(2, 1, 0)
+
+        post.group = PostCountersTests.other_group
+        post.save()
+        self.assert_counts(2, 0, 1)
+
+        post.delete()
+        self.assert_counts(1, 0, 0)
+
+    def test_views_use_counters(self):
+        """Профиль и страница поста берут число постов из счётчика."""
+        post = Post.objects.create(author=PostCountersTests.user,
+                                   text='Тестовый пост')
+        client = Client()
+        # Один запрос и на ETag, и на страницу; COUNT по постам автора
+        # не выполняется.
+        with self.assertNumQueries(1):
+            response = client.get(
+                reverse('posts:post_detail', kwargs={'post_id': post.pk}))
+        self.assertEqual(response.context['num_posts'], 1)
+        response = client.get(
+            reverse('posts:profile', kwargs={'username': 'counter_author'}))
+        self.assertEqual(response.context['posts_count'], 1)
+
+    def test_recount_repairs_drift(self):
+        """Команда recount_posts исправляет разошедшиеся счётчики."""
+        Post.objects.create(author=PostCountersTests.user,
+                            group=PostCountersTests.group,
+                            text='Тестовый пост')
+        AuthorStats.objects.update(posts_count=42)
+        Group.objects.update(posts_count=7)
+
+        out = StringIO()
+        call_command('recount_posts', batch_size=1, stdout=out)
+
+        self.assert_counts(1, 1, 0)
+        self.assertIn('авторов — 1, групп — 2, дней — 0', out.getvalue())
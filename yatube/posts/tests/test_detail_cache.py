@@ -0,0 +1,131 @@
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, SimpleTestCase, TestCase
+from django.urls import reverse
+
+from ..cache import (get_or_recompute, post_detail_cache_key,
+                     single_flight_stats)
+from ..models import Post
+from ..views import get_post_detail
+
+User = get_user_model()
+
+
+class SingleFlightTests(SimpleTestCase):
+    key = 'single_flight_test'
+
+    def setUp(self):
+        cache.clear()
+        single_flight_stats.clear()
+        self.compute = mock.Mock(return_value='новое')
+
+    def get(self):
+        return get_or_recompute(SingleFlightTests.key, self.compute, 60, 60)
+
+    def store(self, expires_in, delta=0.01):
+        cache.set(SingleFlightTests.key,
+                  ('старое', time.time() + expires_in, delta), 120)
+
+    def test_fresh_value_is_hit(self):
+        self.store(60)
+        self.assertEqual(self.get(), 'старое')
+        self.compute.assert_not_called()
+        self.assertEqual(single_flight_stats['hits'], 1)
+
+    def test_expired_value_is_recomputed(self):
+        self.store(-1)
+        self.assertEqual(self.get(), 'новое')
+        self.assertEqual(single_flight_stats['recomputations'], 1)
+        self.assertEqual(self.get(), 'новое')
+        self.compute.assert_called_once()
+
+    def test_stale_copy_while_other_recomputes(self):
+        """Пока другой процесс держит блокировку, отдаётся старая копия."""
+        self.store(-1)
+        cache.add(f'{SingleFlightTests.key}:lock', 1)
+        self.assertEqual(self.get(), 'старое')
+        self.compute.assert_not_called()
+        self.assertEqual(single_flight_stats['stale'], 1)
+
+    def test_waiter_takes_over_after_leader_failure(self):
+        """Если считавший процесс упал, ждущий не ждёт весь таймаут."""
+        lock_key = f'{SingleFlightTests.key}:lock'
+        cache.add(lock_key, 1)
+        # Лидер падает во время первой паузы ждущего и снимает блокировку.
+        with mock.patch('posts.cache.time.sleep',
+                        side_effect=lambda _: cache.delete(lock_key)) as sleep:
+            self.assertEqual(self.get(), 'новое')
+        self.assertEqual(sleep.call_count, 1)
+        self.compute.assert_called_once()
+        self.assertIsNone(cache.get(lock_key))
+
+    def test_early_refresh(self):
+        """Долго считающееся значение пересчитывается до срока."""
+        self.store(5, delta=2)
+        with mock.patch('posts.cache.random.random',
+                        return_value=0.999999):
+            self.assertEqual(self.get(), 'новое')
+        self.store(5, delta=2)
+        with mock.patch('posts.cache.random.random', return_value=0.0):
+            self.assertEqual(self.get(), 'старое')
+
+
+class PostDetailCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='detail_author')
+
+    def setUp(self):
+        cache.clear()
+        self.post = Post.objects.create(author=PostDetailCacheTests.user,
+                                        text='Исходный текст')
+        self.url = reverse('posts:post_detail',
+                           kwargs={'post_id': self.post.pk})
+        self.client = Client()
+        self.client.force_login(PostDetailCacheTests.user)
+
+    def test_warm_detail_skips_post_query(self):
+        self.client.get(self.url)
+        # ETag считается по данным из кэша.
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.context['post'], self.post)
+        self.assertEqual(response.context['num_posts'], 1)
+
+    def test_edit_invalidates_detail(self):
+        """После редактирования страница показывает новый текст."""
+        self.client.get(self.url)
+        self.client.post(
+            reverse('posts:post_edit', kwargs={'post_id': self.post.pk}),
+            {'text': 'Новый текст'})
+        self.assertContains(self.client.get(self.url), 'Новый текст')
+
+    def test_etag_matches_cached_body(self):
+        """ETag меняется только вместе с показанными данными."""
+        guest_client = Client()
+        etag = guest_client.get(self.url)['ETag']
+        PostDetailCacheTests.user.first_name = 'Новое имя'
+        PostDetailCacheTests.user.save()
+        Post.objects.create(author=PostDetailCacheTests.user,
+                            text='Ещё пост')
+        response = guest_client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        cache.delete(post_detail_cache_key(self.post.pk))
+        response = guest_client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Новое имя')
+        self.assertEqual(response.context['num_posts'], 2)
+
+    def test_replica_entry_lives_no_longer_than_lag(self):
+        """Данные с реплики кэшируются не дольше её отставания."""
+        with self.settings(DATABASE_REPLICA_LAG=5), \
+                mock.patch('posts.views.replica_reads_active',
+                           return_value=True), \
+                mock.patch('posts.views.get_or_recompute') as recompute:
+            get_post_detail(self.post.pk)
+        _, _, timeout, stale_timeout = recompute.call_args[0]
+        self.assertEqual((timeout, stale_timeout), (5, 0))
@@ -0,0 +1,116 @@
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import export
+from ..models import Group, Post
+
+User = get_user_model()
+
+
+class ExportPostsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='export_author')
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@yatube.ru', password='pass')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='export-group',
+            description='Тестовое описание',
+        )
+        cls.num_of_test_posts = 7
+        for i in range(cls.num_of_test_posts):
+            Post.objects.create(author=cls.user,
+                                group=cls.group if i % 2 else None,
+                                text=f'Тестовый пост {i}')
+        cls.expected_ids = list(
+            Post.objects.order_by('pub_date', 'id')
+            .values_list('id', flat=True))
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.output = os.path.join(self.tmp.name, 'posts.out')
+
+    def run_export(self, **options):
+        call_command('export_posts', output=self.output, **options)
+        with open(self.output, 'rb') as file:
+            return file.read()
+
+    def test_ndjson_in_batches(self):
+        """Выгрузка идёт порциями по ключу и содержит все строки."""
+        with self.assertNumQueries(4):
+            data = self.run_export(batch_size=2)
+        rows = [json.loads(line) for line in data.decode().splitlines()]
+        self.assertEqual([row['id'] for row in rows],
+                         ExportPostsTests.expected_ids)
+        self.assertEqual(rows[1]['author'], 'export_author')
+        self.assertEqual(rows[1]['group'], 'export-group')
+        self.assertIsNone(rows[0]['group'])
+
+    def test_csv_gzip(self):
+        """CSV можно сжать на лету."""
+        data = gzip.decompress(self.run_export(format='csv', gzip=True))
+        rows = list(csv.DictReader(io.StringIO(data.decode())))
+        self.assertEqual(len(rows), ExportPostsTests.num_of_test_posts)
+        self.assertEqual(list(rows[0]), list(export.FIELDS))
+
+    def test_filters(self):
+        """Фильтры по группе, автору и датам."""
+        data = self.run_export(group='export-group', author='export_author')
+        self.assertEqual(len(data.decode().splitlines()), 3)
+        self.assertEqual(self.run_export(until='2000-01-01'), b'')
+        with self.assertRaises(CommandError):
+            self.run_export(group='no-group')
+        for since in ('вчера', '2024-02-30', '2024-01-01T25:00'):
+            with self.subTest(since=since):
+                with self.assertRaises(CommandError):
+                    self.run_export(since=since)
+
+    def test_until_date_includes_whole_day(self):
+        """Дата без времени в --until включает весь этот день."""
+        today = Post.objects.latest('pub_date').pub_date
+        today = timezone.localdate(today).isoformat()
+        data = self.run_export(until=today)
+        self.assertEqual(len(data.splitlines()),
+                         ExportPostsTests.num_of_test_posts)
+        self.assertEqual(self.run_export(until=f'{today}T00:00'), b'')
+
+    def test_batch_size_must_be_positive(self):
+        """Нулевой размер порции — ошибка команды, а не пустая выгрузка."""
+        with self.assertRaises(CommandError):
+            self.run_export(batch_size=0)
+
+    def test_admin_endpoint_is_staff_only(self):
+        """Выгрузка в админке доступна только сотрудникам."""
+        url = reverse('admin:posts_post_export')
+        author_client = Client()
+        author_client.force_login(ExportPostsTests.user)
+        response = author_client.get(url)
+        self.assertEqual(response.status_code, 302)
+
+        admin_client = Client()
+        admin_client.force_login(ExportPostsTests.admin)
+        response = admin_client.get(url, {'format': 'csv', 'gzip': '1'})
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        self.assertIn('posts.csv.gz', response['Content-Disposition'])
+        data = gzip.decompress(b''.join(response.streaming_content))
+        self.assertEqual(len(data.decode().splitlines()),
+                         ExportPostsTests.num_of_test_posts + 1)
+        response = admin_client.get(url, {'format': 'xml'})
+        self.assertEqual(response.status_code, 400)
+        response = admin_client.get(url, {'since': '2024-02-30'})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,107 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..cache import PAGE_CACHE_HEADER
+from ..models import Group, Post
+
+User = get_user_model()
+
+
+class PostFeedsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='feed_author',
+                                       first_name='Лев', last_name='Толстой')
+        cls.other_user = User.objects.create(username='other_author')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='feed-group',
+            description='Тестовое описание',
+        )
+        cls.other_group = Group.objects.create(
+            title='Другая группа',
+            slug='other-group',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(author=cls.user, group=cls.group,
+                                       text='Тестовый пост')
+        cls.feeds = {
+            reverse('posts:feed'): 'application/rss+xml',
+            reverse('posts:feed_atom'): 'application/atom+xml',
+            reverse('posts:group_feed', kwargs={'slug': 'feed-group'}):
+                'application/rss+xml',
+            reverse('posts:group_feed_atom', kwargs={'slug': 'feed-group'}):
+                'application/atom+xml',
+            reverse('posts:profile_feed',
+                    kwargs={'username': 'feed_author'}):
+                'application/rss+xml',
+            reverse('posts:profile_feed_atom',
+                    kwargs={'username': 'feed_author'}):
+                'application/atom+xml',
+        }
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def test_feeds_contain_posts(self):
+        """Ленты отдают публикации в своём формате."""
+        for url, content_type in PostFeedsTests.feeds.items():
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertTrue(response['Content-Type'].startswith(
+                    content_type))
+                self.assertIn('Тестовый пост', response.content.decode())
+                self.assertIn('Лев Толстой', response.content.decode())
+
+    def test_unknown_group_or_author(self):
+        """Лента несуществующей группы или автора — 404."""
+        for url in (reverse('posts:group_feed', kwargs={'slug': 'nope'}),
+                    reverse('posts:profile_feed',
+                            kwargs={'username': 'nobody'})):
+            with self.subTest(url=url):
+                self.assertEqual(self.guest_client.get(url).status_code, 404)
+
+    def test_unchanged_feed_costs_no_queries(self):
+        """Повторный опрос без изменений — 304 без запросов к БД."""
+        for url in PostFeedsTests.feeds:
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertTrue(response.has_header('Last-Modified'))
+                with self.assertNumQueries(0):
+                    response = self.guest_client.get(
+                        url, HTTP_IF_NONE_MATCH=response['ETag'])
+                self.assertEqual(response.status_code, 304)
+                with self.assertNumQueries(0):
+                    response = self.guest_client.get(
+                        url,
+                        HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+                self.assertEqual(response.status_code, 304)
+
+    def test_feeds_regenerate_only_in_scope(self):
+        """Новый пост перестраивает только ленты своей области."""
+        group_feed = reverse('posts:group_feed',
+                             kwargs={'slug': 'feed-group'})
+        author_feed = reverse('posts:profile_feed',
+                              kwargs={'username': 'feed_author'})
+        for url in (group_feed, author_feed):
+            self.guest_client.get(url)
+        Post.objects.create(author=PostFeedsTests.other_user,
+                            group=PostFeedsTests.other_group,
+                            text='Пост в другой группе')
+        for url in (group_feed, author_feed):
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertEqual(response[PAGE_CACHE_HEADER], 'HIT')
+
+        PostFeedsTests.post.text = 'Исправленный пост'
+        PostFeedsTests.post.save()
+        for url in (group_feed, author_feed):
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertEqual(response[PAGE_CACHE_HEADER], 'MISS')
+                self.assertIn('Исправленный пост', response.content.decode())
@@ -0,0 +1,155 @@
+import datetime
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.test import TestCase
+from django.utils import timezone
+
+from ..bulk import insert_posts
+from ..cache import get_generations
+from ..models import (AuthorStats, Group, ImportProgress, Post,
+                      PostDailyStats)
+
+User = get_user_model()
+
+
+class ImportPostsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='import_author')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='import-group',
+            description='Тестовое описание',
+        )
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def write(self, name, content):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(content)
+        return path
+
+    def jsonl(self, rows):
+        return self.write('posts.jsonl', ''.join(
+            json.dumps(row, ensure_ascii=False) + '\n' for row in rows))
+
+    def run_import(self, path, **options):
+        out, err = StringIO(), StringIO()
+        call_command('import_posts', path, stdout=out, stderr=err, **options)
+        return out.getvalue(), err.getvalue()
+
+    def test_import_keeps_pub_date_and_counters(self):
+        """Импорт сохраняет даты, группы и обновляет счётчики."""
+        rows = [
+            {'author': 'import_author', 'group': 'import-group',
+             'text': f'Пост {i}', 'pub_date': f'2020-01-0{i + 1}T10:00:00'}
+            for i in range(3)
+        ]
+        out, _ = self.run_import(self.jsonl(rows), batch_size=2)
+        self.assertIn('Импортировано публикаций: 3', out)
+        dates = sorted(Post.objects.values_list('pub_date', flat=True))
+        self.assertEqual(
+            dates[0],
+            timezone.make_aware(datetime.datetime(2020, 1, 1, 10)))
+        self.assertEqual(
+            AuthorStats.objects.get(author=ImportPostsTests.user)
+            .posts_count, 3)
+        ImportPostsTests.group.refresh_from_db()
+        self.assertEqual(ImportPostsTests.group.posts_count, 3)
+        self.assertEqual(PostDailyStats.objects.count(), 3)
+
+    def test_progress_is_committed_with_batch(self):
+        """Сбой после записи порции не даёт импортировать её повторно."""
+        path = self.jsonl([{'author': 'import_author', 'text': f'Пост {i}'}
+                           for i in range(3)])
+        with mock.patch('posts.management.commands.import_posts.'
+                        'bump_generations', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.run_import(path, batch_size=2, state='posts')
+        self.assertEqual(ImportProgress.objects.get(name='posts').rows, 2)
+        self.run_import(path, batch_size=2, state='posts')
+        self.assertEqual(
+            sorted(Post.objects.values_list('text', flat=True)),
+            ['Пост 0', 'Пост 1', 'Пост 2'])
+
+    def test_import_expires_feeds(self):
+        """Импорт сбрасывает кэш лент: общей, группы и автора."""
+        scopes = ('posts', 'group:import-group', 'author:import_author')
+        before = get_generations(scopes)
+        self.run_import(self.jsonl([{'author': 'import_author',
+                                     'group': 'import-group',
+                                     'text': 'Пост'}]))
+        for scope, old, new in zip(scopes, before, get_generations(scopes)):
+            with self.subTest(scope=scope):
+                self.assertNotEqual(old, new)
+
+    def test_bad_rows_are_skipped(self):
+        """Строки с неизвестным автором, группой или датой пропускаются."""
+        path = self.write('posts.jsonl', '\n'.join((
+            json.dumps({'author': 'nobody', 'text': 'Пост'}),
+            json.dumps({'author': 'import_author', 'group': 'no-group',
+                        'text': 'Пост'}),
+            json.dumps({'author': 'import_author', 'text': 'Пост',
+                        'pub_date': 'вчера'}),
+            '{битый json',
+            json.dumps({'author': 'import_author', 'text': 'Хороший пост'}),
+        )))
+        out, err = self.run_import(path)
+        self.assertIn('Импортировано публикаций: 1, пропущено строк: 4', out)
+        self.assertIn('Строка 1 пропущена', err)
+        self.assertEqual(Post.objects.get().text, 'Хороший пост')
+
+    def test_csv(self):
+        """CSV определяется по расширению файла."""
+        path = self.write('posts.csv', (
+            'author,group,text,pub_date\n'
+            'import_author,import-group,"Пост, с запятой",'
+            '2021-05-01T00:00:00+00:00\n'
+            'import_author,,Без группы,\n'
+        ))
+        self.run_import(path)
+        self.assertEqual(
+            set(Post.objects.values_list('text', 'group__slug')),
+            {('Пост, с запятой', 'import-group'), ('Без группы', None)})
+
+    def test_resume_after_failure(self):
+        """После сбоя импорт продолжается с незафиксированной порции."""
+        rows = [{'author': 'import_author', 'text': f'Пост {i}'}
+                for i in range(5)]
+        path = self.jsonl(rows)
+        state = 'posts.jsonl'
+        calls = []
+
+        def failing_insert_posts(posts):
+            calls.append(len(posts))
+            if len(calls) == 2:
+                raise DatabaseError('сбой')
+            return insert_posts(posts)
+
+        with mock.patch('posts.management.commands.import_posts.insert_posts',
+                        failing_insert_posts):
+            with self.assertRaises(DatabaseError):
+                self.run_import(path, batch_size=2, state=state)
+        self.assertEqual(Post.objects.count(), 2)
+        self.assertEqual(ImportProgress.objects.get(name=state).rows, 2)
+
+        _, err = self.run_import(path, batch_size=2, state=state)
+        self.assertIn('после строки 2', err)
+        self.assertEqual(
+            sorted(Post.objects.values_list('text', flat=True)),
+            [f'Пост {i}' for i in range(5)])
+        self.assertFalse(ImportProgress.objects.exists())
+        self.assertEqual(
+            AuthorStats.objects.get(author=ImportPostsTests.user)
+            .posts_count, 5)
@@ -0,0 +1,67 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Group, Post
+
+User = get_user_model()
+
+
+@override_settings(POSTS_PAGE_CACHE_TIMEOUT=0)
+class Jinja2TemplatesTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='jinja_author',
+                                       first_name='Лев', last_name='Толстой')
+        cls.group = Group.objects.create(
+            title='Тестовая <группа>',
+            slug='jinja-group',
+            description='Тестовое описание',
+        )
+        for i in range(13):
+            Post.objects.create(author=cls.user,
+                                group=cls.group if i % 2 else None,
+                                text=f'Тестовый пост {i}\n<b>вторая</b>')
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.author_client = Client()
+        self.author_client.force_login(Jinja2TemplatesTests.user)
+
+    def render(self, client, url, jinja2):
+        with self.settings(POSTS_JINJA2_TEMPLATES=jinja2):
+            response = client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return re.sub(r'\s+', ' ', response.content.decode()).strip()
+
+    def assert_same_html(self, urls):
+        for client in (self.guest_client, self.author_client):
+            for url in urls:
+                with self.subTest(url=url):
+                    self.assertEqual(self.render(client, url, False),
+                                     self.render(client, url, True))
+
+    def test_list_pages_match_django_templates(self):
+        """Шаблоны Jinja2 дают ту же разметку, что и шаблоны Django."""
+        self.assert_same_html((
+            reverse('posts:index'),
+            reverse('posts:index') + '?page=2',
+            reverse('posts:group_list', kwargs={'slug': 'jinja-group'}),
+            reverse('posts:profile', kwargs={'username': 'jinja_author'}),
+        ))
+
+    @override_settings(POSTS_CURSOR_PAGINATION_VIEWS=('index',))
+    def test_cursor_pages_match_django_templates(self):
+        """Курсорная пагинация в Jinja2 совпадает с Django."""
+        self.assert_same_html((reverse('posts:index'),))
+
+    def test_text_is_escaped(self):
+        """Текст поста экранируется в шаблонах Jinja2."""
+        html = self.render(self.guest_client, reverse('posts:index'), True)
+        self.assertIn('&lt;b&gt;вторая&lt;/b&gt;', html)
+        self.assertIn('Тестовая &lt;группа&gt;', html)
@@ -0,0 +1,83 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..cache import PAGE_CACHE_HEADER
+from ..models import Group, Post
+
+User = get_user_model()
+
+
+class AnonymousPageCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='page_author')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='page-group',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(author=cls.user, group=cls.group,
+                                       text='Тестовый пост')
+        cls.urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': 'page-group'}),
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.author_client = Client()
+        self.author_client.force_login(AnonymousPageCacheTests.user)
+
+    def assert_cache_status(self, url, status, client=None):
+        response = (client or self.guest_client).get(url)
+        self.assertEqual(response.get(PAGE_CACHE_HEADER), status, url)
+        return response
+
+    def test_second_anonymous_get_is_hit(self):
+        """Повторный анонимный запрос отдаётся из кэша."""
+        for url in AnonymousPageCacheTests.urls:
+            with self.subTest(url=url):
+                self.assert_cache_status(url, 'MISS')
+                response = self.assert_cache_status(url, 'HIT')
+                self.assertIn('Тестовый пост', response.content.decode())
+
+    def test_authenticated_user_bypasses_cache(self):
+        """Страницы для авторизованных пользователей не кэшируются."""
+        url = reverse('posts:index')
+        self.assert_cache_status(url, 'MISS')
+        self.assert_cache_status(url, None, client=self.author_client)
+
+    def test_post_create_expires_pages(self):
+        """Новый пост в группе сбрасывает главную и страницу группы."""
+        for url in AnonymousPageCacheTests.urls:
+            self.guest_client.get(url)
+        self.author_client.post(
+            reverse('posts:post_create'),
+            data={'text': 'Свежий пост', 'group': self.group.pk}
+        )
+        for url in AnonymousPageCacheTests.urls:
+            with self.subTest(url=url):
+                response = self.assert_cache_status(url, 'MISS')
+                self.assertIn('Свежий пост', response.content.decode())
+
+    def test_other_group_page_survives(self):
+        """Пост без группы не сбрасывает кэш страниц групп."""
+        group_url = AnonymousPageCacheTests.urls[1]
+        self.guest_client.get(group_url)
+        Post.objects.create(author=AnonymousPageCacheTests.user,
+                            text='Пост без группы')
+        self.assert_cache_status(group_url, 'HIT')
+
+    def test_group_edit_expires_group_page(self):
+        """Изменение группы (например, в админке) сбрасывает её страницу."""
+        group_url = AnonymousPageCacheTests.urls[1]
+        self.guest_client.get(group_url)
+        group = AnonymousPageCacheTests.group
+        group.description = 'Новое описание'
+        group.save()
+        response = self.assert_cache_status(group_url, 'MISS')
+        self.assertIn('Новое описание', response.content.decode())
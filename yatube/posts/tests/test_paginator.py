@@ -0,0 +1,155 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.paginator import Page, Paginator
+from django.template.loader import render_to_string
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Post
+from ..paginator import (CursorPage, decode_cursor, encode_cursor,
+                         page_window)
+
+User = get_user_model()
+
+
+@override_settings(POSTS_CURSOR_PAGINATION_VIEWS=('index', 'profile'),
+                   POSTS_PAGE_CACHE_TIMEOUT=0)
+class CursorPaginationTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='cursor_author')
+        cls.num_of_test_posts = 25
+        Post.objects.bulk_create(
+            Post(author=cls.user, text=f'Тестовый пост {i}')
+            for i in range(cls.num_of_test_posts)
+        )
+        cls.expected_ids = list(
+            Post.objects.order_by('-pub_date', '-id')
+            .values_list('id', flat=True)
+        )
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def walk(self, url, param, cursor):
+        """Собирает id постов, переходя по курсорам до конца ленты."""
+        collected = []
+        query = ''
+        while True:
+            page_obj = self.guest_client.get(url + query).context['page_obj']
+            self.assertIsInstance(page_obj, CursorPage)
+            self.assertLessEqual(len(page_obj), settings.NUM_OF_POSTS_ON_PAGE)
+            collected.extend(post.id for post in page_obj)
+            next_cursor = getattr(page_obj, cursor)
+            if next_cursor is None:
+                return collected, page_obj
+            query = f'?{param}={next_cursor}'
+
+    def test_walk_older_covers_all_posts(self):
+        """Переход «старше» обходит все посты по порядку без повторов."""
+        collected, _ = self.walk(reverse('posts:index'), 'after',
+                                 'next_cursor')
+        self.assertEqual(collected, CursorPaginationTests.expected_ids)
+
+    def test_walk_newer_returns_back(self):
+        """Переход «новее» с последней страницы приводит к первой."""
+        _, last_page = self.walk(reverse('posts:index'), 'after',
+                                 'next_cursor')
+        url = reverse('posts:index')
+        _, first_page = self.walk(
+            url + f'?before={last_page.previous_cursor}', 'before',
+            'previous_cursor')
+        self.assertEqual(
+            [post.id for post in first_page],
+            CursorPaginationTests.expected_ids[
+                :settings.NUM_OF_POSTS_ON_PAGE]
+        )
+
+    def test_legacy_page_links_still_work(self):
+        """Ссылки вида ?page=N обслуживаются обычным Paginator."""
+        response = self.guest_client.get(
+            reverse('posts:profile', kwargs={'username': 'cursor_author'})
+            + '?page=2'
+        )
+        page_obj = response.context['page_obj']
+        self.assertIsInstance(page_obj, Page)
+        self.assertEqual(page_obj.number, 2)
+
+    def test_broken_cursor_gives_first_page(self):
+        """Битый курсор не ломает страницу, а отдаёт первую."""
+        response = self.guest_client.get(
+            reverse('posts:index') + '?after=not-a-cursor')
+        self.assertEqual(
+            [post.id for post in response.context['page_obj']],
+            CursorPaginationTests.expected_ids[
+                :settings.NUM_OF_POSTS_ON_PAGE]
+        )
+
+    def test_before_cursor_at_top_gives_full_first_page(self):
+        """«Новее» у начала ленты отдаёт полную первую страницу."""
+        first_page = CursorPaginationTests.expected_ids[
+            :settings.NUM_OF_POSTS_ON_PAGE]
+        for newest in (3, 0):
+            post = Post.objects.get(
+                pk=CursorPaginationTests.expected_ids[newest])
+            response = self.guest_client.get(
+                reverse('posts:index')
+                + f'?before={encode_cursor(post.pub_date, post.pk)}')
+            page_obj = response.context['page_obj']
+            self.assertEqual([post.id for post in page_obj], first_page)
+            self.assertFalse(page_obj.has_previous())
+            self.assertIsNotNone(page_obj.next_cursor)
+
+    def test_cursor_roundtrip(self):
+        """Курсор кодируется и декодируется без потерь."""
+        post = Post.objects.first()
+        self.assertEqual(
+            decode_cursor(encode_cursor(post.pub_date, post.id)),
+            (post.pub_date, post.id)
+        )
+
+    def test_cursor_mode_is_per_view(self):
+        """Представления не из настройки используют обычный Paginator."""
+        response = self.guest_client.get(reverse('posts:index'))
+        self.assertIsInstance(response.context['page_obj'], CursorPage)
+        with self.settings(POSTS_CURSOR_PAGINATION_VIEWS=()):
+            response = self.guest_client.get(reverse('posts:index'))
+        self.assertIsInstance(response.context['page_obj'], Page)
+
+
+class PageWindowTests(SimpleTestCase):
+    def window(self, number, num_pages, around=2):
+        page_obj = Paginator(range(num_pages), 1).page(number)
+        return page_window(page_obj, around)
+
+    def test_window(self):
+        """Первая, последняя и соседние страницы, пропуски — None."""
+        self.assertEqual(self.window(50, 100), [1, None, 48, 49, 50, 51, 52,
+                                                None, 100])
+        self.assertEqual(self.window(1, 100), [1, 2, 3, None, 100])
+        self.assertEqual(self.window(100, 100), [1, None, 98, 99, 100])
+        self.assertEqual(self.window(3, 5), [1, 2, 3, 4, 5])
+        # Пропуск в одну страницу заменён самой страницей.
+        self.assertEqual(self.window(5, 10), [1, 2, 3, 4, 5, 6, 7, None, 10])
+
+    def render(self, num_pages, using):
+        # Миллионы «постов» без базы: объекты страницы — числа.
+        page_obj = Paginator(range(num_pages * 10), 10).page(num_pages // 2)
+        started = time.perf_counter()
+        html = render_to_string('posts/includes/paginator.html',
+                                {'page_obj': page_obj}, using=using)
+        return len(html), time.perf_counter() - started
+
+    def test_size_does_not_grow_with_page_count(self):
+        """Размер и время рендера пагинатора не зависят от числа страниц."""
+        for using in ('django', 'jinja2'):
+            with self.subTest(using=using):
+                self.render(100, using)
+                small_size, small_time = self.render(100, using)
+                large_size, large_time = self.render(200000, using)
+                # Отличаются только длиной номеров страниц.
+                self.assertLess(large_size - small_size, 100)
+                self.assertLess(large_time, small_time * 20 + 0.05)
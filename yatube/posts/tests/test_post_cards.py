@@ -0,0 +1,76 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Group, Post
+from ..templatetags import post_cards
+
+User = get_user_model()
+
+
+@override_settings(POSTS_PAGE_CACHE_TIMEOUT=0)
+class PostCardCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='card_author',
+                                       first_name='Иван',
+                                       last_name='Петров')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='card-group',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(author=cls.user, group=cls.group,
+                                       text='Тестовый пост')
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.render = mock.patch.object(
+            post_cards, 'render_to_string',
+            wraps=post_cards.render_to_string
+        )
+
+    def get_index(self):
+        return self.guest_client.get(reverse('posts:index')).content.decode()
+
+    def test_warm_page_does_not_render_cards(self):
+        """Повторный показ страницы берёт карточки из кэша."""
+        self.get_index()
+        with self.render as render:
+            content = self.get_index()
+        render.assert_not_called()
+        self.assertIn('Тестовый пост', content)
+
+    def test_visibility_variants_are_separate(self):
+        """Карточки с ссылкой на группу и без неё кэшируются отдельно."""
+        self.get_index()
+        response = self.guest_client.get(
+            reverse('posts:group_list', kwargs={'slug': 'card-group'}))
+        self.assertNotIn('К записям группы', response.content.decode())
+        self.assertIn('К записям группы', self.get_index())
+
+    def test_post_edit_invalidates_card(self):
+        """Редактирование поста сразу видно в карточке."""
+        self.get_index()
+        author_client = Client()
+        author_client.force_login(PostCardCacheTests.user)
+        author_client.post(
+            reverse('posts:post_edit',
+                    kwargs={'post_id': PostCardCacheTests.post.pk}),
+            data={'text': 'Обновлённый текст'}
+        )
+        content = self.get_index()
+        self.assertIn('Обновлённый текст', content)
+        self.assertNotIn('Тестовый пост', content)
+
+    def test_author_rename_invalidates_cards(self):
+        """Переименование автора сразу видно в его карточках."""
+        self.get_index()
+        PostCardCacheTests.user.first_name = 'Пётр'
+        PostCardCacheTests.user.save()
+        self.assertIn('Пётр Петров', self.get_index())
@@ -0,0 +1,84 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core import query_budget
+from core.query_budget import QueryBudgetExceeded
+from ..models import Group, Post
+
+User = get_user_model()
+
+
+@override_settings(QUERY_BUDGET_STRICT=True, POSTS_PAGE_CACHE_TIMEOUT=0)
+class QueryBudgetTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Несколько авторов и групп, чтобы N+1 проявился в числе запросов.
+        cls.users = [User.objects.create(username=f'budget_author_{i}')
+                     for i in range(3)]
+        cls.groups = [
+            Group.objects.create(title=f'Группа {i}', slug=f'budget-{i}',
+                                 description='Тестовое описание')
+            for i in range(3)
+        ]
+        for i in range(12):
+            Post.objects.create(author=cls.users[i % 3],
+                                group=cls.groups[i % 3],
+                                text=f'Тестовый пост {i}')
+        cls.post = cls.users[0].posts.first()
+
+    def setUp(self):
+        self.guest_client = Client()
+        self.author_client = Client()
+        self.author_client.force_login(QueryBudgetTests.users[0])
+        query_budget.violations.clear()
+
+    def test_pages_fit_budgets(self):
+        """Страницы укладываются в бюджеты SQL-запросов."""
+        post_id = QueryBudgetTests.post.id
+        urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': 'budget-0'}),
+            reverse('posts:profile',
+                    kwargs={'username': 'budget_author_0'}),
+            reverse('posts:post_detail', kwargs={'post_id': post_id}),
+            reverse('posts:search') + '?q=пост',
+            reverse('posts:post_create'),
+            reverse('posts:post_edit', kwargs={'post_id': post_id}),
+        )
+        for url in urls:
+            for client in (self.guest_client, self.author_client):
+                with self.subTest(url=url):
+                    client.get(url)
+
+    def test_forms_fit_budgets(self):
+        """Создание и правка публикации укладываются в бюджеты."""
+        group_id = QueryBudgetTests.groups[1].id
+        self.author_client.post(reverse('posts:post_create'),
+                                {'text': 'Новый пост', 'group': group_id})
+        self.author_client.post(
+            reverse('posts:post_edit',
+                    kwargs={'post_id': QueryBudgetTests.post.id}),
+            {'text': 'Правка', 'group': group_id})
+
+    def test_strict_mode_raises(self):
+        """В строгом режиме превышение бюджета роняет запрос."""
+        with self.settings(QUERY_BUDGETS={'posts:index': 1}):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.author_client.get(reverse('posts:index'))
+        self.assertEqual(query_budget.violations['posts:index'], 1)
+
+    def test_runtime_mode_logs(self):
+        """Без строгого режима превышение пишется в лог и счётчик."""
+        with self.settings(QUERY_BUDGETS={'posts:index': 1},
+                           QUERY_BUDGET_STRICT=False):
+            with mock.patch.object(query_budget.logger,
+                                   'warning') as warning:
+                response = self.author_client.get(reverse('posts:index'))
+        self.assertEqual(response.status_code, 200)
+        warning.assert_called_once()
+        self.assertIn('posts:index', warning.call_args[0][0])
+        self.assertEqual(query_budget.violations['posts:index'], 1)
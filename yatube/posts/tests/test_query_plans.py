@@ -0,0 +1,93 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import Group, Post
+from ..paginator import encode_cursor
+
+User = get_user_model()
+
+# Полный проход по таблице публикаций без индекса или сортировка во
+# временном B-дереве — признаки того, что запрос не попал в индекс.
+BAD_PLAN_PATTERNS = (
+    re.compile(r'\bSCAN (TABLE )?posts_post\b(?! USING)'),
+    re.compile(r'TEMP B-TREE'),
+)
+
+
+@override_settings(POSTS_PAGE_CACHE_TIMEOUT=0)
+class PostQueryPlanTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='plan_author')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='plan-group',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.user,
+            group=cls.group,
+            text='Тестовый пост',
+        )
+
+    def setUp(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('EXPLAIN QUERY PLAN есть только в SQLite.')
+        self.guest_client = Client()
+
+    def assert_plans_use_indexes(self, url):
+        with CaptureQueriesContext(connection) as captured:
+            self.guest_client.get(url)
+        post_queries = [
+            query['sql'] for query in captured.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'posts_post' in query['sql']
+        ]
+        self.assertTrue(post_queries, f'Нет запросов к постам на {url}')
+        with connection.cursor() as cursor:
+            for sql in post_queries:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                plan = '\n'.join(row[-1] for row in cursor.fetchall())
+                for pattern in BAD_PLAN_PATTERNS:
+                    with self.subTest(url=url, sql=sql):
+                        self.assertIsNone(
+                            pattern.search(plan),
+                            f'[!] Запрос на {url} не использует индекс:\n'
+                            f'{sql}\n{plan}'
+                        )
+
+    def test_list_views_use_indexes(self):
+        """Запросы списков публикаций идут по индексам без сортировки."""
+        urls = (
+            reverse('posts:index'),
+            reverse('posts:index') + '?page=2',
+            reverse('posts:group_list', kwargs={'slug': 'plan-group'}),
+            reverse('posts:profile', kwargs={'username': 'plan_author'}),
+        )
+        for url in urls:
+            self.assert_plans_use_indexes(url)
+
+    def test_cursor_pages_use_indexes(self):
+        """Курсорная пагинация тоже идёт по индексам."""
+        with self.settings(POSTS_CURSOR_PAGINATION_VIEWS=(
+                'index', 'profile', 'group_list')):
+            cursor = encode_cursor(self.post.pub_date, self.post.pk)
+            for name, kwargs in (
+                ('posts:index', {}),
+                ('posts:group_list', {'slug': 'plan-group'}),
+                ('posts:profile', {'username': 'plan_author'}),
+            ):
+                for param in ('after', 'before'):
+                    self.assert_plans_use_indexes(
+                        reverse(name, kwargs=kwargs) + f'?{param}={cursor}')
+
+    def test_post_detail_uses_indexes(self):
+        """Страница поста и подсчёт постов автора идут по индексам."""
+        self.assert_plans_use_indexes(
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk}))
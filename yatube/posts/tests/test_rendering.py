@@ -0,0 +1,97 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..cache import post_detail_cache_key
+from ..models import Post
+
+User = get_user_model()
+
+
+class PostHtmlTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='html_author')
+
+    def setUp(self):
+        self.post = Post.objects.create(author=PostHtmlTests.user,
+                                        text='<b>Первая</b>\nвторая')
+
+    def test_save_renders_html(self):
+        """HTML текста заполняется при сохранении публикации."""
+        expected = '&lt;b&gt;Первая&lt;/b&gt;<br>вторая'
+        self.assertEqual(self.post.text_html, expected)
+        self.assertEqual(self.post.preview_html, expected)
+
+    @override_settings(POSTS_PREVIEW_LENGTH=10)
+    def test_preview_is_truncated(self):
+        self.post.text = 'Очень длинный текст публикации'
+        self.post.save(update_fields=['text'])
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.preview_html, 'Очень дли…')
+        self.assertEqual(self.post.text_html, self.post.text)
+
+    def test_form_edit_renders_html(self):
+        client = Client()
+        client.force_login(PostHtmlTests.user)
+        client.post(
+            reverse('posts:post_edit', kwargs={'post_id': self.post.pk}),
+            {'text': 'Новый\nтекст'})
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.text_html, 'Новый<br>текст')
+
+    def test_backfill_command(self):
+        """Команда заполняет пустой HTML, с --all — пересчитывает весь."""
+        Post.objects.update(text_html='', preview_html='')
+        call_command('render_post_html', stdout=StringIO())
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.preview_html,
+                         '&lt;b&gt;Первая&lt;/b&gt;<br>вторая')
+        with override_settings(POSTS_PREVIEW_LENGTH=5):
+            call_command('render_post_html', stdout=StringIO())
+            self.post.refresh_from_db()
+            self.assertNotEqual(self.post.preview_html, '&lt;b&gt;П…')
+            call_command('render_post_html', '--all', stdout=StringIO())
+            self.post.refresh_from_db()
+            self.assertEqual(self.post.preview_html, '&lt;b&gt;П…')
+
+    @override_settings(POSTS_PAGE_CACHE_TIMEOUT=0)
+    def test_rerender_refreshes_cached_cards(self):
+        """После --all ленты показывают новое начало текста."""
+        guest_client = Client()
+        url = reverse('posts:index')
+        etag = guest_client.get(url)['ETag']
+        updated = self.post.updated
+        with override_settings(POSTS_PREVIEW_LENGTH=5):
+            call_command('render_post_html', '--all', stdout=StringIO())
+            response = guest_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '&lt;b&gt;П…')
+        self.post.refresh_from_db()
+        self.assertGreater(self.post.updated, updated)
+
+    def test_rerender_expires_cached_detail(self):
+        """После --all страница публикации не берётся из старого кэша."""
+        cache.clear()
+        Post.objects.filter(pk=self.post.pk).update(text_html='устаревший')
+        url = reverse('posts:post_detail', kwargs={'post_id': self.post.pk})
+        guest_client = Client()
+        self.assertContains(guest_client.get(url), 'устаревший')
+        call_command('render_post_html', '--all', stdout=StringIO())
+        self.assertIsNone(cache.get(post_detail_cache_key(self.post.pk)))
+        self.assertNotContains(guest_client.get(url), 'устаревший')
+
+    def test_detail_title_is_plain_text(self):
+        """Заголовок страницы публикации — из текста, а не из HTML."""
+        post = Post.objects.create(author=PostHtmlTests.user,
+                                   text='Том & Джерри\nвторая строка')
+        response = Client().get(
+            reverse('posts:post_detail', kwargs={'post_id': post.pk}))
+        self.assertContains(response, 'Пост Том &amp; Джерри')
+        self.assertNotContains(response, '&amp;amp;')
+        self.assertNotContains(response, '&lt;br&gt;')
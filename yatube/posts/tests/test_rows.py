@@ -0,0 +1,66 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import Group, Post
+from ..rows import PostRow, post_rows
+
+User = get_user_model()
+
+
+@override_settings(POSTS_PAGE_CACHE_TIMEOUT=0)
+class PostRowsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='row_author',
+                                            first_name='Иван',
+                                            last_name='Петров',
+                                            password='secret')
+        cls.group = Group.objects.create(title='Группа строк',
+                                         slug='row-group',
+                                         description='Описание')
+        cls.post = Post.objects.create(author=cls.user, group=cls.group,
+                                       text='Пост с группой')
+        cls.lonely_post = Post.objects.create(author=cls.user,
+                                              text='Пост без группы')
+
+    def test_rows_match_posts(self):
+        """У строки ленты те же значения, что у свойств публикации."""
+        attributes = ('pk', 'preview_html', 'pub_date', 'updated',
+                      'author_username', 'author_full_name', 'group_slug',
+                      'group_title')
+        for row in post_rows(Post.objects.all()):
+            post = Post.objects.get(pk=row.pk)
+            for attribute in attributes:
+                with self.subTest(post=post, attribute=attribute):
+                    self.assertEqual(getattr(row, attribute),
+                                     getattr(post, attribute))
+
+    def test_rows_have_no_instance_dict(self):
+        row = post_rows(Post.objects.all())[0]
+        self.assertIsInstance(row, PostRow)
+        self.assertFalse(hasattr(row, '__dict__'))
+
+    def test_list_views_select_only_card_columns(self):
+        """Строки лент выбираются без text и лишних столбцов автора."""
+        urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': 'row-group'}),
+            reverse('posts:profile', kwargs={'username': 'row_author'}),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                with CaptureQueriesContext(connection) as captured:
+                    response = Client().get(url)
+                self.assertIsInstance(response.context['page_obj'][0],
+                                      PostRow)
+                self.assertContains(response, 'Иван Петров')
+                rows_sql = [query['sql']
+                            for query in captured.captured_queries
+                            if '"posts_post"."preview_html"' in query['sql']]
+                self.assertEqual(len(rows_sql), 1)
+                self.assertNotIn('"auth_user"."password"', rows_sql[0])
+                self.assertNotIn('"posts_post"."text"', rows_sql[0])
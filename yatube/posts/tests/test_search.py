@@ -0,0 +1,97 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Post
+from ..search import FTS_TABLE, build_match_query
+
+User = get_user_model()
+
+
+@override_settings(NUM_OF_POSTS_ON_PAGE=2)
+class PostSearchTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_superuser(
+            username='search_author', email='a@a.ru', password='pass')
+        texts = (
+            'Котики спят на солнце',
+            'Котики и котики, снова котики',
+            'Собаки гуляют',
+            'Котики против <script>собак</script>',
+        )
+        cls.posts = [Post.objects.create(author=cls.user, text=text)
+                     for text in texts]
+
+    def setUp(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('FTS5 есть только в SQLite.')
+        self.guest_client = Client()
+
+    def search(self, query, after=None):
+        params = {'q': query}
+        if after:
+            params['after'] = after
+        return self.guest_client.get(reverse('posts:search'), params)
+
+    def collect(self, query):
+        """Обходит все страницы выдачи и возвращает найденные посты."""
+        found, after = [], None
+        while True:
+            page = self.search(query, after).context['page']
+            found.extend(result.post for result in page)
+            after = page.next_cursor
+            if after is None:
+                return found
+
+    def test_ranked_keyset_pages(self):
+        """Выдача ранжирована и обходится по курсорам без повторов."""
+        found = self.collect('котики')
+        self.assertEqual(len(found), 3)
+        self.assertEqual(len(set(found)), 3)
+        self.assertEqual(found[0], PostSearchTests.posts[1])
+
+    def test_snippet_is_highlighted_and_escaped(self):
+        """Фрагмент подсвечивает совпадения и экранирует HTML поста."""
+        content = self.search('собак').content.decode()
+        self.assertIn('<mark>собак</mark>', content)
+        self.assertIn('&lt;script&gt;', content)
+        self.assertNotIn('<script>', content)
+
+    def test_index_follows_edit_and_delete(self):
+        """Индекс обновляется при изменении и удалении постов."""
+        post = PostSearchTests.posts[2]
+        post.text = 'Котики гуляют'
+        post.save()
+        self.assertIn(post, self.collect('котики'))
+        post.delete()
+        self.assertNotIn(post, self.collect('котики'))
+
+    def test_operators_are_not_interpreted(self):
+        """Синтаксис FTS5 в запросе не ломает поиск."""
+        self.assertEqual(build_match_query('a" OR NEAR(b'),
+                         '"a" "OR" "NEAR" "b"*')
+        self.assertEqual(self.search('"котики" AND (').status_code, 200)
+
+    def test_rebuild_command(self):
+        """Команда rebuild_post_search восстанавливает индекс."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('delete-all')")
+        self.assertEqual(self.collect('котики'), [])
+        call_command('rebuild_post_search', stdout=StringIO())
+        self.assertEqual(len(self.collect('котики')), 3)
+
+    def test_admin_uses_full_text_search(self):
+        """Поиск в админке идёт через FTS5-индекс."""
+        client = Client()
+        client.force_login(PostSearchTests.user)
+        response = client.get(reverse('admin:posts_post_changelist'),
+                              {'q': 'собаки'})
+        self.assertEqual(list(response.context['cl'].result_list),
+                         [PostSearchTests.posts[2]])
@@ -3,6 +3,7 @@ from http import HTTPStatus
 import django.core.paginator
 from django import forms
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import Client, TestCase
 from django.urls import reverse
 from django import forms
@@ -59,6 +60,7 @@ class PostViewsTests(TestCase):
             # )
 
     def setUp(self) -> None:
+        cache.clear()
         self.guest_client = Client()
 
         self.author_client = Client()
@@ -158,7 +160,7 @@ class PostViewsTests(TestCase):
         )
         for post in response.context['page_obj']:
             with self.subTest(post=post):
-                self.assertEqual(post.group.slug, 'test-group-slug-0')
+                self.assertEqual(post.group_slug, 'test-group-slug-0')
 
     def test_group_page_1_context(self):
         """Число постов на 1 странице group_list равно N (default: 10)."""
@@ -226,7 +228,7 @@ class PostViewsTests(TestCase):
         )
         for post in response.context['page_obj']:
             with self.subTest(post=post):
-                self.assertEqual(post.author.username, 'Im_author')
+                self.assertEqual(post.author_username, 'Im_author')
 
     def test_profile_page_1_context(self):
         """Число постов на 1 странице profile равно N (default: 10)."""
@@ -1,6 +1,6 @@
 from django.urls import path
 
-from . import views
+from . import feeds, views
 
 app_name = 'posts'
 
@@ -11,5 +11,26 @@ urlpatterns = [
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
     path('posts/<int:post_id>/edit/', views.post_edit, name='post_edit'),
     path('create/', views.post_create, name='post_create'),
-
+    path('search/', views.search, name='search'),
+    path('feed/', feeds.feed_view(feeds.LatestPostsFeed(), 'posts',
+                                  'authors'),
+         name='feed'),
+    path('feed/atom/', feeds.feed_view(feeds.LatestPostsAtomFeed(), 'posts',
+                                       'authors'),
+         name='feed_atom'),
+    path('group/<slug:slug>/feed/',
+         feeds.feed_view(feeds.GroupPostsFeed(), 'group:{slug}', 'authors'),
+         name='group_feed'),
+    path('group/<slug:slug>/feed/atom/',
+         feeds.feed_view(feeds.GroupPostsAtomFeed(), 'group:{slug}',
+                         'authors'),
+         name='group_feed_atom'),
+    path('profile/<str:username>/feed/',
+         feeds.feed_view(feeds.AuthorPostsFeed(), 'author:{username}',
+                         'authors'),
+         name='profile_feed'),
+    path('profile/<str:username>/feed/atom/',
+         feeds.feed_view(feeds.AuthorPostsAtomFeed(), 'author:{username}',
+                         'authors'),
+         name='profile_feed_atom'),
 ]
@@ -1,54 +1,124 @@
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
-from django.core.paginator import Paginator
 from django.shortcuts import get_object_or_404, redirect, render
+from django.views.decorators.http import condition
 
+from core.query_budget import query_budget
+from core.routers import read_from_replica, replica_reads_active
+
+from .cache import (cache_anonymous_page, get_or_recompute,
+                    post_detail_cache_key)
+from .coalescer import save_post
+from .conditional import group_etag, index_etag, make_etag, profile_etag
+from .counters import get_author_count
 from .forms import PostForm
 from .models import Group, Post, User
+from .paginator import get_page
+from .rows import post_rows
+from .search import search_posts
+
+
+def list_template_engine():
+    """Движок шаблонов для лент публикаций."""
+    return 'jinja2' if settings.POSTS_JINJA2_TEMPLATES else None
 
 
+# Бюджеты запросов учитывают чтение сессии и пользователя при промахе
+# кэша (2 запроса) и вычисление ETag (1 запрос).
+@query_budget(5)
+@read_from_replica
+@condition(etag_func=index_etag)
+@cache_anonymous_page('posts', 'authors')
 def index(request):
     """Возвращает http-ответ с N последними публикациями."""
-    paginated_posts = Paginator(
-        Post.objects
-        .select_related('author')
-        .select_related('group'),
-        settings.NUM_OF_POSTS_ON_PAGE
-    )
-    page_obj = paginated_posts.get_page(request.GET.get('page'))
+    page_obj = get_page(request, post_rows(Post.objects.all()), 'index')
     return render(request, 'posts/index.html',
                   {'title': 'Добро пожаловать в yaTube',
                    'page_obj': page_obj,
-                   'group_link_is_visible': True})
+                   'group_link_is_visible': True},
+                  using=list_template_engine())
 
 
+@query_budget(5)
+@read_from_replica
+@condition(etag_func=profile_etag)
 def profile(request, username):
     """Профиль пользователя с его публикациями."""
-    author = User.objects.get(username=username)
-    paginated_posts = Paginator(
-        author.posts.select_related('group').all(),
-        settings.NUM_OF_POSTS_ON_PAGE
+    author = User.objects.select_related('post_stats').get(username=username)
+    posts_count = get_author_count(author)
+    page_obj = get_page(
+        request,
+        post_rows(author.posts.all()),
+        'profile',
+        count=posts_count
     )
-    page_obj = paginated_posts.get_page(request.GET.get('page'))
     context = {
         'page_obj': page_obj,
         'author': author,
+        'posts_count': posts_count,
         'group_link_is_visible': True
     }
-    return render(request, 'posts/profile.html', context)
+    return render(request, 'posts/profile.html', context,
+                  using=list_template_engine())
 
 
-def post_detail(request, post_id):
-    """Подробная информация о публикации."""
+def load_post_detail(post_id):
+    """Публикация с группой и автором и число публикаций автора."""
     post_queryset = (
         Post.objects
         .filter(id=post_id)
         .select_related('group')
-        .select_related('author')
+        .select_related('author__post_stats')
     )
     post = get_object_or_404(post_queryset)
-    num_posts = Post.objects.filter(author_id=post.author_id).count()
+    return post, get_author_count(post.author)
+
+
+def get_post_detail(post_id):
+    """
+    Данные страницы публикации из кэша с защитой от лавины запросов.
+
+    Запись сбрасывается при сохранении и удалении публикации; число
+    публикаций автора и его имя могут отставать на время кэширования.
+    Данные, прочитанные с реплики, хранятся не дольше её отставания:
+    иначе после правки в кэш снова попала бы старая версия.
+    """
+    timeout = settings.POST_DETAIL_CACHE_TIMEOUT
+    if not timeout:
+        return load_post_detail(post_id)
+    stale_timeout = settings.POST_DETAIL_CACHE_STALE_TIMEOUT
+    if replica_reads_active():
+        timeout = min(timeout, settings.DATABASE_REPLICA_LAG)
+        stale_timeout = 0
+    return get_or_recompute(
+        post_detail_cache_key(post_id),
+        lambda: load_post_detail(post_id),
+        timeout,
+        stale_timeout,
+    )
+
+
+def post_detail_etag(request, post_id):
+    """
+    ETag страницы публикации по тем же данным, что и тело ответа.
+
+    Данные берутся из кэша get_post_detail, поэтому ETag меняется
+    вместе с показанными именем автора и числом его публикаций.
+    """
+    request.post_detail = get_post_detail(post_id)
+    post, num_posts = request.post_detail
+    return make_etag(request, post.updated, post.group_slug,
+                     post.group_title, post.author_username,
+                     post.author_full_name, num_posts)
+
+
+@query_budget(4)
+@read_from_replica
+@condition(etag_func=post_detail_etag)
+def post_detail(request, post_id):
+    """Подробная информация о публикации."""
+    post, num_posts = request.post_detail
     context = {
         'post': post,
         'num_posts': num_posts
@@ -56,23 +126,41 @@ def post_detail(request, post_id):
     return render(request, 'posts/post_detail.html', context)
 
 
+@query_budget(5)
+@read_from_replica
+@condition(etag_func=group_etag)
+@cache_anonymous_page('group:{slug}', 'authors')
 def group_posts(request, slug):
     """
     Возвращает http-ответ с N последними публикациями определённой группы.
     """
     group = get_object_or_404(Group, slug=slug)
-    paginated_posts = Paginator(
-        group.posts
-        .select_related('author'),
-        settings.NUM_OF_POSTS_ON_PAGE
+    page_obj = get_page(
+        request,
+        post_rows(group.posts.all()),
+        'group_list',
+        count=group.posts_count
     )
-    page_obj = paginated_posts.get_page(request.GET.get('page'))
     return render(request, 'posts/group_list.html',
                   {'group': group,
                    'page_obj': page_obj,
-                   'group_link_is_visible': False})
+                   'group_link_is_visible': False},
+                  using=list_template_engine())
+
+
+@query_budget(4)
+def search(request):
+    """Полнотекстовый поиск по публикациям."""
+    query = request.GET.get('q', '').strip()
+    page = search_posts(query, settings.NUM_OF_POSTS_ON_PAGE,
+                        after=request.GET.get('after'))
+    return render(request, 'posts/search.html',
+                  {'query': query,
+                   'page': page})
 
 
+# С запасом на заведение строк счётчиков нового автора и нового дня.
+@query_budget(17)
 @login_required
 def post_create(request):
     """Функция обеспечивает создания публикации."""
@@ -81,7 +169,7 @@ def post_create(request):
         if form.is_valid():
             post_inst = form.save(commit=False)
             post_inst.author = request.user
-            post_inst.save()
+            save_post(post_inst)
             return redirect('posts:profile', username=request.user.username)
     else:
         form = PostForm()
@@ -90,10 +178,12 @@ def post_create(request):
                    'is_edit': False})
 
 
+@query_budget(12)
 @login_required
 def post_edit(request, post_id):
     """Функция обеспечивает редактирование публикации."""
-    post = get_object_or_404(Post, pk=post_id)
+    post = get_object_or_404(Post.objects.select_related('author'),
+                             pk=post_id)
     if request.user.id != post.author_id:
         return redirect('posts:post_detail', post_id=post_id)
     if request.method == 'POST':
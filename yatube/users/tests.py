@@ -0,0 +1,30 @@
+from io import StringIO
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.models import OutgoingEmail
+
+
+@override_settings(
+    EMAIL_BACKEND='core.mail.QueuedEmailBackend',
+    OUTBOX_EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+)
+class SignUpEmailTests(TestCase):
+    def test_signup_queues_welcome_email(self):
+        """Регистрация ставит приветственное письмо в очередь."""
+        self.client.post(reverse('users:signup'), {
+            'first_name': 'Анна',
+            'username': 'anna',
+            'email': 'anna@example.com',
+            'password1': 'Slozhnyi-parol-42',
+            'password2': 'Slozhnyi-parol-42',
+        })
+        self.assertEqual(OutgoingEmail.objects.count(), 1)
+        self.assertEqual(mail.outbox, [])
+        call_command('send_queued_mail', stdout=StringIO())
+        self.assertEqual(mail.outbox[0].to, ['anna@example.com'])
+        self.assertEqual(mail.outbox[0].subject, 'Добро пожаловать в yaTube')
+        self.assertIn('Здравствуйте, Анна!', mail.outbox[0].body)
@@ -1,3 +1,5 @@
+from django.core.mail import send_mail
+from django.template.loader import render_to_string
 from django.urls import reverse_lazy
 from django.views.generic import CreateView
 
@@ -8,3 +10,20 @@ class SignUp(CreateView):
     form_class = CreationForm
     success_url = reverse_lazy('posts:index')
     template_name = 'users/signup.html'
+
+    def form_valid(self, form):
+        response = super().form_valid(form)
+        self.send_welcome_email(self.object)
+        return response
+
+    def send_welcome_email(self, user):
+        """Приветственное письмо; уходит через очередь core.mail."""
+        if not user.email:
+            return
+        context = {'user': user,
+                   'index_url': self.request.build_absolute_uri(
+                       str(self.success_url))}
+        subject = render_to_string('users/signup_email_subject.txt', context)
+        send_mail(''.join(subject.splitlines()),
+                  render_to_string('users/signup_email.txt', context),
+                  None, [user.email])
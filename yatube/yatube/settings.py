@@ -22,8 +22,11 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = 'a+47^un*sw=vtu#^9m6s0l26u1%2)h1*rpe8&l15kwzhg%q(h2'
 
+# Профиль окружения: development (по умолчанию) или production.
+YATUBE_PROFILE = os.environ.get('YATUBE_PROFILE', 'development')
+
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = YATUBE_PROFILE != 'production'
 
 ALLOWED_HOSTS = [
     'localhost',
@@ -47,14 +50,17 @@ INSTALLED_APPS = [
     'users.apps.UsersConfig',
     'core.apps.CoreConfig',
     'about.apps.AboutConfig',
+    'api.apps.ApiConfig',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.query_budget.QueryBudgetMiddleware',
+    'core.routers.ReplicaPinMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.auth.CachedAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -77,6 +83,19 @@ TEMPLATES = [
             ],
         },
     },
+    # Шаблоны лент публикаций на Jinja2, см. POSTS_JINJA2_TEMPLATES.
+    {
+        'BACKEND': 'django.template.backends.jinja2.Jinja2',
+        'DIRS': [os.path.join(BASE_DIR, 'jinja2')],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            'environment': 'core.jinja2.environment',
+            'context_processors': [
+                'django.contrib.auth.context_processors.auth',
+                'core.context_processors.year.year',
+            ],
+        },
+    },
 ]
 
 WSGI_APPLICATION = 'yatube.wsgi.application'
@@ -92,6 +111,59 @@ DATABASES = {
     }
 }
 
+# PRAGMA, которые core.db выставляет каждому новому соединению SQLite.
+# WAL не даёт читателям ждать писателя; synchronous=NORMAL в режиме WAL
+# не теряет целостность, а только последние транзакции при сбое ОС.
+SQLITE_PRODUCTION_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'busy_timeout': 5000,
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,  # в КиБ: 64 МиБ на соединение
+    'temp_store': 'MEMORY',
+}
+SQLITE_PRAGMAS = {}
+
+if YATUBE_PROFILE == 'production':
+    SQLITE_PRAGMAS = SQLITE_PRODUCTION_PRAGMAS
+    # Постоянные соединения: по одному на поток WSGI-сервера.
+    DATABASES['default']['CONN_MAX_AGE'] = 600
+
+# Реплики для чтения лент и страниц публикаций (core.routers): пути к
+# копиям базы через запятую в YATUBE_REPLICAS. Локально реплики
+# обновляет команда sync_replicas.
+DATABASE_REPLICAS = []
+for number, path in enumerate(
+        filter(None, os.environ.get('YATUBE_REPLICAS', '').split(',')), 1):
+    alias = f'replica{number}'
+    DATABASES[alias] = dict(DATABASES['default'], NAME=path,
+                            TEST={'MIRROR': 'default'})
+    DATABASE_REPLICAS.append(alias)
+DATABASE_ROUTERS = ['core.routers.PrimaryReplicaRouter']
+# Наибольшее отставание реплики, сек.: столько после записи пользователь
+# читает из основной базы.
+DATABASE_REPLICA_LAG = 5
+
+
+# Cache
+# https://docs.djangoproject.com/en/2.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'yatube',
+    }
+}
+
+
+# Sessions
+# https://docs.djangoproject.com/en/2.2/topics/http/sessions/
+
+# Данные сессии читаются из кэша, база — только при промахе.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+# Время жизни снимка пользователя в кэше (core.auth), сек.
+AUTH_USER_CACHE_TIMEOUT = 60 * 60
+
 
 # Password validation
 # https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
@@ -135,18 +207,78 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
+STATIC_ROOT = os.path.join(BASE_DIR, 'collected_static')
+
+if YATUBE_PROFILE == 'production':
+    # Имена с хэшем и сжатые копии .gz/.br (core.static); .br — при
+    # установленном пакете brotli. Файлы отдаёт middleware до остальных.
+    STATICFILES_STORAGE = 'core.static.CompressedManifestStaticFilesStorage'
+    MIDDLEWARE.insert(1, 'core.static.PrecompressedStaticMiddleware')
 
 
 # USER DEFINITIONS
 NUM_OF_POSTS_ON_PAGE = 10
+# Ссылок на страницы по обе стороны от текущей в пагинаторе.
+POSTS_PAGINATOR_WINDOW = 3
+# Длина начала текста в карточке ленты, символов. После изменения
+# HTML публикаций пересчитывается командой render_post_html --all.
+POSTS_PREVIEW_LENGTH = 500
+# Списки (имена URL из posts.urls) с курсорной пагинацией по (pub_date, id).
+# Ссылки вида ?page=N продолжают работать и в этом режиме.
+POSTS_CURSOR_PAGINATION_VIEWS = ()
+# Время жизни отрендеренных карточек постов в кэше, сек.
+POST_CARD_CACHE_TIMEOUT = 60 * 60 * 24
+# Время жизни страниц для анонимов (главная, группы), сек.; 0 — выключено.
+# Поколения страниц хранятся в кэше 'default': для нескольких процессов
+# он должен быть общим (memcached, redis), иначе сброс будет локальным.
+POSTS_PAGE_CACHE_TIMEOUT = 60 * 15
+# Время свежести данных страницы публикации в кэше, сек.; 0 — выключено.
+# Ещё POST_DETAIL_CACHE_STALE_TIMEOUT сек. устаревшая копия отдаётся,
+# пока один процесс её пересчитывает.
+POST_DETAIL_CACHE_TIMEOUT = 60
+POST_DETAIL_CACHE_STALE_TIMEOUT = 60 * 5
+# Объединённая запись новых публикаций (posts.coalescer): параллельные
+# post_create сохраняются одной транзакцией. Окно ожидания соседей, сек.,
+# и наибольший размер порции.
+POSTS_COALESCE_WRITES = False
+POSTS_COALESCE_WINDOW = 0.005
+POSTS_COALESCE_MAX_BATCH = 64
+# Рендерить ленты публикаций (главная, группа, профиль) шаблонами Jinja2
+# из каталога jinja2/ вместо шаблонов Django.
+POSTS_JINJA2_TEMPLATES = False
+# Число публикаций в RSS- и Atom-лентах.
+POSTS_FEED_SIZE = 20
+# Режим большой таблицы для списка публикаций в админке: оценка числа
+# строк, листание по ключу и фильтр дат по сводке PostDailyStats.
+POSTS_ADMIN_LARGE_TABLE = True
+POSTS_ADMIN_COUNT_CACHE_TIMEOUT = 60
+# Бюджеты SQL-запросов по имени URL; дополняют и переопределяют бюджеты,
+# заданные декоратором core.query_budget.query_budget у представлений.
+QUERY_BUDGETS = {
+    'about:author': 2,
+    'about:tech': 2,
+}
+# Превышение бюджета — исключение, а не запись в лог (включается в тестах).
+QUERY_BUDGET_STRICT = False
+TEST_RUNNER = 'core.test_runner.QueryBudgetTestRunner'
 
 LOGIN_URL = 'users:login'
 LOGIN_REDIRECT_URL = 'posts:index'
 # LOGOUT_REDIRECT_URL = 'posts:index'
 
 # EMAIL MODULE
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+# Письма ставятся в очередь (core.mail) и уходят командой
+# send_queued_mail через OUTBOX_EMAIL_BACKEND.
+EMAIL_BACKEND = 'core.mail.QueuedEmailBackend'
+OUTBOX_EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
+# Повторы: пауза удваивается от OUTBOX_RETRY_DELAY до OUTBOX_MAX_RETRY_DELAY
+# сек.; после OUTBOX_MAX_ATTEMPTS неудач письмо остаётся в очереди с ошибкой.
+OUTBOX_MAX_ATTEMPTS = 5
+OUTBOX_RETRY_DELAY = 60
+OUTBOX_MAX_RETRY_DELAY = 60 * 60
+# Сколько секунд забранное письмо не выдаётся другим отправителям.
+OUTBOX_SEND_TIMEOUT = 60 * 5
 
 # Debug Toolbar settings
 # USE_DEBUG_TOOLBAR = False